@@ -0,0 +1,19 @@
+"""Stand-in for src/config.py used by the offline benchmarks.
+
+Credentials are dummies; all hosts are answered by the local HTTP stub and
+the database is the embedded SQLite copy, so none of these values leave the box.
+"""
+DB_CONNECTION_STRING = 'DRIVER={Embedded};DATABASE=CryptoAiDb'
+DB_SERVER = 'localhost'
+DB_NAME = 'CryptoAiDb'
+DB_USER = 'bench'
+DB_PASSWORD = 'bench'
+
+REDDIT_CLIENT_ID = 'bench'
+REDDIT_CLIENT_SECRET = 'bench'
+TWITTER_BEARER_TOKEN = 'bench'
+CRYPTOCOMPARE_API_KEY = 'bench'
+CRYPTOPANIC_API_KEY = 'bench'
+CRYPTOPANIC_BASE_URL = 'https://cryptopanic.com/api/v1/'
+NEWS_API_URL = 'https://newsapi.org/v2/everything'
+NEWS_API_KEY = 'bench'
@@ -0,0 +1,128 @@
+"""Compare the predictor's registry models on synthetic daily history.
+
+For each coin the feature matrix and multi-horizon targets come from
+PricePredictor.prepare_features. Each model is fitted on the oldest 80% of
+rows and scored on the rest. Reported per model (averaged over coins):
+fit time, single-row predict latency, peak memory allocated during the fit,
+pickled model size and MAE on returns.
+
+Usage:
+    python benchmarks/bench_models.py
+    python benchmarks/bench_models.py --coins 20 --days 730 --models ridge hist_gb
+"""
+import sys
+import json
+import time
+import pickle
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from run_benchmarks import setup_environment, patch_database, RESULTS_DIR
+
+def synthetic_daily(rng, base_price, days):
+    """Random-walk daily bars shaped like PricePredictor.resample_daily output"""
+    import pandas as pd
+
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+    price = base_price
+    rows = []
+    for day in range(days):
+        change = rng.gauss(0.001, 0.03)
+        price *= 1 + change
+        rows.append((start + timedelta(days=day), price, rng.uniform(1e6, 1e9), change * 100))
+    return pd.DataFrame(rows, columns=['date', 'price', 'volume_24h', 'price_change_24h'])
+
+def bench_model(name, X_train, y_train, X_test, y_test, predict_calls):
+    from ModelRegistry import create_model, outputs_of
+    from sklearn.metrics import mean_absolute_error
+
+    model = create_model(name, outputs_of(y_train))
+    tracemalloc.start()
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latest = X_test.iloc[-1:]
+    latencies = []
+    for _ in range(predict_calls):
+        started = time.perf_counter()
+        model.predict(latest)
+        latencies.append(time.perf_counter() - started)
+
+    return {
+        'fit_seconds': fit_seconds,
+        'predict_ms': statistics.median(latencies) * 1000,
+        'fit_peak_mb': peak / 1e6,
+        'model_kb': len(pickle.dumps(model)) / 1e3,
+        'mae': float(mean_absolute_error(y_test, model.predict(X_test)))
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Predictor model family benchmark')
+    parser.add_argument('--coins', type=int, default=10, help='Synthetic coins to fit')
+    parser.add_argument('--days', type=int, default=365, help='Daily bars per coin')
+    parser.add_argument('--models', nargs='+', help='Registry models to compare (default: all)')
+    parser.add_argument('--predict-calls', type=int, default=50, help='Single-row predictions timed per model')
+    args = parser.parse_args()
+
+    setup_environment()
+    import embedded_db
+    import PricePredictor
+    from ModelRegistry import MODELS
+
+    # The predictor only needs an engine to construct; nothing is read from it
+    db_path = str(Path(tempfile.mkdtemp(prefix='crypto_models_')) / 'empty.db')
+    embedded_db.build_database(db_path, [], price_rows_per_coin=0, chat_rows_per_coin=0)
+    patch_database(db_path)
+    predictor = PricePredictor.PricePredictor()
+    predictor.logger.setLevel('WARNING')
+
+    models = args.models or sorted(MODELS)
+    rng = random.Random(42)
+    results = {name: [] for name in models}
+    for coin in range(args.coins):
+        daily = synthetic_daily(rng, rng.uniform(0.1, 50000), args.days)
+        X, y, _ = predictor.prepare_features(daily)
+        horizons = predictor.trainable_horizons(y)
+        if not horizons:
+            continue
+        X, y = predictor.training_set(X, y, horizons)
+        split = int(len(X) * 0.8)
+        for name in models:
+            results[name].append(bench_model(
+                name, X.iloc[:split], y.iloc[:split], X.iloc[split:], y.iloc[split:], args.predict_calls
+            ))
+
+    summary = {
+        name: {key: statistics.mean(run[key] for run in runs) for key in runs[0]}
+        for name, runs in results.items() if runs
+    }
+    print(f"\n{'model':<15}{'fit s':>10}{'predict ms':>12}{'fit peak MB':>13}{'size KB':>10}{'MAE':>10}")
+    for name, row in sorted(summary.items(), key=lambda item: item[1]['fit_seconds']):
+        print(
+            f"{name:<15}{row['fit_seconds']:>10.4f}{row['predict_ms']:>12.3f}"
+            f"{row['fit_peak_mb']:>13.2f}{row['model_kb']:>10.1f}{row['mae']:>10.4f}"
+        )
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    report_file = RESULTS_DIR / f"models_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(report_file, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'coins': args.coins,
+            'days': args.days,
+            'results': summary
+        }, f, indent=2)
+    print(f"\nResults written to {report_file}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,502 @@
+"""Embedded SQLite stand-in for the CryptoAiDb SQL Server database.
+
+The collectors and predictor issue T-SQL, so statements are translated on
+the way in (GETDATE/DATEADD/DATEDIFF, TOP, @@IDENTITY, table hints and the
+single-row MERGE upsert pattern used throughout the code base).
+"""
+import re
+import random
+import sqlite3
+import datetime
+from decimal import Decimal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Coins (
+    coin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol VARCHAR(20) NOT NULL,
+    full_name VARCHAR(100),
+    description VARCHAR(100),
+    is_active INTEGER NOT NULL DEFAULT 1,
+    market_cap_rank INTEGER,
+    universe_updated DATETIME
+);
+CREATE TABLE IF NOT EXISTS Price_Data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    coin_id INTEGER REFERENCES Coins(coin_id),
+    timestamp DATETIME,
+    price_usd DECIMAL(18, 8),
+    volume_24h DECIMAL(18, 2),
+    price_change_24h DECIMAL(18, 2),
+    data_source VARCHAR(50)
+);
+CREATE INDEX IF NOT EXISTS IX_Price_Data_coin_timestamp ON Price_Data (coin_id, timestamp);
+CREATE TABLE IF NOT EXISTS chat_source (
+    source_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_name VARCHAR(50) NOT NULL UNIQUE,
+    api_base_url VARCHAR(255),
+    created_at DATETIME
+);
+CREATE TABLE IF NOT EXISTS chat_data (
+    chat_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME NOT NULL,
+    coin_id INTEGER NOT NULL REFERENCES Coins(coin_id),
+    source_id INTEGER NOT NULL REFERENCES chat_source(source_id),
+    content TEXT,
+    sentiment_score DECIMAL(5, 2),
+    sentiment_label VARCHAR(20),
+    url VARCHAR(500)
+);
+CREATE INDEX IF NOT EXISTS IX_chat_data_timestamp_chat_id ON chat_data (timestamp DESC, chat_id DESC);
+CREATE TABLE IF NOT EXISTS chat_sentiment_hourly (
+    coin_id INTEGER NOT NULL,
+    source_id INTEGER NOT NULL,
+    hour_start DATETIME NOT NULL,
+    sentiment_sum DECIMAL(18, 4) NOT NULL,
+    mention_count INTEGER NOT NULL,
+    positive_count INTEGER NOT NULL,
+    negative_count INTEGER NOT NULL,
+    neutral_count INTEGER NOT NULL,
+    PRIMARY KEY (coin_id, hour_start, source_id)
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    coin_id INTEGER REFERENCES Coins(coin_id),
+    prediction_date DATETIME,
+    current_price DECIMAL(18, 8),
+    prediction_24h DECIMAL(18, 8),
+    prediction_7d DECIMAL(18, 8),
+    prediction_30d DECIMAL(18, 8),
+    prediction_90d DECIMAL(18, 8),
+    sentiment_score DECIMAL(5, 2),
+    confidence_score DECIMAL(5, 2),
+    actual_price_24h DECIMAL(18, 8),
+    actual_price_7d DECIMAL(18, 8),
+    actual_price_30d DECIMAL(18, 8),
+    actual_price_90d DECIMAL(18, 8),
+    accuracy_score DECIMAL(5, 2),
+    features_used TEXT,
+    model_version VARCHAR(50),
+    training_window_days INTEGER,
+    data_points_count INTEGER,
+    market_conditions VARCHAR(50),
+    volatility_index DECIMAL(10, 2),
+    prediction_error_24h DECIMAL(18, 8),
+    prediction_error_7d DECIMAL(18, 8),
+    prediction_error_30d DECIMAL(18, 8),
+    prediction_error_90d DECIMAL(18, 8),
+    model_parameters TEXT,
+    fit_id INTEGER REFERENCES model_fits(fit_id)
+);
+CREATE TABLE IF NOT EXISTS model_fits (
+    fit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fit_key CHAR(40) NOT NULL UNIQUE,
+    coin_id INTEGER REFERENCES Coins(coin_id),
+    model_name VARCHAR(50) NOT NULL,
+    model_parameters TEXT,
+    model_version VARCHAR(50),
+    horizons VARCHAR(50),
+    trained_from DATETIME,
+    trained_to DATETIME,
+    training_rows INTEGER,
+    fitted_at DATETIME NOT NULL,
+    importance_method VARCHAR(20),
+    feature_importances TEXT
+);
+CREATE INDEX IF NOT EXISTS IX_model_fits_coin_fitted ON model_fits (coin_id, fitted_at);
+CREATE INDEX IF NOT EXISTS IX_predictions_coin_id_prediction_id ON predictions (coin_id, prediction_id);
+CREATE TABLE IF NOT EXISTS prediction_feature_importance (
+    feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prediction_id INTEGER REFERENCES predictions(prediction_id),
+    feature_name VARCHAR(100),
+    importance_score DECIMAL(10, 4)
+);
+CREATE TABLE IF NOT EXISTS model_performance_metrics (
+    metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model_version VARCHAR(50),
+    evaluation_date DATETIME,
+    mae_24h DECIMAL(18, 8),
+    mae_7d DECIMAL(18, 8),
+    mae_30d DECIMAL(18, 8),
+    mae_90d DECIMAL(18, 8),
+    rmse_24h DECIMAL(18, 8),
+    rmse_7d DECIMAL(18, 8),
+    rmse_30d DECIMAL(18, 8),
+    rmse_90d DECIMAL(18, 8),
+    r2_score DECIMAL(10, 4),
+    sample_size INTEGER,
+    coin_id INTEGER REFERENCES Coins(coin_id)
+);
+CREATE TABLE IF NOT EXISTS coin_indicators (
+    coin_id INTEGER PRIMARY KEY REFERENCES Coins(coin_id),
+    updated_at DATETIME NOT NULL,
+    last_price DECIMAL(18, 8),
+    volatility_index DECIMAL(10, 2),
+    atr DECIMAL(18, 8),
+    rsi DECIMAL(5, 2),
+    market_condition VARCHAR(50),
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coin_aliases (
+    coin_id INTEGER NOT NULL REFERENCES Coins(coin_id),
+    alias VARCHAR(100) NOT NULL,
+    PRIMARY KEY (coin_id, alias)
+);
+CREATE TABLE IF NOT EXISTS collector_nodes (
+    node_id VARCHAR(100) PRIMARY KEY,
+    hostname VARCHAR(255),
+    pid INTEGER,
+    started_at DATETIME,
+    last_heartbeat DATETIME NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coin_leases (
+    job VARCHAR(50) NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    node_id VARCHAR(100) NOT NULL,
+    lease_expires DATETIME NOT NULL,
+    PRIMARY KEY (job, symbol)
+);
+"""
+
+CHAT_SOURCES = ['News API', 'Reddit', 'Twitter', 'CryptoCompare', 'CoinGecko', 'CryptoPanic']
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+_TIMESTAMP_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?$')
+_EPOCH = datetime.datetime(1900, 1, 1)
+
+sqlite3.register_adapter(datetime.datetime, lambda value: value.strftime(TIMESTAMP_FORMAT))
+sqlite3.register_adapter(Decimal, float)
+
+def _to_datetime(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return _EPOCH + datetime.timedelta(days=value)
+    return datetime.datetime.fromisoformat(str(value))
+
+_UNITS = {
+    'second': 1, 'ss': 1, 's': 1,
+    'minute': 60, 'mi': 60, 'n': 60,
+    'hour': 3600, 'hh': 3600,
+    'day': 86400, 'dd': 86400, 'd': 86400,
+    'week': 604800, 'wk': 604800, 'ww': 604800,
+}
+
+def _dateadd(unit, amount, value):
+    base = _to_datetime(value)
+    if base is None or amount is None:
+        return None
+    return (base + datetime.timedelta(seconds=_UNITS[unit.lower()] * amount)).strftime(TIMESTAMP_FORMAT)
+
+def _datediff(unit, start, end):
+    start, end = _to_datetime(start), _to_datetime(end)
+    if start is None or end is None:
+        return None
+    seconds = _UNITS[unit.lower()]
+    # SQL Server counts boundaries crossed, i.e. the difference of truncated values
+    return int((end - _EPOCH).total_seconds() // seconds - (start - _EPOCH).total_seconds() // seconds)
+
+def register_functions(connection):
+    connection.create_function('GETDATE', 0, lambda: datetime.datetime.now().strftime(TIMESTAMP_FORMAT))
+    connection.create_function('DATEADD', 3, _dateadd)
+    connection.create_function('DATEDIFF', 3, _datediff)
+    connection.create_function('SUBSTRING', 3, lambda value, start, length: None if value is None else str(value)[start - 1:start - 1 + length])
+    connection.create_function('ISNULL', 2, lambda value, default: default if value is None else value)
+    connection.create_function('LEN', 1, lambda value: None if value is None else len(str(value).rstrip()))
+
+def _split_top_level(text):
+    """Split a comma separated SQL list, ignoring commas inside parentheses"""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current).strip())
+    return parts
+
+_MERGE_RE = re.compile(
+    r"MERGE\s+(?:INTO\s+)?(?P<table>\w+)\s+(?:WITH\s*\(\s*\w+\s*\)\s+)?AS\s+(?P<target>\w+)\s+"
+    r"USING\s*\(\s*SELECT\s+(?P<using>.*?)\)\s*AS\s+(?P<source>\w+)\s+"
+    r"ON\s+(?P<on>.*?)\s+"
+    r"WHEN\s+MATCHED\s+THEN\s+UPDATE\s+SET\s+(?P<update>.*?)\s+"
+    r"WHEN\s+NOT\s+MATCHED\s+THEN\s+INSERT\s*\((?P<columns>.*?)\)\s*VALUES\s*\((?P<values>.*)\)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+
+def _translate_merge(match):
+    """Rewrite the single-row MERGE upsert into SQLite's INSERT ... ON CONFLICT.
+
+    Returns the new statement and the order in which the original positional
+    parameters must be bound.
+    """
+    target, source = match.group('target'), match.group('source')
+    param_index = 0
+
+    using = {}
+    for item in _split_top_level(match.group('using')):
+        expression, alias = re.split(r'\s+AS\s+', item, flags=re.IGNORECASE)
+        count = expression.count('?')
+        using[alias.strip().lower()] = (expression.strip(), list(range(param_index, param_index + count)))
+        param_index += count
+
+    update_sql = match.group('update')
+    update_params = list(range(param_index, param_index + update_sql.count('?')))
+    param_index += len(update_params)
+
+    conflict_columns = [
+        re.sub(rf'^{target}\.', '', left.strip(), flags=re.IGNORECASE)
+        for left in re.findall(r'(\w+\.\w+)\s*=', match.group('on'))
+        if left.lower().startswith(target.lower() + '.')
+    ]
+
+    value_items, order = [], []
+    for item in _split_top_level(match.group('values')):
+        source_ref = re.fullmatch(rf'{source}\.(\w+)', item.strip(), flags=re.IGNORECASE)
+        if source_ref:
+            expression, params = using[source_ref.group(1).lower()]
+            value_items.append(expression)
+            order.extend(params)
+        else:
+            count = item.count('?')
+            value_items.append(item)
+            order.extend(range(param_index, param_index + count))
+            param_index += count
+    order.extend(update_params)
+
+    table = match.group('table')
+    update_sql = re.sub(rf'\b{target}\.', f'{table}.', update_sql, flags=re.IGNORECASE)
+    update_sql = re.sub(rf'\b{source}\.', 'excluded.', update_sql, flags=re.IGNORECASE)
+    statement = (
+        f"INSERT INTO {table} ({match.group('columns')}) VALUES ({', '.join(value_items)}) "
+        f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {update_sql}"
+    )
+    return statement, order
+
+_translation_cache = {}
+
+def translate(statement):
+    """Translate a T-SQL statement; returns (sql, parameter order or None)"""
+    cached = _translation_cache.get(statement)
+    if cached is not None:
+        return cached
+
+    sql, order = statement, None
+    merge = _MERGE_RE.search(sql)
+    if merge:
+        sql, order = _translate_merge(merge)
+    else:
+        top = re.match(r'(\s*SELECT\s+)TOP\s*(?:\(\s*(\?|\d+)\s*\)|(\d+))\s+', sql, re.IGNORECASE)
+        if top:
+            limit = top.group(2) or top.group(3)
+            sql = top.group(1) + sql[top.end():].rstrip().rstrip(';') + f' LIMIT {limit}'
+            if limit == '?':
+                count = sql.count('?')
+                order = list(range(1, count)) + [0]
+
+    sql = re.sub(r'\b(DATEADD|DATEDIFF)\(\s*(\w+)\s*,', r"\1('\2',", sql, flags=re.IGNORECASE)
+    sql = re.sub(r'WITH\s*\(\s*(NOLOCK|HOLDLOCK|UPDLOCK|ROWLOCK|READPAST)\s*(,\s*\w+\s*)*\)', '', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'SELECT\s+@@IDENTITY', 'SELECT last_insert_rowid()', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'SCOPE_IDENTITY\(\)', 'last_insert_rowid()', sql, flags=re.IGNORECASE)
+
+    result = (sql, order)
+    _translation_cache[statement] = result
+    return result
+
+def reorder(params, order):
+    if order is None or params is None:
+        return params
+    return tuple(params[i] for i in order)
+
+def _convert_row(row):
+    if row is None:
+        return None
+    return tuple(
+        _to_datetime(value) if isinstance(value, str) and _TIMESTAMP_RE.match(value) else value
+        for value in row
+    )
+
+class Cursor:
+    """Minimal pyodbc-compatible cursor over sqlite3"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.raw.cursor()
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    def execute(self, statement, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        sql, order = translate(statement)
+        self.cursor.execute(sql, reorder(tuple(params), order))
+        return self
+
+    def executemany(self, statement, seq_of_params):
+        sql, order = translate(statement)
+        self.cursor.executemany(sql, [reorder(tuple(p), order) for p in seq_of_params])
+        return self
+
+    def fetchone(self):
+        return _convert_row(self.cursor.fetchone())
+
+    def fetchall(self):
+        return [_convert_row(row) for row in self.cursor.fetchall()]
+
+    def fetchmany(self, size=1):
+        return [_convert_row(row) for row in self.cursor.fetchmany(size)]
+
+    def cancel(self):
+        self.connection.raw.interrupt()
+
+    def close(self):
+        self.cursor.close()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+class Connection:
+    """Minimal pyodbc-compatible connection over sqlite3"""
+
+    def __init__(self, path):
+        self.raw = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        register_functions(self.raw)
+
+    def cursor(self):
+        return Cursor(self)
+
+    def execute(self, statement, *params):
+        return self.cursor().execute(statement, *params)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+def connect_factory(path):
+    """Return a drop-in replacement for pyodbc.connect bound to `path`"""
+    def connect(*args, **kwargs):
+        return Connection(path)
+    return connect
+
+def create_engine_factory(path):
+    """Return a drop-in replacement for sqlalchemy.create_engine bound to `path`"""
+    from sqlalchemy import create_engine, event
+
+    def create(*args, **kwargs):
+        engine = create_engine(f'sqlite:///{path}', connect_args={'check_same_thread': False})
+
+        @event.listens_for(engine, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            register_functions(dbapi_connection)
+
+        @event.listens_for(engine, 'before_cursor_execute', retval=True)
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            sql, order = translate(statement)
+            if order is not None:
+                if executemany:
+                    parameters = [reorder(p, order) for p in parameters]
+                else:
+                    parameters = reorder(parameters, order)
+            return sql, parameters
+
+        return engine
+    return create
+
+def build_database(path, coins, scale=1, price_rows_per_coin=2000, chat_rows_per_coin=500, seed=42):
+    """Create the schema and load synthetic history for `coins`.
+
+    `coins` is a list of (symbol, full_name, base_price). Scale multiplies the
+    history depth: 5-minute price ticks and chat mentions ending now.
+    """
+    rng = random.Random(seed)
+    connection = sqlite3.connect(path)
+    register_functions(connection)
+    connection.executescript(SCHEMA)
+
+    connection.executemany(
+        "INSERT INTO chat_source (source_name, created_at) VALUES (?, ?)",
+        [(name, datetime.datetime.now()) for name in CHAT_SOURCES]
+    )
+    source_ids = [row[0] for row in connection.execute("SELECT source_id FROM chat_source")]
+
+    now = datetime.datetime.now().replace(second=0, microsecond=0)
+    price_rows = price_rows_per_coin * scale
+    chat_rows = chat_rows_per_coin * scale
+    labels = ('Positive', 'Negative', 'Neutral')
+
+    for symbol, full_name, base_price in coins:
+        cursor = connection.execute(
+            "INSERT INTO Coins (symbol, full_name) VALUES (?, ?)", (symbol, full_name)
+        )
+        coin_id = cursor.lastrowid
+
+        price = base_price
+        batch = []
+        for i in range(price_rows):
+            price *= 1 + rng.gauss(0, 0.002)
+            timestamp = now - datetime.timedelta(minutes=5 * (price_rows - i))
+            batch.append((
+                coin_id, timestamp, round(price, 8),
+                round(rng.uniform(1e5, 1e9), 2), round(rng.gauss(0, 3), 2), 'binance'
+            ))
+            if len(batch) >= 10000:
+                connection.executemany(
+                    "INSERT INTO Price_Data (coin_id, timestamp, price_usd, volume_24h, price_change_24h, data_source) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", batch
+                )
+                batch = []
+        if batch:
+            connection.executemany(
+                "INSERT INTO Price_Data (coin_id, timestamp, price_usd, volume_24h, price_change_24h, data_source) "
+                "VALUES (?, ?, ?, ?, ?, ?)", batch
+            )
+
+        # Spread mentions over the last day per unit of scale
+        span_seconds = 86400 * scale
+        connection.executemany(
+            "INSERT INTO chat_data (timestamp, coin_id, source_id, content, sentiment_score, sentiment_label, url) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    now - datetime.timedelta(seconds=rng.uniform(0, span_seconds)),
+                    coin_id, rng.choice(source_ids),
+                    f"Synthetic {symbol} mention {i}",
+                    score, labels[0] if score > 0 else labels[1] if score < 0 else labels[2],
+                    f"https://example.com/{symbol.lower()}/{i}"
+                )
+                for i, score in ((i, round(rng.uniform(-1, 1), 2)) for i in range(chat_rows))
+            ]
+        )
+
+    connection.execute("""
+        INSERT INTO chat_sentiment_hourly (
+            coin_id, source_id, hour_start, sentiment_sum,
+            mention_count, positive_count, negative_count, neutral_count
+        )
+        SELECT coin_id, source_id, strftime('%Y-%m-%d %H:00:00.000000', timestamp),
+               SUM(sentiment_score), COUNT(*),
+               SUM(sentiment_label = 'Positive'), SUM(sentiment_label = 'Negative'),
+               SUM(sentiment_label = 'Neutral')
+        FROM chat_data
+        GROUP BY coin_id, source_id, strftime('%Y-%m-%d %H:00:00.000000', timestamp)
+    """)
+    connection.commit()
+    connection.close()
@@ -0,0 +1,240 @@
+"""Local HTTP stub that replays recorded API responses.
+
+Every outgoing `requests` call (including those made by tweepy, ccxt and
+cryptocompare, which all use requests sessions) is rewritten to
+http://127.0.0.1:<port>/<original host><path>, where the stub answers from
+a fixture store. The same hook can record live responses into a store.
+
+Fixture store layout (responses.json):
+    {"GET api.coingecko.com/api/v3/coins/markets": [
+        {"query": {...} | null, "status": 200, "headers": {...}, "body": ...},
+        ...
+    ]}
+An entry with a query only matches requests carrying those parameters; an
+entry with a null query matches anything. Keys ending in "/*" match any
+path below that prefix.
+"""
+import os
+import json
+import random
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+INTERCEPTED_HOSTS = {
+    'api.coingecko.com',
+    'api.binance.com',
+    'newsapi.org',
+    'www.reddit.com',
+    'api.twitter.com',
+    'min-api.cryptocompare.com',
+    'cryptopanic.com',
+}
+
+class FixtureStore:
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, 'responses.json')) as f:
+            return cls(json.load(f))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'responses.json'), 'w') as f:
+            json.dump(self.responses, f, indent=1)
+
+    def add(self, method, host, path, query, status, body, headers=None):
+        with self.lock:
+            self.responses.setdefault(f"{method} {host}{path}", []).append({
+                'query': query,
+                'status': status,
+                'headers': headers or {},
+                'body': body
+            })
+
+    def find(self, method, host, path, query):
+        candidates = self.responses.get(f"{method} {host}{path}")
+        if candidates is None:
+            # Fall back to the longest wildcard prefix, e.g. ".../coins/*"
+            prefix = f"{method} {host}{path}"
+            while '/' in prefix and candidates is None:
+                prefix = prefix.rsplit('/', 1)[0]
+                candidates = self.responses.get(prefix + '/*')
+        if not candidates:
+            return None
+        fallback = None
+        for entry in candidates:
+            if entry['query'] is None:
+                fallback = fallback or entry
+            elif all(query.get(k) == str(v) for k, v in entry['query'].items()):
+                return entry
+        return fallback
+
+class StubServer:
+    def __init__(self, store, host='127.0.0.1', port=0):
+        self.store = store
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                parts = urlsplit(self.path)
+                original_host, _, original_path = parts.path.lstrip('/').partition('/')
+                entry = stub.store.find(
+                    self.command, original_host, '/' + original_path, dict(parse_qsl(parts.query))
+                )
+                if entry is None:
+                    body = json.dumps({'error': 'no fixture', 'path': self.path}).encode('utf-8')
+                    status, headers = 404, {}
+                else:
+                    body = entry['body']
+                    body = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+                    status, headers = entry['status'], entry['headers']
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+_original_request = requests.sessions.Session.request
+
+def install_replay(base_url):
+    """Route requests for intercepted hosts to the stub server"""
+    stub = urlsplit(base_url)
+
+    def request(session, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        if parts.hostname in INTERCEPTED_HOSTS:
+            url = urlunsplit((stub.scheme, stub.netloc, f"/{parts.hostname}{parts.path}", parts.query, ''))
+        return _original_request(session, method, url, *args, **kwargs)
+
+    requests.sessions.Session.request = request
+
+def install_recorder(store):
+    """Pass requests through to the live APIs and capture their responses"""
+    def request(session, method, url, *args, **kwargs):
+        response = _original_request(session, method, url, *args, **kwargs)
+        parts = urlsplit(response.request.url)
+        if parts.hostname in INTERCEPTED_HOSTS:
+            query = {k: v for k, v in parse_qsl(parts.query) if k.lower() not in ('apikey', 'auth_token')}
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            store.add(method.upper(), parts.hostname, parts.path, query or None, response.status_code, body)
+        return response
+
+    requests.sessions.Session.request = request
+
+def uninstall():
+    requests.sessions.Session.request = _original_request
+
+# Default universe for generated fixtures: (symbol, name, coingecko id, price)
+DEFAULT_COINS = [
+    ('BTC', 'Bitcoin', 'bitcoin', 65000.0),
+    ('ETH', 'Ethereum', 'ethereum', 3200.0),
+    ('BNB', 'BNB', 'binancecoin', 580.0),
+    ('SOL', 'Solana', 'solana', 150.0),
+    ('XRP', 'XRP', 'ripple', 0.55),
+    ('ADA', 'Cardano', 'cardano', 0.45),
+    ('DOGE', 'Dogecoin', 'dogecoin', 0.12),
+    ('TRX', 'TRON', 'tron', 0.12),
+    ('AVAX', 'Avalanche', 'avalanche-2', 35.0),
+    ('DOT', 'Polkadot', 'polkadot', 6.5),
+    ('LINK', 'Chainlink', 'chainlink', 14.0),
+    ('MATIC', 'Polygon', 'matic-network', 0.7),
+    ('LTC', 'Litecoin', 'litecoin', 80.0),
+    ('BCH', 'Bitcoin Cash', 'bitcoin-cash', 450.0),
+    ('NEAR', 'NEAR Protocol', 'near', 5.5),
+    ('UNI', 'Uniswap', 'uniswap', 9.0),
+    ('ATOM', 'Cosmos Hub', 'cosmos', 8.0),
+    ('XLM', 'Stellar', 'stellar', 0.11),
+    ('ETC', 'Ethereum Classic', 'ethereum-classic', 27.0),
+    ('FIL', 'Filecoin', 'filecoin', 5.0),
+]
+
+_PHRASES = [
+    '{name} rallies as traders pile in', '{symbol} breaks key resistance',
+    'Analysts warn {name} could slide further', '{symbol} volume spikes on exchange inflows',
+    'Why {name} is flat today', '{name} developers ship network upgrade',
+    'Whales accumulate {symbol} ahead of unlock', '{symbol} price crashes after exploit rumours',
+]
+
+def generate_fixtures(coins=DEFAULT_COINS, items_per_feed=25, seed=7):
+    """Build a deterministic fixture store shaped like the live API responses"""
+    rng = random.Random(seed)
+    store = FixtureStore()
+
+    def headline():
+        symbol, name, _, _ = rng.choice(coins)
+        return rng.choice(_PHRASES).format(symbol=symbol, name=name)
+
+    store.add('GET', 'api.coingecko.com', '/api/v3/coins/markets', None, 200, [
+        {'id': cg_id, 'symbol': symbol.lower(), 'name': name, 'current_price': price,
+         'market_cap_rank': rank, 'total_volume': rng.uniform(1e6, 1e10)}
+        for rank, (symbol, name, cg_id, price) in enumerate(coins, 1)
+    ])
+
+    for symbol, name, cg_id, price in coins:
+        last = price * (1 + rng.gauss(0, 0.01))
+        store.add('GET', 'api.binance.com', '/api/v3/ticker/24hr', {'symbol': f"{symbol}USDT"}, 200, {
+            'symbol': f"{symbol}USDT", 'priceChange': str(last - price),
+            'priceChangePercent': str(round((last / price - 1) * 100, 3)),
+            'weightedAvgPrice': str(price), 'prevClosePrice': str(price),
+            'lastPrice': str(last), 'bidPrice': str(last * 0.9999), 'askPrice': str(last * 1.0001),
+            'openPrice': str(price), 'highPrice': str(max(price, last) * 1.01),
+            'lowPrice': str(min(price, last) * 0.99), 'volume': str(rng.uniform(1e3, 1e6)),
+            'quoteVolume': str(rng.uniform(1e6, 1e9)), 'openTime': 0, 'closeTime': 0, 'count': 1000
+        })
+        store.add('GET', 'api.coingecko.com', '/api/v3/search', {'query': symbol}, 200, {
+            'coins': [{'id': cg_id, 'name': name, 'symbol': symbol}]
+        })
+        store.add('GET', 'api.coingecko.com', f'/api/v3/coins/{cg_id}', None, 200, {
+            'id': cg_id, 'description': {'en': f"{name} is a decentralised network. " * 10}
+        })
+
+    store.add('GET', 'newsapi.org', '/v2/everything', None, 200, {
+        'status': 'ok',
+        'articles': [{'title': headline(), 'url': f"https://news.example.com/{i}"} for i in range(items_per_feed)]
+    })
+    for subreddit in ('cryptocurrency', 'CryptoMarkets'):
+        store.add('GET', 'www.reddit.com', f'/r/{subreddit}/search.json', None, 200, {
+            'data': {'children': [
+                {'data': {'title': headline(), 'selftext': headline(), 'permalink': f"/r/{subreddit}/comments/{i}"}}
+                for i in range(items_per_feed)
+            ]}
+        })
+    store.add('GET', 'api.twitter.com', '/2/tweets/search/recent', None, 200, {
+        'data': [{'id': str(i), 'text': headline(), 'edit_history_tweet_ids': [str(i)]} for i in range(items_per_feed)],
+        'meta': {'result_count': items_per_feed}
+    })
+    store.add('GET', 'min-api.cryptocompare.com', '/data/v2/news/', None, 200, {
+        'Data': [{'id': str(i), 'title': headline(), 'url': f"https://cc.example.com/{i}"} for i in range(items_per_feed)]
+    })
+    store.add('GET', 'cryptopanic.com', '/api/v1/posts/', None, 200, {
+        'results': [{'title': headline(), 'url': f"https://cryptopanic.example.com/{i}"} for i in range(items_per_feed)]
+    })
+    return store
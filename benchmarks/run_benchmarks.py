@@ -0,0 +1,219 @@
+"""Offline benchmark suite for the collectors and the predictor.
+
+Replays recorded API responses from a local HTTP stub and runs every pass
+against an embedded SQLite database loaded with synthetic Price_Data and
+chat_data, so no API keys, network or SQL Server are needed.
+
+Usage:
+    python benchmarks/run_benchmarks.py                          # 1x scale, compare with baseline
+    python benchmarks/run_benchmarks.py --scales 1 10 100
+    python benchmarks/run_benchmarks.py --suites collect_data run_predictions
+    python benchmarks/run_benchmarks.py --update-baseline        # accept current timings
+    python benchmarks/run_benchmarks.py --record benchmarks/fixtures/live
+                                                                 # capture live responses (needs real config)
+    python benchmarks/run_benchmarks.py --fixtures benchmarks/fixtures/live
+
+Exit status is 1 when any suite is slower than its baseline by more than
+--tolerance.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / 'src'
+BASELINE_FILE = BENCH_DIR / 'baseline.json'
+RESULTS_DIR = BENCH_DIR / 'results'
+
+SUITES = ('collect_data', 'collect_chat_data', 'run_predictions')
+
+def setup_environment(record=False):
+    """Make src importable with the benchmark config and metrics enabled"""
+    os.environ.setdefault('CRYPTO_METRICS', '1')
+    # Replayed responses have no provider quota; keep the real budget file untouched
+    os.environ.setdefault('CRYPTO_RATE_LIMIT', '0')
+    sys.path.insert(0, str(BENCH_DIR))
+    sys.path.insert(0, str(SRC_DIR))
+    if not record:
+        import bench_config
+        sys.modules['config'] = bench_config
+
+def coins_from_store(store):
+    """Universe (symbol, name, price) as served by the coins/markets fixture"""
+    entry = store.find('GET', 'api.coingecko.com', '/api/v3/coins/markets', {})
+    return [
+        (coin['symbol'].upper(), coin['name'], float(coin.get('current_price') or 1.0))
+        for coin in entry['body']
+    ]
+
+def patch_database(db_path):
+    import pyodbc
+    import PricePredictor
+    import embedded_db
+
+    pyodbc.connect = embedded_db.connect_factory(db_path)
+    PricePredictor.create_engine = embedded_db.create_engine_factory(db_path)
+
+def patch_exchange(coins):
+    """Preload Binance markets so ccxt goes straight to the ticker endpoint"""
+    import ccxt
+    real_binance = getattr(ccxt.binance, 'real_binance', ccxt.binance)
+    markets = [
+        {
+            'id': f"{symbol}USDT", 'symbol': f"{symbol}/USDT", 'base': symbol, 'quote': 'USDT',
+            'baseId': symbol, 'quoteId': 'USDT', 'type': 'spot', 'spot': True, 'margin': False,
+            'swap': False, 'future': False, 'option': False, 'contract': False,
+            'linear': None, 'inverse': None, 'active': True,
+            'precision': {'amount': 8, 'price': 8}, 'limits': {}, 'info': {}
+        }
+        for symbol, _, _ in coins
+    ]
+
+    def binance(config=None):
+        exchange = real_binance(config or {})
+        exchange.set_markets(markets)
+        return exchange
+
+    binance.real_binance = real_binance
+    ccxt.binance = binance
+
+def run_suite(name):
+    """Time one full pass; returns (seconds, success)"""
+    if name == 'collect_data':
+        from PriceCollector import CryptoCollector
+        target = CryptoCollector()
+        start = time.perf_counter()
+        success = target.collect_data(is_gui_mode=False)
+    elif name == 'collect_chat_data':
+        from CollectChat import ChatCollector
+        target = ChatCollector()
+        start = time.perf_counter()
+        success = target.collect_chat_data()
+    elif name == 'run_predictions':
+        from PricePredictor import PricePredictor
+        target = PricePredictor()
+        start = time.perf_counter()
+        target.run_predictions()
+        success = True
+    else:
+        raise ValueError(f"Unknown suite: {name}")
+    return time.perf_counter() - start, bool(success)
+
+def compare_with_baseline(results, tolerance):
+    if not BASELINE_FILE.exists():
+        print(f"No baseline at {BASELINE_FILE}; run with --update-baseline to record one")
+        return []
+    with open(BASELINE_FILE) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    for suite, scales in results.items():
+        for scale, result in scales.items():
+            reference = baseline.get(suite, {}).get(scale)
+            if not reference:
+                continue
+            ratio = result['median'] / reference['median']
+            status = 'REGRESSION' if ratio > 1 + tolerance else 'ok'
+            print(f"{suite:<20} {scale:>5}x  {result['median']:9.3f}s  baseline {reference['median']:9.3f}s  {ratio:6.2f}x  {status}")
+            if status != 'ok':
+                regressions.append((suite, scale, ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline collector/predictor benchmarks')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1], help='Synthetic history multipliers (1, 10, 100)')
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=list(SUITES))
+    parser.add_argument('--repeat', type=int, default=3, help='Passes per suite and scale')
+    parser.add_argument('--fixtures', help='Directory with a recorded responses.json (default: generated)')
+    parser.add_argument('--record', help='Run suites against the live APIs and save responses here')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline')
+    args = parser.parse_args()
+
+    setup_environment(record=bool(args.record))
+    import http_stub
+
+    if args.record:
+        store = http_stub.FixtureStore()
+        http_stub.install_recorder(store)
+        try:
+            for suite in args.suites:
+                print(f"Recording {suite}...")
+                run_suite(suite)
+        finally:
+            http_stub.uninstall()
+            store.save(args.record)
+        print(f"Saved fixtures to {args.record}")
+        return 0
+
+    import embedded_db
+    from Metrics import metrics
+
+    store = http_stub.FixtureStore.load(args.fixtures) if args.fixtures else http_stub.generate_fixtures()
+    coins = coins_from_store(store)
+    server = http_stub.StubServer(store).start()
+    http_stub.install_replay(server.base_url)
+    patch_exchange(coins)
+
+    work_dir = Path(tempfile.mkdtemp(prefix='crypto_bench_'))
+    results = {}
+    try:
+        for scale in args.scales:
+            template = work_dir / f'template_{scale}x.db'
+            print(f"Building synthetic database at {scale}x...")
+            started = time.perf_counter()
+            embedded_db.build_database(str(template), coins, scale=scale)
+            print(f"  built in {time.perf_counter() - started:.1f}s")
+
+            for suite in args.suites:
+                timings = []
+                for run in range(args.repeat):
+                    # Fresh copy per pass so earlier writes don't skew later ones
+                    db_path = work_dir / f'{suite}_{scale}x_{run}.db'
+                    shutil.copyfile(template, db_path)
+                    patch_database(str(db_path))
+                    seconds, success = run_suite(suite)
+                    timings.append(seconds)
+                    print(f"  {suite} {scale}x pass {run + 1}/{args.repeat}: {seconds:.3f}s{'' if success else ' (reported failure)'}")
+                    os.remove(db_path)
+                results.setdefault(suite, {})[str(scale)] = {
+                    'median': statistics.median(timings),
+                    'min': min(timings),
+                    'runs': timings
+                }
+    finally:
+        http_stub.uninstall()
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'fixtures': args.fixtures or 'generated',
+        'results': results,
+        'metrics': metrics.snapshot()
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    report_file = RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {report_file}")
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump({k: report[k] for k in ('timestamp', 'python', 'fixtures', 'results')}, f, indent=2)
+        print(f"Baseline updated: {BASELINE_FILE}")
+        return 0
+
+    regressions = compare_with_baseline(results, args.tolerance)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import json
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+class ServiceHistoryStore:
+    """Append-only service history backed by SQLite with an in-memory ring buffer.
+
+    Each status change is one INSERT; the most recent entries are served from
+    memory, older ones by indexed queries on timestamp and status.
+    """
+    TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+    def __init__(self, db_path, capacity=1000, legacy_json=None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS service_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                status TEXT NOT NULL,
+                message TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_history_timestamp ON service_history (timestamp)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_history_status_timestamp ON service_history (status, timestamp)")
+        self.conn.commit()
+
+        if legacy_json is not None:
+            self._migrate_json(Path(legacy_json))
+
+        # Newest entry first, matching the Treeview order
+        self.recent = deque(self.query(limit=capacity), maxlen=capacity)
+
+    def _migrate_json(self, path):
+        """One-off import of the old rewrite-everything JSON history"""
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+            with self.lock:
+                self.conn.executemany(
+                    "INSERT INTO service_history (timestamp, status, message) VALUES (?, ?, ?)",
+                    [(e['timestamp'], e['status'], e['message']) for e in entries]
+                )
+                self.conn.commit()
+            path.rename(path.with_name(path.name + '.migrated'))
+        except Exception as e:
+            print(f"Error migrating history: {e}")
+
+    def append(self, status, message):
+        entry = {
+            'timestamp': datetime.now().strftime(self.TIMESTAMP_FORMAT),
+            'status': status,
+            'message': message
+        }
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO service_history (timestamp, status, message) VALUES (?, ?, ?)",
+                (entry['timestamp'], entry['status'], entry['message'])
+            )
+            self.conn.commit()
+            self.recent.appendleft(entry)
+        return entry
+
+    def query(self, start=None, end=None, status=None, limit=1000):
+        """Entries newest first, optionally limited to a time range and/or status"""
+        sql = "SELECT timestamp, status, message FROM service_history WHERE 1=1"
+        params = []
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start.strftime(self.TIMESTAMP_FORMAT) if isinstance(start, datetime) else start)
+        if end is not None:
+            sql += " AND timestamp <= ?"
+            params.append(end.strftime(self.TIMESTAMP_FORMAT) if isinstance(end, datetime) else end)
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [{'timestamp': r[0], 'status': r[1], 'message': r[2]} for r in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
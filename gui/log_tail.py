@@ -0,0 +1,89 @@
+import os
+from collections import deque
+
+class LogTailer:
+    """Keep the last N lines of a growing log file at constant cost per refresh.
+
+    The first poll seeks backwards from EOF in blocks until it has enough
+    lines; later polls read only the bytes appended since the previous poll.
+    Truncation or rotation (file shrank or was replaced) restarts from the tail.
+    """
+    BLOCK_SIZE = 8192
+    # An append bigger than this is treated like a fresh open: only its tail is read
+    MAX_APPEND_READ = 256 * 1024
+
+    def __init__(self, path, max_lines=20, encoding='utf-8'):
+        self.path = path
+        self.max_lines = max_lines
+        self.encoding = encoding
+        self.lines = deque(maxlen=max_lines)
+        self.offset = None
+        self.file_id = None
+        self.partial = b''
+
+    def reset(self):
+        self.lines.clear()
+        self.offset = None
+        self.file_id = None
+        self.partial = b''
+
+    def _read_tail(self, f, end):
+        """Read backwards from `end` until max_lines complete lines are buffered"""
+        position = end
+        chunks = []
+        newlines = 0
+        while position > 0 and newlines <= self.max_lines:
+            size = min(self.BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+        data = b''.join(reversed(chunks))
+        if position > 0:
+            # Drop the (probably cut) first line
+            data = data.split(b'\n', 1)[-1] if b'\n' in data else b''
+        return data
+
+    def _ingest(self, data):
+        data = self.partial + data
+        *complete, self.partial = data.split(b'\n')
+        for line in complete:
+            self.lines.append(line.decode(self.encoding, errors='replace').rstrip('\r'))
+
+    def poll(self):
+        """Pick up new lines; returns True when the buffered lines changed"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            changed = bool(self.lines)
+            self.reset()
+            return changed
+
+        file_id = (stat.st_dev, stat.st_ino)
+        rotated = self.file_id is not None and (file_id != self.file_id or stat.st_size < self.offset)
+        if rotated:
+            self.reset()
+
+        if self.offset is not None and stat.st_size == self.offset:
+            return False
+
+        with open(self.path, 'rb') as f:
+            if self.offset is None or stat.st_size - self.offset > self.MAX_APPEND_READ:
+                self.lines.clear()
+                self.partial = b''
+                data = self._read_tail(f, stat.st_size)
+            else:
+                f.seek(self.offset)
+                data = f.read(stat.st_size - self.offset)
+
+        self.offset = stat.st_size
+        self.file_id = file_id
+        self._ingest(data)
+        return True
+
+    def text(self):
+        lines = list(self.lines)
+        if self.partial:
+            lines.append(self.partial.decode(self.encoding, errors='replace'))
+        return '\n'.join(lines) + ('\n' if lines else '')
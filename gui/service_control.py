@@ -8,6 +8,7 @@ import os
 import json
 import logging
 import traceback
+from log_tail import LogTailer
 
 class ServiceControlPanel:
     def __init__(self, root):
@@ -30,6 +31,8 @@ class ServiceControlPanel:
         os.makedirs(log_dir, exist_ok=True)
         
         self.log_file = f'{log_dir}/service_gui.log'
+        self.gui_log_tail = LogTailer(self.log_file)
+        self.service_log_tail = LogTailer(f'{log_dir}/service.log')
         logging.basicConfig(
             filename=self.log_file,
             level=logging.DEBUG,
@@ -169,19 +172,18 @@ class ServiceControlPanel:
     def update_log_display(self):
         """Update the log display with recent logs"""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r') as f:
-                    # Get last 20 lines
-                    lines = f.readlines()[-20:]
-                    self.log_text.delete(1.0, tk.END)
-                    self.log_text.insert(tk.END, ''.join(lines))
-                    
-            # Also check service log
-            service_log = 'C:/PythonApps/CryptoAiAnalyzer/logs/service.log'
-            if os.path.exists(service_log):
-                with open(service_log, 'r') as f:
-                    lines = f.readlines()[-20:]
-                    self.log_text.insert(tk.END, '\nService Log:\n' + ''.join(lines))
+            # Tailers only read what was appended since the last refresh
+            gui_changed = self.gui_log_tail.poll()
+            service_changed = self.service_log_tail.poll()
+            if not (gui_changed or service_changed):
+                return
+
+            self.log_text.delete(1.0, tk.END)
+            self.log_text.insert(tk.END, self.gui_log_tail.text())
+            
+            # Also show service log
+            if self.service_log_tail.lines:
+                self.log_text.insert(tk.END, '\nService Log:\n' + self.service_log_tail.text())
                     
         except Exception as e:
             self.logger.error(f"Error updating log display: {str(e)}")
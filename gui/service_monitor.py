@@ -7,12 +7,15 @@ import win32api
 import win32con
 import sys
 from pathlib import Path
-import json
 from datetime import datetime
-import threading
 import time
 import ctypes
 import logging
+from log_tail import LogTailer
+from history_store import ServiceHistoryStore
+from status_provider import create_status_provider
+from collections import deque
+from datetime import timedelta
 
 # Configure logging
 logging.basicConfig(
@@ -39,12 +42,20 @@ class ServiceMonitor(tk.Tk):
         self.title("Crypto AI Service Monitor")
         self.geometry("800x600")
         
-        # Service status history
+        # Service status history (append-only; the old JSON file is imported once)
         self.history_file = Path("logs/service_history.json")
-        self.load_history()
+        self.history_store = ServiceHistoryStore(
+            Path("logs/service_history.db"), capacity=1000, legacy_json=self.history_file
+        )
+        self.history_items = deque()
+        self.history_filter = None
+        
+        # Status changes are pushed by the service endpoint (SCM is only asked on disconnect)
+        self.status_provider = create_status_provider()
+        self.last_status = None
         
         self.create_widgets()
-        self.update_status()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def create_widgets(self):
         # Status Frame
@@ -71,6 +82,26 @@ class ServiceMonitor(tk.Tk):
         history_frame = ttk.LabelFrame(self, text="Service History", padding=10)
         history_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # History filters
+        filter_frame = ttk.Frame(history_frame)
+        filter_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(filter_frame, text="Status:").pack(side=tk.LEFT, padx=5)
+        self.status_filter_var = tk.StringVar(value='All')
+        ttk.Combobox(
+            filter_frame, textvariable=self.status_filter_var, state='readonly', width=10,
+            values=['All', 'Status', 'Action', 'Success', 'Info', 'Error']
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(filter_frame, text="Period:").pack(side=tk.LEFT, padx=5)
+        self.period_filter_var = tk.StringVar(value='All')
+        ttk.Combobox(
+            filter_frame, textvariable=self.period_filter_var, state='readonly', width=10,
+            values=['All', 'Last hour', 'Last 24h', 'Last 7 days']
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(filter_frame, text="Apply", command=self.apply_history_filter).pack(side=tk.LEFT, padx=5)
+        
         # Create Treeview
         columns = ('timestamp', 'status', 'message')
         self.history_tree = ttk.Treeview(history_frame, columns=columns, show='headings')
@@ -93,90 +124,92 @@ class ServiceMonitor(tk.Tk):
         self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Service log tail
+        log_frame = ttk.LabelFrame(self, text="Service Log", padding=10)
+        log_frame.pack(fill=tk.BOTH, padx=5, pady=5)
+        
+        self.log_text = tk.Text(log_frame, height=8, wrap=tk.NONE)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
+        self.service_log_tail = LogTailer(str(Path("logs/crypto_service.log")))
+        self.refresh_log_tail()
+        
         # Load history
         self.update_history_display()
         
-        # Start monitoring thread
-        self.monitor_thread = threading.Thread(target=self.monitor_service, daemon=True)
-        self.monitor_thread.start()
+        # Subscribe to status changes; callbacks arrive on the provider thread
+        self.status_provider.subscribe(lambda event: self.after(0, self.on_status_event, event))
     
-    def load_history(self):
-        try:
-            if self.history_file.exists():
-                with open(self.history_file, 'r') as f:
-                    self.history = json.load(f)
-            else:
-                self.history = []
-        except Exception as e:
-            print(f"Error loading history: {e}")
-            self.history = []
+    def add_history_entry(self, status, message):
+        entry = self.history_store.append(status, message)
+        # May be called from the monitor thread; touch the Treeview on the Tk thread
+        self.after(0, self.insert_history_row, entry)
     
-    def save_history(self):
-        try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f)
-        except Exception as e:
-            print(f"Error saving history: {e}")
+    def insert_history_row(self, entry):
+        """Insert one entry at the top of the Treeview, dropping the oldest row past capacity"""
+        if self.history_filter is not None:
+            start, status = self.history_filter
+            if (status is not None and entry['status'] != status) or \
+                    (start is not None and entry['timestamp'] < start.strftime(ServiceHistoryStore.TIMESTAMP_FORMAT)):
+                return
+        
+        item = self.history_tree.insert('', 0, values=(
+            entry['timestamp'],
+            entry['status'],
+            entry['message']
+        ))
+        self.history_items.appendleft(item)
+        while len(self.history_items) > self.history_store.capacity:
+            self.history_tree.delete(self.history_items.pop())
     
-    def add_history_entry(self, status, message):
-        entry = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'status': status,
-            'message': message
-        }
-        self.history.append(entry)
-        if len(self.history) > 1000:  # Keep last 1000 entries
-            self.history = self.history[-1000:]
-        self.save_history()
+    def apply_history_filter(self):
+        status = self.status_filter_var.get()
+        period = {
+            'Last hour': timedelta(hours=1),
+            'Last 24h': timedelta(hours=24),
+            'Last 7 days': timedelta(days=7)
+        }.get(self.period_filter_var.get())
+        
+        status = None if status == 'All' else status
+        start = datetime.now() - period if period else None
+        self.history_filter = None if status is None and start is None else (start, status)
         self.update_history_display()
     
     def update_history_display(self):
-        # Clear existing items
-        for item in self.history_tree.get_children():
+        """Full redraw; only used on startup and when the filter changes"""
+        for item in self.history_items:
             self.history_tree.delete(item)
+        self.history_items.clear()
         
-        # Add history items
-        for entry in reversed(self.history):  # Show newest first
-            self.history_tree.insert('', 'end', values=(
+        if self.history_filter is None:
+            entries = list(self.history_store.recent)
+        else:
+            start, status = self.history_filter
+            entries = self.history_store.query(start=start, status=status, limit=self.history_store.capacity)
+        
+        # Entries are newest first
+        for entry in entries:
+            self.history_items.append(self.history_tree.insert('', 'end', values=(
                 entry['timestamp'],
                 entry['status'],
                 entry['message']
-            ))
+            )))
     
-    def get_service_status(self):
+    def refresh_log_tail(self):
         try:
-            # Get service handle with full access
-            scm = win32service.OpenSCManager(None, None, win32service.SC_MANAGER_ALL_ACCESS)
-            try:
-                service = win32service.OpenService(scm, "CryptoAiService", win32service.SERVICE_QUERY_STATUS)
-                try:
-                    status_info = win32service.QueryServiceStatusEx(service)
-                    status = status_info["CurrentState"]
-                    
-                    status_map = {
-                        win32service.SERVICE_STOPPED: "Stopped",
-                        win32service.SERVICE_START_PENDING: "Starting",
-                        win32service.SERVICE_STOP_PENDING: "Stopping",
-                        win32service.SERVICE_RUNNING: "Running",
-                        win32service.SERVICE_PAUSED: "Paused"
-                    }
-                    
-                    status_text = status_map.get(status, f"Unknown ({status})")
-                    logger.debug(f"Service status query: {status_text}")
-                    return status_text
-                    
-                finally:
-                    win32service.CloseServiceHandle(service)
-            finally:
-                win32service.CloseServiceHandle(scm)
-            
+            if self.service_log_tail.poll():
+                self.log_text.delete(1.0, tk.END)
+                self.log_text.insert(tk.END, self.service_log_tail.text())
+                self.log_text.see(tk.END)
         except Exception as e:
-            error_msg = f"Error querying service status: {str(e)}"
-            logger.error(error_msg)
-            return "Error"
+            logger.error(f"Error refreshing service log: {str(e)}")
+        self.after(2000, self.refresh_log_tail)
+    
+    def get_service_status(self):
+        return self.status_provider.get_status()
     
-    def update_status(self):
-        status = self.get_service_status()
+    def update_status(self, status=None):
+        if status is None:
+            status = self.get_service_status()
         self.status_label.config(text=f"Status: {status}")
         
         # Update button states
@@ -185,25 +218,25 @@ class ServiceMonitor(tk.Tk):
         self.stop_btn["state"] = "normal" if is_running else "disabled"
         self.restart_btn["state"] = "normal" if is_running else "disabled"
     
-    def monitor_service(self):
-        last_status = None
-        while True:
-            try:
-                current_status = self.get_service_status()
-                if current_status != last_status:
-                    self.add_history_entry(
-                        "Status", 
-                        f"Service status changed to {current_status}"
-                    )
-                    last_status = current_status
-                
-                # Update GUI
-                self.after(0, self.update_status)
-                
-            except Exception as e:
-                logger.error(f"Monitor error: {str(e)}")
-                
-            time.sleep(5)  # Check every 5 seconds
+    def on_status_event(self, event):
+        current_status = event.get('status', 'Unknown')
+        if current_status != self.last_status:
+            self.add_history_entry("Status", f"Service status changed to {current_status}")
+            self.last_status = current_status
+        
+        # Surface failed jobs reported by the service
+        if event.get('type') == 'job':
+            job = event.get('job')
+            info = event.get('jobs', {}).get(job, {})
+            if info.get('state') == 'failed':
+                self.add_history_entry("Error", f"{job} failed: {info.get('error', '')}")
+        
+        self.update_status(current_status)
+    
+    def on_close(self):
+        self.status_provider.stop()
+        self.history_store.close()
+        self.destroy()
     
     def start_service(self):
         try:
@@ -7,6 +7,7 @@ import ctypes
 import time
 import logging
 from pathlib import Path
+from status_provider import create_status_provider
 
 # Setup logging
 log_dir = Path("logs")
@@ -25,46 +26,20 @@ def is_admin():
 
 class SimpleMonitor(tk.Tk):
     def get_service_status(self):
-        try:
-            scm = win32service.OpenSCManager(
-                None,
-                None,
-                win32service.SC_MANAGER_CONNECT
-            )
-            try:
-                hs = win32service.OpenService(
-                    scm,
-                    "CryptoAiService",
-                    win32service.SERVICE_QUERY_STATUS
-                )
-                if not hs:
-                    return "Not Installed"
-                try:
-                    status = win32service.QueryServiceStatus(hs)[1]
-                    status_map = {
-                        win32service.SERVICE_STOPPED: "Stopped",
-                        win32service.SERVICE_START_PENDING: "Starting",
-                        win32service.SERVICE_STOP_PENDING: "Stopping",
-                        win32service.SERVICE_RUNNING: "Running",
-                        win32service.SERVICE_PAUSED: "Paused"
-                    }
-                    return status_map.get(status, f"Unknown ({status})")
-                finally:
-                    win32service.CloseServiceHandle(hs)
-            finally:
-                win32service.CloseServiceHandle(scm)
-        except Exception as e:
-            logging.error(f"Error getting service status: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+        return self.status_provider.get_status()
 
-    def update_status(self):
-        status = self.get_service_status()
+    def update_status(self, status=None):
+        if status is None:
+            status = self.get_service_status()
         self.status_label.config(text=f"Service Status: {status}")
         logging.debug(f"Status updated to: {status}")
 
-    def schedule_update(self):
-        self.update_status()
-        self.after(5000, self.schedule_update)
+    def on_status_event(self, event):
+        self.update_status(event.get('status', 'Unknown'))
+
+    def on_close(self):
+        self.status_provider.stop()
+        self.destroy()
 
     def __init__(self):
         super().__init__()
@@ -90,11 +65,10 @@ class SimpleMonitor(tk.Tk):
         ttk.Button(btn_frame, text="Stop", command=self.stop_service).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Refresh", command=self.update_status).pack(side=tk.LEFT, padx=5)
         
-        # Update status immediately
-        self.update_status()
-        
-        # Schedule regular updates
-        self.after(5000, self.schedule_update)
+        # Status changes are pushed by the service; the callback runs off the Tk thread
+        self.status_provider = create_status_provider()
+        self.status_provider.subscribe(lambda event: self.after(0, self.on_status_event, event))
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         logging.debug("SimpleMonitor initialization complete")
 
     def start_service(self):
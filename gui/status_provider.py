@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import socket
+import logging
+import threading
+
+logger = logging.getLogger('StatusProvider')
+
+# Keep in sync with services/status_endpoint.py
+STATUS_HOST = '127.0.0.1'
+STATUS_PORT = int(os.environ.get('CRYPTO_STATUS_PORT', 8766))
+SERVICE_NAME = "CryptoAiService"
+
+class StatusProvider:
+    """Source of service status that pushes changes to subscribers.
+
+    Callbacks receive a dict with at least a 'status' key ("Running",
+    "Stopped", ...) and are invoked from a background thread, so GUI code
+    should marshal them onto the Tk thread with after().
+    """
+
+    def __init__(self):
+        self.callbacks = []
+        self.last_event = {'status': 'Unknown', 'jobs': {}}
+        self.lock = threading.Lock()
+
+    def subscribe(self, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+            event = self.last_event
+        callback(event)
+
+    def get_status(self):
+        return self.last_event['status']
+
+    def emit(self, event):
+        with self.lock:
+            previous = self.last_event
+            self.last_event = event
+            callbacks = list(self.callbacks)
+        # Heartbeats only confirm liveness; don't wake the GUI for them
+        if event.get('type') == 'heartbeat' and previous.get('status') == event.get('status'):
+            return
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Status callback error: {str(e)}")
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+class StaticStatusProvider(StatusProvider):
+    """Stand-in provider for Linux and tests: status changes only via set_status()"""
+
+    def __init__(self, status='Stopped'):
+        super().__init__()
+        self.last_event = {'status': status, 'jobs': {}}
+
+    def set_status(self, status, **fields):
+        self.emit(dict(fields, status=status, jobs=fields.get('jobs', {})))
+
+class ScmStatusProvider(StatusProvider):
+    """Queries the Windows Service Control Manager through cached handles.
+
+    Used on demand (initial state and after the service endpoint goes away),
+    never on a polling timer.
+    """
+
+    def __init__(self, service_name=SERVICE_NAME):
+        super().__init__()
+        import win32service
+        self.win32service = win32service
+        self.service_name = service_name
+        self.scm = None
+        self.service = None
+        self.status_map = {
+            win32service.SERVICE_STOPPED: "Stopped",
+            win32service.SERVICE_START_PENDING: "Starting",
+            win32service.SERVICE_STOP_PENDING: "Stopping",
+            win32service.SERVICE_RUNNING: "Running",
+            win32service.SERVICE_PAUSED: "Paused"
+        }
+
+    def _handle(self):
+        if self.service is None:
+            # Query-only rights are enough; no full-access SCM handle per check
+            self.scm = self.win32service.OpenSCManager(None, None, self.win32service.SC_MANAGER_CONNECT)
+            self.service = self.win32service.OpenService(
+                self.scm, self.service_name, self.win32service.SERVICE_QUERY_STATUS
+            )
+        return self.service
+
+    def close_handles(self):
+        for handle in (self.service, self.scm):
+            if handle is not None:
+                try:
+                    self.win32service.CloseServiceHandle(handle)
+                except Exception:
+                    pass
+        self.service = self.scm = None
+
+    def get_status(self):
+        try:
+            state = self.win32service.QueryServiceStatus(self._handle())[1]
+            status = self.status_map.get(state, f"Unknown ({state})")
+        except Exception as e:
+            # Handle may be stale (service reinstalled); reopen next time
+            self.close_handles()
+            status = "Not Installed" if getattr(e, 'winerror', None) == 1060 else "Error"
+        self.emit({'status': status, 'jobs': {}})
+        return status
+
+    def stop(self):
+        self.close_handles()
+
+class EndpointStatusProvider(StatusProvider):
+    """Subscribes to the status endpoint exposed by the running service.
+
+    While connected, every change is pushed by the service. When the
+    connection drops, the fallback provider is asked once for the real state
+    and the connection is retried with backoff.
+    """
+    RETRY_SECONDS = (1, 2, 5, 10, 30)
+
+    def __init__(self, fallback, host=STATUS_HOST, port=STATUS_PORT):
+        super().__init__()
+        self.fallback = fallback
+        self.host = host
+        self.port = port
+        self.stopped = threading.Event()
+        self.sock = None
+        self.thread = None
+
+    def get_status(self):
+        if self.sock is None:
+            return self.fallback.get_status()
+        return self.last_event['status']
+
+    def start(self):
+        self.emit(dict(self.fallback.last_event))
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        attempt = 0
+        while not self.stopped.is_set():
+            try:
+                self.sock = socket.create_connection((self.host, self.port), timeout=5)
+                # Heartbeats arrive every 15s; treat a long silence as a dead service
+                self.sock.settimeout(45)
+                attempt = 0
+                buffer = b''
+                while not self.stopped.is_set():
+                    data = self.sock.recv(4096)
+                    if not data:
+                        break
+                    buffer += data
+                    while b'\n' in buffer:
+                        line, buffer = buffer.split(b'\n', 1)
+                        if line.strip():
+                            self.emit(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            finally:
+                if self.sock is not None:
+                    try:
+                        self.sock.close()
+                    except OSError:
+                        pass
+                    self.sock = None
+
+            if self.stopped.is_set():
+                break
+            # Service endpoint unavailable: report what the platform says once, then retry
+            self.emit(dict(self.fallback.last_event, status=self.fallback.get_status()))
+            self.stopped.wait(self.RETRY_SECONDS[min(attempt, len(self.RETRY_SECONDS) - 1)])
+            attempt += 1
+
+    def stop(self):
+        self.stopped.set()
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.fallback.stop()
+
+def create_status_provider():
+    """Endpoint subscription backed by the SCM on Windows, a static stand-in elsewhere"""
+    if sys.platform == 'win32':
+        fallback = ScmStatusProvider()
+    else:
+        fallback = StaticStatusProvider('Stopped')
+    return EndpointStatusProvider(fallback).start()
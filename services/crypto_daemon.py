@@ -0,0 +1,130 @@
+import os
+import sys
+import atexit
+import signal
+import argparse
+from pathlib import Path
+
+# Add the parent directory to sys.path to import src modules
+parent_dir = str(Path(__file__).resolve().parent.parent)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from services.scheduler_core import ServiceCore
+
+DEFAULT_PID_FILE = Path(parent_dir) / 'logs' / 'crypto_service.pid'
+DEFAULT_HEALTH_FILE = Path(parent_dir) / 'logs' / 'crypto_service.health.json'
+
+def read_pid(pid_file):
+    try:
+        return int(Path(pid_file).read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def running_pid(pid_file):
+    """Pid of another live instance holding the pid file, if any"""
+    existing = read_pid(pid_file)
+    if existing and existing != os.getpid() and pid_alive(existing):
+        return existing
+    return None
+
+def write_pid_file(pid_file):
+    """Claim the pid file, refusing to start next to a live instance"""
+    pid_file = Path(pid_file)
+    pid_file.parent.mkdir(parents=True, exist_ok=True)
+    existing = running_pid(pid_file)
+    if existing:
+        raise RuntimeError(f"Already running with pid {existing} ({pid_file})")
+    pid_file.write_text(f"{os.getpid()}\n")
+
+    def remove_pid_file():
+        if read_pid(pid_file) == os.getpid():
+            pid_file.unlink()
+    atexit.register(remove_pid_file)
+
+def daemonize():
+    """Classic double fork: detach from the terminal and session, stdio to /dev/null"""
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+    os.chdir('/')
+    os.umask(0o022)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with open(os.devnull, 'rb') as devnull_in, open(os.devnull, 'ab') as devnull_out:
+        os.dup2(devnull_in.fileno(), sys.stdin.fileno())
+        os.dup2(devnull_out.fileno(), sys.stdout.fileno())
+        os.dup2(devnull_out.fileno(), sys.stderr.fileno())
+
+def stop_running(pid_file):
+    pid = read_pid(pid_file)
+    if not pid or not pid_alive(pid):
+        print("Service is not running")
+        return 1
+    os.kill(pid, signal.SIGTERM)
+    print(f"Sent SIGTERM to {pid}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the crypto collection/prediction jobs outside the Windows SCM')
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'start', 'stop', 'status'],
+                        help='run: foreground, start: detach as daemon, stop: SIGTERM the daemon, status: show health')
+    parser.add_argument('--pid-file', default=str(DEFAULT_PID_FILE))
+    parser.add_argument('--health-file', default=str(DEFAULT_HEALTH_FILE))
+    parser.add_argument('--log-dir', default=None, help='Defaults to <repo>/logs')
+    parser.add_argument('--once', action='store_true', help='Run each job once and exit (cron, benchmarks)')
+    args = parser.parse_args(argv)
+    # Absolute before daemonize() chdirs to /, so stop/status find what start wrote
+    args.pid_file = os.path.abspath(args.pid_file)
+    args.health_file = os.path.abspath(args.health_file)
+    if args.log_dir:
+        args.log_dir = os.path.abspath(args.log_dir)
+
+    if args.command == 'stop':
+        return stop_running(args.pid_file)
+    if args.command == 'status':
+        pid = read_pid(args.pid_file)
+        state = 'running' if pid and pid_alive(pid) else 'stopped'
+        print(f"Service is {state}" + (f" (pid {pid})" if state == 'running' else ''))
+        if Path(args.health_file).exists():
+            print(Path(args.health_file).read_text())
+        return 0 if state == 'running' else 3
+
+    if args.command == 'start':
+        if os.name != 'posix':
+            parser.error("'start' (daemonize) is only available on POSIX; use 'run'")
+        # Checked while stderr and the exit status still reach the caller
+        existing = running_pid(args.pid_file)
+        if existing:
+            print(f"Service is already running (pid {existing})", file=sys.stderr)
+            return 1
+        daemonize()
+
+    write_pid_file(args.pid_file)
+    core = ServiceCore(log_dir=args.log_dir, health_file=args.health_file, echo=args.command == 'run')
+
+    # Graceful shutdown: finish the current job, then leave the loop
+    def handle_signal(signum, frame):
+        core.logger.info(f"Received signal {signum}, stopping")
+        core.stop()
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, handle_signal)
+
+    core.run(once=args.once)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
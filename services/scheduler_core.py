@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import traceback
+from pathlib import Path
+from datetime import datetime
+import schedule
+
+# Add the parent directory to sys.path to import src modules
+parent_dir = str(Path(__file__).resolve().parent.parent)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+# src modules import their siblings (config, Metrics, ...) by plain name
+if str(Path(parent_dir) / 'src') not in sys.path:
+    sys.path.append(str(Path(parent_dir) / 'src'))
+
+from src.PriceCollector import CryptoCollector
+from src.CollectChat import ChatCollector
+from src.PricePredictor import PricePredictor
+from LivePredictor import LivePredictor
+from Metrics import metrics
+from LogSetup import configure_root
+from Sharding import CoinPartitioner, sharding_enabled
+from CoinUniverse import universe
+from ReadCache import read_cache
+from services.status_endpoint import StatusEndpoint
+
+class ServiceCore:
+    """Job set and schedule loop shared by the Windows service and the POSIX daemon.
+
+    The platform wrappers only translate their stop signal (SCM stop request,
+    SIGTERM, Ctrl+C) into stop(); everything else happens here.
+    """
+    HEALTH_INTERVAL = 30
+
+    def __init__(self, log_dir=None, health_file=None, echo=False):
+        # Setup logging
+        self.log_dir = Path(log_dir) if log_dir else Path(parent_dir) / 'logs'
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        # Rotating, queue-backed root handler so collector logging stays off the job threads
+        configure_root(str(self.log_dir / 'crypto_service.log'))
+        self.logger = logging.getLogger('CryptoAiService')
+        self.echo = echo
+
+        self.stop_event = threading.Event()
+        self.health_file = Path(health_file) if health_file else None
+        self.started_at = datetime.now()
+        self.status = 'Starting'
+        self.jobs = {}
+        self.last_health = 0
+        # Kept across cycles: holds each coin's rolling window of daily bars
+        self.live_predictor = None
+
+        # Metrics export (no-op unless CRYPTO_METRICS=1)
+        self.metrics_file = self.log_dir / 'metrics.json'
+        try:
+            metrics.start_http_server(int(os.environ.get('CRYPTO_METRICS_PORT', 9108)))
+        except Exception as e:
+            self.logger.error(f"Metrics endpoint failed to start: {str(e)}")
+
+        # Push status/job changes to the monitor GUIs instead of having them poll the SCM
+        self.status_endpoint = None
+        try:
+            self.status_endpoint = StatusEndpoint().start()
+        except Exception as e:
+            self.logger.error(f"Status endpoint failed to start: {str(e)}")
+
+        # Latest price/prediction/sentiment per coin over local HTTP, invalidated by the jobs' writes
+        try:
+            read_cache.start_http_server()
+        except Exception as e:
+            self.logger.error(f"Read API failed to start: {str(e)}")
+
+    def say(self, message):
+        """Log a lifecycle message, echoing it to the console in foreground/debug mode"""
+        self.logger.info(message)
+        if self.echo:
+            print(message)
+
+    def publish_status(self, status):
+        self.status = status
+        if self.status_endpoint is not None:
+            self.status_endpoint.set_status(status)
+        self.write_health()
+
+    def publish_job(self, job, state, **details):
+        self.jobs[job] = dict(details, state=state, at=datetime.now().isoformat(timespec='seconds'))
+        if self.status_endpoint is not None:
+            self.status_endpoint.set_job_state(job, state, **details)
+
+    def stop_status_endpoint(self):
+        if self.status_endpoint is not None:
+            try:
+                self.status_endpoint.stop()
+            except Exception as e:
+                self.logger.error(f"Status endpoint shutdown error: {str(e)}")
+            self.status_endpoint = None
+
+    def export_metrics(self):
+        """Write the current metrics snapshot next to the service log"""
+        try:
+            metrics.write_json(str(self.metrics_file))
+        except Exception as e:
+            self.logger.error(f"Metrics export error: {str(e)}")
+
+    def write_health(self):
+        """Atomically rewrite the health file (pid, status, last job results)"""
+        if self.health_file is None:
+            return
+        self.last_health = time.monotonic()
+        health = {
+            'pid': os.getpid(),
+            'status': self.status,
+            'started': self.started_at.isoformat(timespec='seconds'),
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'jobs': self.jobs
+        }
+        try:
+            tmp_path = self.health_file.with_name(self.health_file.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(health, f, indent=2)
+            os.replace(tmp_path, self.health_file)
+        except Exception as e:
+            self.logger.error(f"Health file error: {str(e)}")
+
+    def run_universe_refresh(self):
+        """Re-rank the tracked coins from CoinGecko (price cycles read the cached result)"""
+        try:
+            self.logger.info("Refreshing coin universe")
+            self.publish_job('coin_universe', 'running')
+            with metrics.timer('job_seconds', job='coin_universe'):
+                success = universe.refresh()
+            if success:
+                self.publish_job('coin_universe', 'ok', coins=len(universe.coins))
+            else:
+                # Price collection carries on with the last known universe
+                self.logger.error("Coin universe refresh failed")
+                self.publish_job('coin_universe', 'failed')
+        except Exception as e:
+            self.logger.error(f"Coin universe refresh error: {str(e)}")
+            self.publish_job('coin_universe', 'failed', error=str(e))
+
+    def run_price_collector(self):
+        """Run the price collection task"""
+        try:
+            start_time = datetime.now()
+            self.logger.info(f"Starting price collection at {start_time}")
+            self.publish_job('price_collector', 'running')
+
+            with metrics.timer('job_seconds', job='price_collector'):
+                collector = CryptoCollector()
+                success = collector.collect_data(is_gui_mode=False)
+
+            end_time = datetime.now()
+            duration = end_time - start_time
+
+            if success:
+                self.logger.info(f"Price collection completed in {duration}")
+                self.publish_job('price_collector', 'ok', seconds=duration.total_seconds())
+                self.run_live_predictor()
+            else:
+                self.logger.error("Price collection failed")
+                self.publish_job('price_collector', 'failed', seconds=duration.total_seconds())
+
+        except Exception as e:
+            self.logger.error(f"Price collection error: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            self.publish_job('price_collector', 'failed', error=str(e))
+        finally:
+            self.export_metrics()
+
+    def run_chat_collector(self):
+        """Run the chat collection task"""
+        try:
+            self.logger.info("Starting chat collection")
+            self.publish_job('chat_collector', 'running')
+            # Import NLTK here when needed
+            import nltk
+            nltk_data_dir = os.path.join(parent_dir, 'nltk_data')
+            if nltk_data_dir not in nltk.data.path:
+                nltk.data.path.append(nltk_data_dir)
+
+            with metrics.timer('job_seconds', job='chat_collector'):
+                collector = ChatCollector()
+                collector.collect_chat_data()
+            self.logger.info("Chat collection completed")
+            self.publish_job('chat_collector', 'ok')
+        except Exception as e:
+            self.logger.error(f"Chat collection error: {str(e)}", exc_info=True)
+            self.publish_job('chat_collector', 'failed', error=str(e))
+        finally:
+            self.export_metrics()
+
+    def run_live_predictor(self):
+        """Re-predict from cached models with the prices just collected (no retraining)"""
+        try:
+            self.publish_job('live_predictor', 'running')
+            with metrics.timer('job_seconds', job='live_predictor'):
+                if self.live_predictor is None:
+                    self.live_predictor = LivePredictor()
+                saved = self.live_predictor.refresh()
+            self.publish_job('live_predictor', 'ok', coins=saved)
+        except Exception as e:
+            self.logger.error(f"Live prediction error: {str(e)}")
+            self.publish_job('live_predictor', 'failed', error=str(e))
+
+    def run_price_predictor(self):
+        """Run the price prediction task"""
+        try:
+            self.logger.info("Starting price prediction")
+            self.publish_job('price_predictor', 'running')
+            with metrics.timer('job_seconds', job='price_predictor'):
+                predictor = PricePredictor()
+                predictor.run_predictions()
+            self.logger.info("Price prediction completed")
+            self.publish_job('price_predictor', 'ok')
+        except Exception as e:
+            self.logger.error(f"Price prediction error: {str(e)}", exc_info=True)
+            self.publish_job('price_predictor', 'failed', error=str(e))
+        finally:
+            self.export_metrics()
+
+    def build_schedule(self):
+        """Recurring jobs on a private scheduler (not the schedule module's global one)"""
+        scheduler = schedule.Scheduler()
+        scheduler.every().hour.do(self.run_universe_refresh)
+        scheduler.every(5).minutes.do(self.run_price_collector)
+        scheduler.every(15).minutes.do(self.run_chat_collector)
+        scheduler.every().hour.do(self.run_price_predictor)
+        return scheduler
+
+    def run(self, once=False):
+        """Initial collection, then the schedule loop until stop() (or right away if once)"""
+        try:
+            self.say('='*50)
+            self.say(f'Service starting at {datetime.now()} (pid {os.getpid()})')
+            self.say('='*50)
+            self.publish_status('Running')
+
+            # Run initial collection on startup
+            self.say("Running initial data collection...")
+            for job in (self.run_universe_refresh, self.run_price_collector, self.run_chat_collector, self.run_price_predictor):
+                if self.stop_event.is_set():
+                    break
+                job()
+                self.write_health()
+
+            if once or self.stop_event.is_set():
+                return
+
+            scheduler = self.build_schedule()
+            self.say("Service scheduled tasks:")
+            self.say("- Coin universe refresh: every hour")
+            self.say("- Price collection: every 5 minutes")
+            self.say("- Chat collection: every 15 minutes")
+            self.say("- Price prediction: every hour (refreshed from cached models after each price collection)")
+
+            # Main service loop; a stop request is noticed within a second
+            # (a job already running is allowed to finish)
+            while not self.stop_event.is_set():
+                try:
+                    scheduler.run_pending()
+                    if time.monotonic() - self.last_health >= self.HEALTH_INTERVAL:
+                        self.write_health()
+                    self.stop_event.wait(1)
+                except Exception as e:
+                    self.logger.error(f"Schedule error: {str(e)}")
+                    self.logger.error(traceback.format_exc())
+                    self.stop_event.wait(5)  # Wait before retrying
+
+        except Exception as e:
+            self.logger.error(f'Service error: {str(e)}')
+            self.logger.error(traceback.format_exc())
+            if self.echo:
+                traceback.print_exc()
+        finally:
+            if sharding_enabled():
+                # Hand this node's coins to its peers now rather than after the heartbeat timeout
+                CoinPartitioner('service', lease_seconds=0, logger=self.logger).leave()
+            self.publish_status('Stopped')
+            self.stop_status_endpoint()
+            read_cache.stop_http_server()
+            self.say(f'Service stopped at {datetime.now()}')
+
+    def stop(self):
+        """Request a graceful shutdown; safe to call from signal handlers and other threads.
+
+        Only sets the stop event: the endpoint lock may be held by the interrupted
+        main thread, so 'Stopping' is published by callers that are not signal handlers.
+        """
+        self.stop_event.set()
@@ -0,0 +1,100 @@
+import os
+import json
+import socket
+import threading
+import socketserver
+from datetime import datetime
+
+# Keep in sync with gui/status_provider.py
+STATUS_HOST = '127.0.0.1'
+STATUS_PORT = int(os.environ.get('CRYPTO_STATUS_PORT', 8766))
+HEARTBEAT_SECONDS = 15
+
+class ReusableTCPServer(socketserver.ThreadingTCPServer):
+    # Rebind immediately after a restart instead of waiting out TIME_WAIT
+    allow_reuse_address = True
+
+class StatusEndpoint:
+    """Local TCP endpoint that pushes service status changes to subscribers.
+
+    Each subscriber receives the current state as one JSON line on connect and
+    another line whenever the state changes (plus periodic heartbeats), so
+    monitors never have to poll the Service Control Manager.
+    """
+
+    def __init__(self, host=STATUS_HOST, port=STATUS_PORT):
+        self.state = {'status': 'Starting', 'jobs': {}}
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        endpoint = self
+
+        class SubscriberHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with endpoint.lock:
+                    endpoint.subscribers.add(self.request)
+                    snapshot = endpoint._encode('status')
+                try:
+                    self.request.sendall(snapshot)
+                    # Block until the subscriber disconnects; we never expect input
+                    while self.request.recv(1024):
+                        pass
+                except OSError:
+                    pass
+                finally:
+                    with endpoint.lock:
+                        endpoint.subscribers.discard(self.request)
+
+        self.server = ReusableTCPServer((host, port), SubscriberHandler)
+        self.server.daemon_threads = True
+
+    def _encode(self, kind, **extra):
+        message = dict(self.state, type=kind, timestamp=datetime.now().isoformat(timespec='seconds'), **extra)
+        return (json.dumps(message) + '\n').encode('utf-8')
+
+    def _broadcast(self, kind, **extra):
+        with self.lock:
+            payload = self._encode(kind, **extra)
+            subscribers = list(self.subscribers)
+        for connection in subscribers:
+            try:
+                connection.sendall(payload)
+            except OSError:
+                with self.lock:
+                    self.subscribers.discard(connection)
+
+    def _heartbeat(self):
+        while not self.stopped.wait(HEARTBEAT_SECONDS):
+            self._broadcast('heartbeat')
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        return self
+
+    def set_status(self, status):
+        with self.lock:
+            changed = self.state['status'] != status
+            self.state['status'] = status
+        if changed:
+            self._broadcast('status')
+
+    def set_job_state(self, job, state, **details):
+        with self.lock:
+            self.state['jobs'][job] = dict(details, state=state, at=datetime.now().isoformat(timespec='seconds'))
+        self._broadcast('job', job=job)
+
+    def stop(self):
+        self.set_status('Stopped')
+        self.stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
+        with self.lock:
+            subscribers = list(self.subscribers)
+            self.subscribers.clear()
+        for connection in subscribers:
+            try:
+                connection.close()
+            except OSError:
+                pass
@@ -0,0 +1,229 @@
+import os
+import argparse
+import logging
+from datetime import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sqlalchemy import text
+from PricePredictor import PricePredictor
+from ModelRegistry import MODELS
+from Metrics import metrics
+
+# Evaluation window: forecast origins per coin and horizon
+BACKTEST_DAYS = 90
+# Models are refitted every REFIT_DAYS origins and predict the whole block in one call
+REFIT_DAYS = 7
+
+_worker_predictor = None
+
+def _init_worker():
+    global _worker_predictor
+    _worker_predictor = PricePredictor()
+
+def walk_forward(predictor, daily, days=BACKTEST_DAYS, refit_days=REFIT_DAYS, model_name=None):
+    """Replay one coin's daily bars; returns {horizon: (predicted_returns, actual_returns)}.
+
+    Features and targets are built once. Origins are the last `days` rows with
+    a known outcome for each horizon; for every block of refit_days origins a
+    single multi-output model (as in the live predictor) is trained on the
+    TRAINING_WINDOW_DAYS before the block, seeing only outcomes already
+    realised at its first origin, and scores the whole block in one predict().
+    Without `model_name` every refit selects its model as the predictor does.
+    """
+    X, y, _ = predictor.prepare_features(daily)
+    if X.empty:
+        return {}
+
+    positions = X.index.to_numpy()
+    bars = np.array([predictor.HORIZONS[horizon] for horizon in y.columns])
+    outcomes = y.to_numpy()
+    eval_rows = {
+        horizon: np.flatnonzero(~np.isnan(outcomes[:, column]))[-days:]
+        for column, horizon in enumerate(y.columns)
+    }
+    origins = np.unique(np.concatenate(list(eval_rows.values())))
+    predicted = np.full(outcomes.shape, np.nan)
+
+    for start in range(0, len(origins), refit_days):
+        block = origins[start:start + refit_days]
+        origin = positions[block[0]]
+        window = (positions <= origin) & (positions > origin - predictor.TRAINING_WINDOW_DAYS)
+        # Hide outcomes that were still in the future at the origin
+        visible = y[window].where(positions[window][:, None] + bars <= origin)
+        horizons = predictor.trainable_horizons(visible)
+        if not horizons:
+            continue
+        model = predictor.train_model(
+            *predictor.training_set(X[window], visible, horizons), n_jobs=1, model_name=model_name
+        )
+        if model is None:
+            continue
+        columns = [y.columns.get_loc(horizon) for horizon in horizons]
+        predicted[np.ix_(block, columns)] = np.asarray(model.predict(X.iloc[block])).reshape(len(block), -1)
+
+    results = {}
+    for column, horizon in enumerate(y.columns):
+        rows = eval_rows[horizon]
+        rows = rows[~np.isnan(predicted[rows, column])]
+        if len(rows):
+            results[horizon] = (predicted[rows, column], outcomes[rows, column])
+    return results
+
+def backtest_coin(coin, history_days, days, refit_days, model_name=None):
+    """Worker entry point: load, resample and replay one coin"""
+    predictor = _worker_predictor or PricePredictor()
+    historical_data = predictor.get_historical_data(coin['coin_id'], coin['symbol'], days=history_days)
+    if historical_data.empty:
+        return coin, {}
+    daily = predictor.resample_daily(historical_data)
+    return coin, walk_forward(predictor, daily, days, refit_days, model_name)
+
+def score(results, horizons):
+    """MAE/RMSE per horizon on returns, R² on the first horizon, vectorised over all origins"""
+    scores = {'sample_size': 0, 'r2': None}
+    for horizon in horizons:
+        if horizon not in results:
+            scores[f'mae_{horizon}'] = scores[f'rmse_{horizon}'] = None
+            continue
+        predicted, actual = results[horizon]
+        errors = predicted - actual
+        scores[f'mae_{horizon}'] = float(np.mean(np.abs(errors)))
+        scores[f'rmse_{horizon}'] = float(np.sqrt(np.mean(errors ** 2)))
+        scores[f'naive_mae_{horizon}'] = float(np.mean(np.abs(actual)))
+        scores['sample_size'] += len(errors)
+    first = next(iter(horizons))
+    if first in results:
+        predicted, actual = results[first]
+        total = np.sum((actual - actual.mean()) ** 2)
+        if total > 0:
+            scores['r2'] = float(1 - np.sum((predicted - actual) ** 2) / total)
+    return scores
+
+class Backtester:
+    """Walk-forward backtest of PricePredictor's features and model over the coin universe.
+
+    Errors are measured on returns (predicted vs realised % change), so coins
+    of very different price contribute comparably to the universe totals.
+    Each coin's result and the universe aggregate (coin_id NULL) are written
+    to model_performance_metrics under model_version, so runs before and
+    after a change to prepare_features/train_model can be compared directly.
+    """
+
+    def __init__(self, days=BACKTEST_DAYS, refit_days=REFIT_DAYS, workers=None, tag=None, model_name=None):
+        self.predictor = PricePredictor()
+        self.logger = self.predictor.logger
+        self.days = days
+        self.refit_days = refit_days
+        self.workers = workers or os.cpu_count() or 1
+        self.model_name = model_name
+        suffix = '.'.join(part for part in (model_name, tag) if part)
+        self.model_version = PricePredictor.MODEL_VERSION + (f"+{suffix}" if suffix else '')
+        # Enough history to train the first block of the longest horizon
+        self.history_days = PricePredictor.TRAINING_WINDOW_DAYS + days + max(PricePredictor.HORIZONS.values())
+
+    def run(self, symbols=None, save=True):
+        """Backtest every coin (or just `symbols`); returns the universe scores"""
+        run_start = datetime.now()
+        coins = self.predictor.get_coins()
+        if symbols:
+            wanted = {symbol.upper() for symbol in symbols}
+            coins = [coin for coin in coins if coin['symbol'] in wanted]
+        self.logger.info(
+            f"Backtesting {len(coins)} coins over {self.days} days "
+            f"(refit every {self.refit_days}, {self.workers} workers)"
+        )
+
+        horizons = list(PricePredictor.HORIZONS)
+        per_coin = []
+        combined = {horizon: ([], []) for horizon in horizons}
+        replay = partial(
+            backtest_coin, history_days=self.history_days, days=self.days,
+            refit_days=self.refit_days, model_name=self.model_name
+        )
+        if self.workers > 1 and len(coins) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+                outcomes = list(pool.map(replay, coins))
+        else:
+            outcomes = [replay(coin) for coin in coins]
+
+        for coin, results in outcomes:
+            if not results:
+                self.logger.warning(f"Not enough history to backtest {coin['symbol']}")
+                continue
+            scores = score(results, horizons)
+            per_coin.append((coin, scores))
+            for horizon, (predicted, actual) in results.items():
+                combined[horizon][0].append(predicted)
+                combined[horizon][1].append(actual)
+            self.log_scores(coin['symbol'], scores, horizons)
+
+        combined = {
+            horizon: (np.concatenate(predicted), np.concatenate(actual))
+            for horizon, (predicted, actual) in combined.items() if predicted
+        }
+        universe = score(combined, horizons)
+        self.log_scores('UNIVERSE', universe, horizons)
+
+        if save:
+            self.save_metrics([(coin['coin_id'], scores) for coin, scores in per_coin] + [(None, universe)], horizons)
+        duration = (datetime.now() - run_start).total_seconds()
+        metrics.observe('stage_seconds', duration, component='backtest', stage='run')
+        self.logger.info(f"Backtest of {len(per_coin)} coins completed in {duration:.1f}s")
+        return universe
+
+    def log_scores(self, label, scores, horizons):
+        parts = []
+        for horizon in horizons:
+            mae = scores.get(f'mae_{horizon}')
+            if mae is not None:
+                parts.append(f"{horizon} MAE {mae:.4f} (naive {scores[f'naive_mae_{horizon}']:.4f})")
+        r2 = f"{scores['r2']:.3f}" if scores['r2'] is not None else 'n/a'
+        self.logger.info(f"{label}: {' | '.join(parts)} | R² {r2} | n={scores['sample_size']}")
+
+    def save_metrics(self, rows, horizons):
+        """One model_performance_metrics row per coin plus the universe row (coin_id NULL)"""
+        columns = [f'mae_{h}' for h in horizons] + [f'rmse_{h}' for h in horizons]
+        query = f"""
+        INSERT INTO model_performance_metrics (
+            model_version, evaluation_date, coin_id, {', '.join(columns)}, r2_score, sample_size
+        ) VALUES (
+            :model_version, GETDATE(), :coin_id, {', '.join(':' + c for c in columns)}, :r2_score, :sample_size
+        )
+        """
+        params = [
+            dict(
+                {column: scores.get(column) for column in columns},
+                model_version=self.model_version,
+                coin_id=coin_id,
+                r2_score=scores['r2'],
+                sample_size=scores['sample_size']
+            )
+            for coin_id, scores in rows
+        ]
+        try:
+            with self.predictor.db_connection.begin() as conn:
+                conn.execute(text(query), params)
+            self.logger.info(f"Saved {len(params)} backtest rows as model_version {self.model_version}")
+        except Exception as e:
+            self.logger.error(f"Error saving backtest metrics: {str(e)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the price predictor')
+    parser.add_argument('--days', type=int, default=BACKTEST_DAYS, help='Forecast origins per coin and horizon')
+    parser.add_argument('--refit-days', type=int, default=REFIT_DAYS, help='Origins scored per model fit')
+    parser.add_argument('--workers', type=int, help='Parallel coin workers (default: all cores)')
+    parser.add_argument('--coins', nargs='+', help='Only these symbols')
+    parser.add_argument('--model', choices=sorted(MODELS), help='Backtest one registry model (default: per-coin selection)')
+    parser.add_argument('--tag', help='Suffix for model_version, e.g. the change being evaluated')
+    parser.add_argument('--no-save', action='store_true', help='Log scores without writing model_performance_metrics')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    backtester = Backtester(args.days, args.refit_days, args.workers, args.tag, args.model)
+    if args.debug:
+        backtester.logger.setLevel(logging.DEBUG)
+    backtester.run(args.coins, save=not args.no_save)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import time
+import queue
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+import pyodbc
+from config import DB_CONNECTION_STRING
+from Metrics import metrics
+
+_DONE = object()
+
+class RecentKeys:
+    """Bounded LRU set: dedupe memory stays flat however many mentions pass through"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.keys = OrderedDict()
+
+    def seen(self, key):
+        """True if `key` was already present; records it either way"""
+        if key in self.keys:
+            self.keys.move_to_end(key)
+            return True
+        self.keys[key] = None
+        if len(self.keys) > self.capacity:
+            self.keys.popitem(last=False)
+        return False
+
+def mention_key(mention):
+    # URL identifies a post when the source gives one; otherwise hash the text
+    identity = mention.get('url') or hashlib.sha1(mention['content'].encode('utf-8', 'replace')).hexdigest()
+    return (mention['coin_id'], mention['source_id'], identity)
+
+class ChatPipeline:
+    """fetch -> dedupe -> sentiment -> writer, connected by bounded queues.
+
+    Each stage runs on its own threads, so a slow source only occupies one
+    fetch worker while the others keep feeding the writer. A full queue
+    blocks its producer (backpressure), which bounds the mentions held in
+    memory to roughly the queue sizes plus one write batch. The writer owns
+    its own connection and commits every batch_size rows or flush_seconds.
+    """
+
+    def __init__(self, collector, fetch_workers=4, score_workers=1, queue_size=500,
+                 batch_size=200, flush_seconds=1.0, dedupe_capacity=100000, dedupe_hours=24):
+        self.collector = collector
+        self.logger = collector.logger
+        self.fetch_workers = fetch_workers
+        self.score_workers = score_workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dedupe_hours = dedupe_hours
+        self.recent = RecentKeys(dedupe_capacity)
+        self.lock = threading.Lock()
+
+    def seed_recent(self, coins):
+        """Remember posts already stored in the last dedupe_hours so re-fetched ones aren't written twice"""
+        coin_ids = sorted({coin['coin_id'] for coin in coins})
+        if not coin_ids:
+            return
+        conn = None
+        try:
+            # Own connection (the collector's cursor is shared with the GUI); the
+            # timestamp index covers coin/source/url, so this is one range seek
+            conn = pyodbc.connect(DB_CONNECTION_STRING)
+            cursor = conn.cursor()
+            placeholders = ', '.join('?' * len(coin_ids))
+            cursor.execute(f"""
+                SELECT coin_id, source_id, url FROM chat_data
+                WHERE timestamp >= DATEADD(hour, -?, GETDATE())
+                AND coin_id IN ({placeholders})
+                AND url IS NOT NULL AND url <> ''
+            """, [self.dedupe_hours] + coin_ids)
+            for coin_id, source_id, url in cursor.fetchall():
+                self.recent.seen((coin_id, source_id, url))
+        except Exception as e:
+            self.logger.error(f"Error loading recent mentions for dedupe: {str(e)}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def run(self, coins, sources):
+        """Collect `sources` ({name: func(coin)}) for every coin; returns the number of mentions saved"""
+        self.coins = coins
+        self.sources = sources
+        self.source_counts = defaultdict(list)
+        self.coins_done = 0
+        self.saved = 0
+        self.duplicates = 0
+        self.seed_recent(coins)
+
+        work_q = queue.Queue()
+        for coin in coins:
+            for source_name, func in sources.items():
+                work_q.put((coin, source_name, func))
+        dedupe_q = queue.Queue(self.queue_size)
+        score_q = queue.Queue(self.queue_size)
+        write_q = queue.Queue(self.queue_size)
+
+        fetchers = [
+            threading.Thread(target=self.fetch_stage, args=(work_q, dedupe_q), daemon=True)
+            for _ in range(self.fetch_workers)
+        ]
+        stages = [threading.Thread(target=self.dedupe_stage, args=(dedupe_q, score_q), daemon=True)]
+        stages += [
+            threading.Thread(target=self.score_stage, args=(score_q, write_q), daemon=True)
+            for _ in range(self.score_workers)
+        ]
+        writer = threading.Thread(target=self.writer_stage, args=(write_q,), daemon=True)
+
+        for thread in fetchers + stages + [writer]:
+            thread.start()
+        for thread in fetchers:
+            thread.join()
+        dedupe_q.put(_DONE)
+        for thread in stages:
+            thread.join()
+        writer.join()
+
+        if self.duplicates:
+            self.logger.info(f"Skipped {self.duplicates} already stored mentions")
+        return self.saved
+
+    def fetch_stage(self, work_q, out_q):
+        while True:
+            try:
+                coin, source_name, func = work_q.get_nowait()
+            except queue.Empty:
+                return
+            mentions = []
+            try:
+                mentions = self.collector.collect_mentions_template(source_name, coin, func)
+                fetched_at = time.monotonic()
+                for mention in mentions:
+                    mention['fetched_at'] = fetched_at
+                    mention['source_name'] = source_name
+                    mention['symbol'] = coin['symbol']
+                    out_q.put(mention)
+            except Exception as e:
+                self.collector.log_to_output(f"ERROR - {source_name} - {coin['symbol']}: {str(e)}")
+            self.source_fetched(coin, source_name, len(mentions))
+
+    def source_fetched(self, coin, source_name, count):
+        """Per-coin progress line once every source has reported for that coin"""
+        if not self.collector.summary_logging:
+            self.collector.log_to_output(f"{source_name} - {coin['symbol']}: Found {count} mentions")
+        with self.lock:
+            counts = self.source_counts[coin['coin_id']]
+            counts.append(f"{source_name} {count}")
+            if len(counts) < len(self.sources):
+                return
+            self.coins_done += 1
+            index = self.coins_done
+            del self.source_counts[coin['coin_id']]
+        if self.collector.summary_logging:
+            self.collector.log_to_output(
+                f"{coin['symbol']} ({index}/{len(self.coins)}): {', '.join(sorted(counts))} | saved so far {self.saved}"
+            )
+        else:
+            self.collector.log_to_output(f"Progress: {index}/{len(self.coins)} coins processed")
+
+    def dedupe_stage(self, in_q, out_q):
+        while True:
+            mention = in_q.get()
+            if mention is _DONE:
+                for _ in range(self.score_workers):
+                    out_q.put(_DONE)
+                return
+            if self.recent.seen(mention_key(mention)):
+                self.duplicates += 1
+                continue
+            out_q.put(mention)
+
+    def score_stage(self, in_q, out_q):
+        while True:
+            mention = in_q.get()
+            if mention is _DONE:
+                out_q.put(_DONE)
+                return
+            try:
+                self.collector.score_mention(mention)
+            except Exception as e:
+                self.logger.error(f"Sentiment error for {mention.get('symbol')}: {str(e)}")
+                mention['sentiment_score'], mention['sentiment_label'] = 0.0, 'Neutral'
+            out_q.put(mention)
+
+    def writer_stage(self, in_q):
+        conn = None
+        try:
+            conn = pyodbc.connect(DB_CONNECTION_STRING)
+        except Exception as e:
+            self.logger.error(f"Chat writer connection error: {str(e)}")
+
+        batch = []
+        finished = 0
+        deadline = time.monotonic() + self.flush_seconds
+        while finished < self.score_workers:
+            try:
+                mention = in_q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                mention = None
+            if mention is _DONE:
+                finished += 1
+            elif mention is not None:
+                batch.append(mention)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline or finished == self.score_workers):
+                self.write_batch(conn, batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_seconds
+
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def write_batch(self, conn, batch):
+        # Keep draining on failure: a dead writer would block every upstream stage
+        if conn is None:
+            self.logger.error(f"Dropping {len(batch)} mentions: no writer connection")
+            return
+        try:
+            self.collector.save_mentions(None, batch, conn=conn)
+            self.saved += len(batch)
+            now = time.monotonic()
+            for mention in batch:
+                metrics.observe('fetch_to_db_seconds', now - mention['fetched_at'], component='chat_collector')
+            self.collector.mentions_saved(batch)
+        except Exception as e:
+            self.collector.log_to_output(f"ERROR - Database - {len(batch)} mentions: {str(e)}")
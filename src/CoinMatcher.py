@@ -0,0 +1,74 @@
+import re
+import logging
+from collections import defaultdict
+
+# Common names that differ from Coins.full_name; extended by the optional coin_aliases table
+BUILTIN_ALIASES = {
+    'BTC': ['XBT'],
+    'ETH': ['Ether'],
+    'XRP': ['Ripple'],
+    'BNB': ['Binance Coin'],
+    'MATIC': ['Polygon'],
+    'POL': ['Polygon'],
+    'AVAX': ['Avalanche'],
+    'SHIB': ['Shiba Inu'],
+    'TON': ['Toncoin'],
+    'BCH': ['BCash'],
+}
+
+def _alternation(terms):
+    # Longest first so "Bitcoin Cash" wins over "Bitcoin"; never-matching pattern when empty
+    return '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) or r'(?!x)x'
+
+class CoinMatcher:
+    """Maps text to the coins it mentions with one compiled, word-boundary-aware regex.
+
+    Symbols match case-sensitively ("ETH", not "eth" in "together") unless
+    written as $eth / #eth; full names and aliases match case-insensitively.
+    Either way a term only matches as a whole word, so "ETH" never matches
+    "Ethena". Build it once per cycle and reuse it for every source.
+    """
+
+    def __init__(self, coins, aliases=None):
+        self.coins = {coin['coin_id']: coin for coin in coins}
+        self.by_term = defaultdict(set)
+        symbols, names = set(), set()
+        aliases = aliases or {}
+
+        for coin in coins:
+            coin_id = coin['coin_id']
+            symbols.add(coin['symbol'])
+            self.by_term[coin['symbol'].lower()].add(coin_id)
+            coin_names = [coin.get('full_name')] + BUILTIN_ALIASES.get(coin['symbol'], []) + aliases.get(coin_id, [])
+            for name in coin_names:
+                if name:
+                    names.add(name)
+                    self.by_term[name.lower()].add(coin_id)
+
+        syms, nams = _alternation(symbols), _alternation(names)
+        self.pattern = re.compile(
+            rf"(?<!\w)(?:[$#]((?i:{syms}|{nams}))|((?i:{nams}))|({syms}))(?!\w)"
+        )
+
+    @classmethod
+    def from_cursor(cls, cursor, coins, logger=None):
+        """Build with aliases from coin_aliases when that (optional) table exists"""
+        aliases = defaultdict(list)
+        try:
+            cursor.execute("SELECT coin_id, alias FROM coin_aliases")
+            for coin_id, alias in cursor.fetchall():
+                aliases[coin_id].append(alias)
+        except Exception as e:
+            (logger or logging.getLogger('CoinMatcher')).debug(f"No coin aliases loaded: {str(e)}")
+        return cls(coins, aliases)
+
+    def coin_ids(self, text):
+        """coin_ids mentioned anywhere in `text` (single linear scan)"""
+        found = set()
+        for match in self.pattern.finditer(text or ''):
+            term = (match.group(1) or match.group(2) or match.group(3)).lower()
+            found.update(self.by_term.get(term, ()))
+        return found
+
+    def mentions(self, text, coin_id):
+        return coin_id in self.coin_ids(text)
@@ -0,0 +1,155 @@
+import time
+import logging
+import threading
+import pyodbc
+from config import DB_CONNECTION_STRING
+from Metrics import metrics
+from RateLimiter import rate_limiter
+from ReadCache import read_cache
+
+UNIVERSE_SIZE = 50
+# How often the service re-ranks the universe; also how long the in-memory copy is trusted
+REFRESH_SECONDS = 3600
+
+# Pegged and wrapped assets: their prices carry no signal of their own
+STABLECOINS = frozenset({
+    'USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'USDP', 'USDD',
+    'GUSD', 'USDN', 'USDS', 'WBTC', 'WETH', 'FRAX'
+})
+STABLE_NAME_MARKERS = ('USD', 'STABLE')
+
+def is_tracked(symbol, name):
+    upper_name = name.upper()
+    return symbol not in STABLECOINS and not any(marker in upper_name for marker in STABLE_NAME_MARKERS)
+
+class CoinUniverse:
+    """The set of coins the collectors track, kept in Coins.is_active.
+
+    refresh() is the only place that calls CoinGecko (hourly, as its own
+    service job); active_coins() serves price cycles from memory and only
+    falls back to reading Coins when the copy is missing or older than
+    REFRESH_SECONDS, so a slow or failing CoinGecko never stalls collection.
+    """
+
+    def __init__(self, limit=UNIVERSE_SIZE, logger=None):
+        self.limit = limit
+        self.logger = logger or logging.getLogger('CoinUniverse')
+        self.coins = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    def fetch_ranking(self):
+        """Top coins by market cap from CoinGecko, stablecoins removed; None on failure"""
+        url = "https://api.coingecko.com/api/v3/coins/markets"
+        params = {
+            'vs_currency': 'usd',
+            'order': 'market_cap_desc',
+            'per_page': self.limit,
+            'page': 1,
+            'sparkline': False
+        }
+        response = rate_limiter.get('coingecko', url, endpoint='coins/markets', params=params)
+        if response.status_code != 200:
+            self.logger.error(f"CoinGecko API error: {response.status_code}")
+            return None
+
+        ranking = []
+        for rank, coin in enumerate(response.json(), start=1):
+            try:
+                symbol = coin['symbol'].upper()
+                if is_tracked(symbol, coin['name']):
+                    ranking.append({'symbol': symbol, 'full_name': coin['name'], 'rank': rank})
+            except KeyError as ke:
+                self.logger.error(f"Missing key in coin data: {ke}")
+        return ranking
+
+    def refresh(self):
+        """Re-rank the universe into Coins and reload the in-memory copy; False if CoinGecko or the DB failed"""
+        try:
+            with metrics.timer('stage_seconds', component='coin_universe', stage='fetch'):
+                ranking = self.fetch_ranking()
+        except Exception as e:
+            self.logger.error(f"Error fetching top coins: {str(e)}")
+            return False
+        if not ranking:
+            return False
+
+        conn = None
+        try:
+            conn = pyodbc.connect(DB_CONNECTION_STRING)
+            cursor = conn.cursor()
+            added = 0
+            for coin in ranking:
+                cursor.execute("""
+                    UPDATE Coins
+                    SET full_name = ?, is_active = 1, market_cap_rank = ?, universe_updated = GETDATE()
+                    WHERE symbol = ?
+                """, (coin['full_name'], coin['rank'], coin['symbol']))
+                if cursor.rowcount == 0:
+                    cursor.execute("""
+                        INSERT INTO Coins (symbol, full_name, is_active, market_cap_rank, universe_updated)
+                        VALUES (?, ?, 1, ?, GETDATE())
+                    """, (coin['symbol'], coin['full_name'], coin['rank']))
+                    added += 1
+                    self.logger.info(f"New coin in universe: {coin['symbol']} ({coin['full_name']})")
+
+            # Coins that fell out of the ranking keep their history but stop being collected
+            placeholders = ', '.join('?' for _ in ranking)
+            cursor.execute(f"""
+                UPDATE Coins SET is_active = 0, market_cap_rank = NULL
+                WHERE is_active = 1 AND symbol NOT IN ({placeholders})
+            """, [coin['symbol'] for coin in ranking])
+            dropped = cursor.rowcount
+            conn.commit()
+            read_cache.invalidate('coins')
+
+            with self.lock:
+                self.load(cursor)
+            self.logger.info(
+                f"Coin universe refreshed: {len(self.coins)} active, {added} added, {max(dropped, 0)} deactivated"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error refreshing coin universe: {str(e)}")
+            return False
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def load(self, cursor):
+        """Read the active coins from Coins (caller holds self.lock)"""
+        cursor.execute("""
+            SELECT coin_id, symbol, full_name
+            FROM Coins
+            WHERE is_active = 1
+            ORDER BY CASE WHEN market_cap_rank IS NULL THEN 1 ELSE 0 END, market_cap_rank, coin_id
+        """)
+        self.coins = [
+            {
+                'coin_id': row[0],
+                'symbol': row[1],
+                'full_name': row[2],
+                'trading_pair': f"{row[1]}/USDT"
+            }
+            for row in cursor.fetchall()
+        ]
+        self.loaded_at = time.monotonic()
+
+    def active_coins(self, cursor):
+        """Tracked coins as dicts (coin_id, symbol, full_name, trading_pair), ordered by market cap"""
+        with self.lock:
+            if self.coins is None or time.monotonic() - self.loaded_at > REFRESH_SECONDS:
+                try:
+                    self.load(cursor)
+                except Exception as e:
+                    # Keep serving the previous copy rather than skipping the cycle
+                    self.logger.error(f"Error loading coin universe: {str(e)}")
+            coins = list(self.coins or [])
+        if not coins:
+            # Empty Coins table (first run): bootstrap from CoinGecko once
+            self.logger.info("No active coins yet, refreshing universe from CoinGecko...")
+            if self.refresh():
+                coins = list(self.coins)
+        return coins
+
+universe = CoinUniverse()
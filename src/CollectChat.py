@@ -15,6 +15,17 @@ from config import (
     NEWS_API_URL,
     NEWS_API_KEY
 )
+from Metrics import metrics
+from LogSetup import get_logger, get_output_logger, summary_logging_enabled, log_path
+from Sharding import CoinPartitioner
+from RateLimiter import rate_limiter
+from QueryPlanner import (
+    QueryPlanner, reddit_terms, twitter_terms,
+    REDDIT_MAX_QUERY_LENGTH, TWITTER_MAX_QUERY_LENGTH
+)
+from CoinMatcher import CoinMatcher
+from ChatPipeline import ChatPipeline
+from ReadCache import read_cache
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
@@ -23,28 +34,29 @@ import webbrowser
 from tweepy import Client as TwitterClient
 import cryptocompare
 import requests
-import os
 import traceback
+import queue
+from collections import OrderedDict, defaultdict
 
 def setup_logging():
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler = logging.FileHandler('crypto_chat.log')
-    file_handler.setFormatter(formatter)
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger = logging.getLogger('ChatCollector')
-    logger.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    return logger
+    # Queue-backed rotating file + console logger; safe to call repeatedly
+    return get_logger('ChatCollector', log_path('crypto_chat.log'))
 
 class ChatCollector:
+    REDDIT_SUBREDDITS = ['cryptocurrency', 'CryptoMarkets']
+
     def __init__(self):
         self.logger = setup_logging()
+        self.output_logger = get_output_logger()
+        self.summary_logging = summary_logging_enabled()
+        # Only this node's slice of coins when CRYPTO_SHARDING=1 (lease spans one 15 min cycle)
+        self.partitioner = CoinPartitioner('chat', lease_seconds=900, logger=self.logger)
         self.init_database()
         self.init_apis()
         self.load_sources()
         self.analyzer = SentimentIntensityAnalyzer()
+        # Per-cycle results of the batched Reddit/Twitter searches, keyed by source then coin_id
+        self.prefetched = {}
 
     def init_database(self):
         try:
@@ -88,7 +100,8 @@ class ChatCollector:
             self.cursor.execute("""
                 SELECT coin_id, symbol, full_name 
                 FROM coins 
-                WHERE symbol NOT IN ('USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'USDP', 'USDD', 'GUSD', 'USDN', 'USDS')
+                WHERE is_active = 1
+                AND symbol NOT IN ('USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'USDP', 'USDD', 'GUSD', 'USDN', 'USDS')
             """)
             return [{'coin_id': row[0], 'symbol': row[1], 'full_name': row[2]} 
                    for row in self.cursor.fetchall()]
@@ -97,18 +110,29 @@ class ChatCollector:
             return []
 
     def analyze_sentiment(self, text):
-        scores = self.analyzer.polarity_scores(text)
+        with metrics.timer('sentiment_seconds', component='chat_collector'):
+            scores = self.analyzer.polarity_scores(text)
         return scores['compound']  # Returns value between -1 and 1
 
+    def score_mention(self, mention):
+        """Sentiment stage: score the stored content unless the source already did"""
+        if mention.get('sentiment_score') is None:
+            sentiment_score = self.analyze_sentiment(mention['content'])
+            mention['sentiment_score'] = sentiment_score
+            mention['sentiment_label'] = 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
+        return mention
+
     def collect_news_mentions(self, coin):
         mentions = []
         try:
-            self.logger.info(f"Starting News API search for {coin['symbol']}")
+            self.logger.debug(f"Starting News API search for {coin['symbol']}")
             
             search_query = f"{coin['symbol']} OR {coin['full_name']} cryptocurrency"
             
-            response = requests.get(
+            response = rate_limiter.get(
+                'newsapi',
                 NEWS_API_URL,
+                endpoint='everything',
                 params={
                     'q': search_query,
                     'apiKey': NEWS_API_KEY,
@@ -119,17 +143,14 @@ class ChatCollector:
             
             if response.status_code == 200:
                 articles = response.json().get('articles', [])
-                self.logger.info(f"Found {len(articles)} news articles")
+                self.logger.debug(f"Found {len(articles)} news articles")
                 
                 for article in articles:
-                    sentiment_score = self.analyze_sentiment(article['title'])
                     mentions.append({
                         'content': article['title'][:500],
                         'url': article['url'],
-                        'sentiment_score': sentiment_score,
-                        'sentiment_label': 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
                     })
-                    self.logger.info(f"Added news mention for {coin['symbol']}")
+                    self.logger.debug(f"Added news mention for {coin['symbol']}")
                 
             else:
                 self.logger.error(f"News API error: {response.text}")
@@ -137,12 +158,15 @@ class ChatCollector:
         except Exception as e:
             self.logger.error(f"News API error for {coin['symbol']}: {str(e)}")
             
-        self.logger.info(f"News API - Found {len(mentions)} mentions for {coin['symbol']}")
+        self.logger.debug(f"News API - Found {len(mentions)} mentions for {coin['symbol']}")
         return mentions
 
     def collect_reddit_mentions(self, coin):
+        if 'Reddit' in self.prefetched:
+            return self.prefetched['Reddit'].get(coin['coin_id'], [])
+
         mentions = []
-        subreddits = ['cryptocurrency', 'CryptoMarkets']
+        subreddits = self.REDDIT_SUBREDDITS
         
         for subreddit in subreddits:
             try:
@@ -152,7 +176,7 @@ class ChatCollector:
                     't': 'day',
                     'limit': 100
                 }
-                response = requests.get(url, headers=self.reddit_headers, params=params)
+                response = rate_limiter.get('reddit', url, endpoint='search', headers=self.reddit_headers, params=params)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -165,13 +189,10 @@ class ChatCollector:
                         if len(content.strip()) < 10:
                             continue
 
-                        sentiment_score = self.analyze_sentiment(content)
                         mentions.append({
                             'source_id': self.sources['Reddit'],
                             'content': content[:500],
                             'url': f"https://reddit.com{post_data['permalink']}",
-                            'sentiment_score': sentiment_score,
-                            'sentiment_label': 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
                         })
 
             except Exception as e:
@@ -181,15 +202,19 @@ class ChatCollector:
         return mentions
 
     def collect_twitter_mentions(self, coin):
+        if 'Twitter' in self.prefetched:
+            return self.prefetched['Twitter'].get(coin['coin_id'], [])
+
         mentions = []
         try:
-            self.logger.info(f"Searching Twitter for {coin['symbol']}")
-            
-            # Add delay to avoid rate limits
-            time.sleep(2)
+            self.logger.debug(f"Searching Twitter for {coin['symbol']}")
             
             query = f"#{coin['symbol'].lower()} OR #{coin['full_name'].lower()} crypto -is:retweet lang:en"
-            tweets = self.twitter.search_recent_tweets(
+            # Paced by the shared Twitter budget instead of a fixed sleep per coin
+            tweets = rate_limiter.call(
+                'twitter',
+                self.twitter.search_recent_tweets,
+                endpoint='search_recent_tweets',
                 query=query,
                 max_results=100,
                 tweet_fields=['created_at', 'text', 'public_metrics']
@@ -199,12 +224,9 @@ class ChatCollector:
                 return mentions
 
             for tweet in tweets.data:
-                sentiment_score = self.analyze_sentiment(tweet.text)
                 mentions.append({
                     'source_id': self.sources['Twitter'],
                     'content': tweet.text[:500],
-                    'sentiment_score': sentiment_score,
-                    'sentiment_label': 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
                 })
                 
         except Exception as e:
@@ -214,115 +236,238 @@ class ChatCollector:
             
         return mentions
 
-    def collect_cryptocompare_mentions(self, coin):
-        mentions = []
+    def prefetch_batched_mentions(self, coins):
+        """Search Reddit and Twitter once per batch of coins and CryptoCompare once per cycle"""
+        matcher = CoinMatcher.from_cursor(self.cursor, coins, self.logger)
+        with metrics.timer('stage_seconds', component='chat_collector', stage='prefetch', source='Reddit'):
+            self.prefetched['Reddit'] = self.fetch_reddit_batches(coins, matcher)
+        with metrics.timer('stage_seconds', component='chat_collector', stage='prefetch', source='Twitter'):
+            self.prefetched['Twitter'] = self.fetch_twitter_batches(coins, matcher)
+        with metrics.timer('stage_seconds', component='chat_collector', stage='prefetch', source='CryptoCompare'):
+            self.prefetched['CryptoCompare'] = self.fetch_cryptocompare_news(matcher)
+
+    def attribute_mention(self, results, seen, matcher, text, mention):
+        """Add `mention` to every coin its text mentions (once per coin)"""
+        for coin_id in matcher.coin_ids(text):
+            key = (coin_id, mention['content'])
+            if key in seen:
+                continue
+            seen.add(key)
+            results[coin_id].append(dict(mention))
+
+    def fetch_reddit_batches(self, coins, matcher):
+        results, seen = defaultdict(list), set()
+        batches = QueryPlanner(coins, reddit_terms, REDDIT_MAX_QUERY_LENGTH).batches()
+        self.logger.debug(f"Reddit: {len(coins)} coins in {len(batches)} batched queries")
+
+        for subreddit in self.REDDIT_SUBREDDITS:
+            url = f"https://www.reddit.com/r/{subreddit}/search.json"
+            for query, batch in batches:
+                try:
+                    params = {'q': query, 't': 'day', 'limit': 100}
+                    response = rate_limiter.get('reddit', url, endpoint='search', headers=self.reddit_headers, params=params)
+                    if response.status_code != 200:
+                        self.logger.error(f"Reddit error for {subreddit} ({len(batch)} coins): {response.status_code}")
+                        continue
+
+                    for post in response.json().get('data', {}).get('children', []):
+                        post_data = post['data']
+                        content = f"Title: {post_data['title']}\nContent: {post_data.get('selftext', '')}"
+                        if len(content.strip()) < 10:
+                            continue
+                        self.attribute_mention(results, seen, matcher, content, {
+                            'source_id': self.sources['Reddit'],
+                            'content': content[:500],
+                            'url': f"https://reddit.com{post_data['permalink']}"
+                        })
+                except Exception as e:
+                    self.logger.error(f"Reddit error for {subreddit} ({len(batch)} coins): {str(e)}")
+        return results
+
+    def fetch_twitter_batches(self, coins, matcher):
+        results, seen = defaultdict(list), set()
+        batches = QueryPlanner(
+            coins, twitter_terms, TWITTER_MAX_QUERY_LENGTH, template='({terms}) -is:retweet lang:en'
+        ).batches()
+        self.logger.debug(f"Twitter: {len(coins)} coins in {len(batches)} batched queries")
+
+        for query, batch in batches:
+            try:
+                tweets = rate_limiter.call(
+                    'twitter',
+                    self.twitter.search_recent_tweets,
+                    endpoint='search_recent_tweets',
+                    query=query,
+                    max_results=100,
+                    tweet_fields=['created_at', 'text', 'public_metrics']
+                )
+                for tweet in (getattr(tweets, 'data', None) or []):
+                    self.attribute_mention(results, seen, matcher, tweet.text, {
+                        'source_id': self.sources['Twitter'],
+                        'content': tweet.text[:500]
+                    })
+            except Exception as e:
+                self.logger.error(f"Twitter API error ({len(batch)} coins): {str(e)}")
+        return results
+
+    def fetch_cryptocompare_news(self, matcher):
+        """Latest CryptoCompare headlines (one request), attributed to every coin they mention"""
+        results, seen = defaultdict(list), set()
         try:
-            self.logger.info(f"Fetching CryptoCompare news for {coin['symbol']}")
-            
             url = "https://min-api.cryptocompare.com/data/v2/news/?lang=EN"
-            response = requests.get(url, headers=self.cryptocompare_headers)
-            
+            response = rate_limiter.get('cryptocompare', url, endpoint='news', headers=self.cryptocompare_headers)
+
             if response.status_code == 200:
-                data = response.json()
-                if 'Data' not in data:
-                    return mentions
-                
-                news = data['Data']
-                search_terms = [coin['symbol'].lower()]
-                
-                coin_news = [
-                    n for n in news 
-                    if any(term in n['title'].lower() for term in search_terms)
-                ]
-                
-                for article in coin_news:
-                    sentiment_score = self.analyze_sentiment(article['title'])
-                    mentions.append({
+                news = response.json().get('Data') or []
+                self.logger.debug(f"Fetched {len(news)} CryptoCompare headlines")
+                for article in news:
+                    self.attribute_mention(results, seen, matcher, article['title'], {
                         'source_id': self.sources['CryptoCompare'],
                         'content': article['title'][:500],
-                        'sentiment_score': sentiment_score,
-                        'sentiment_label': 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
+                        'url': article.get('url', '')
                     })
-                    
             else:
                 self.logger.error(f"CryptoCompare API error: {response.text}")
-                
+
         except Exception as e:
-            self.logger.error(f"CryptoCompare API error for {coin['symbol']}: {str(e)}")
-            
-        return mentions
+            self.logger.error(f"CryptoCompare API error: {str(e)}")
+
+        return results
+
+    def collect_cryptocompare_mentions(self, coin):
+        if 'CryptoCompare' in self.prefetched:
+            return self.prefetched['CryptoCompare'].get(coin['coin_id'], [])
+
+        self.logger.debug(f"Fetching CryptoCompare news for {coin['symbol']}")
+        matcher = CoinMatcher.from_cursor(self.cursor, [coin], self.logger)
+        return self.fetch_cryptocompare_news(matcher).get(coin['coin_id'], [])
 
     def collect_coingecko_mentions(self, coin):
         mentions = []
         try:
-            self.log_to_output(f"Starting CoinGecko search for {coin['symbol']}")
+            self.logger.debug(f"Starting CoinGecko search for {coin['symbol']}")
             
             search_url = f"https://api.coingecko.com/api/v3/search?query={coin['symbol']}"
-            self.log_to_output(f"CoinGecko search URL: {search_url}")
+            self.logger.debug(f"CoinGecko search URL: {search_url}")
             
-            response = requests.get(search_url)
-            self.log_to_output(f"CoinGecko search response status: {response.status_code}")
+            response = rate_limiter.get('coingecko', search_url, endpoint='search')
+            self.logger.debug(f"CoinGecko search response status: {response.status_code}")
             
             if response.status_code == 200:
                 search_data = response.json()
                 coins = search_data.get('coins', [])
-                self.log_to_output(f"CoinGecko coins found: {len(coins)}")
+                self.logger.debug(f"CoinGecko coins found: {len(coins)}")
                 
                 if coins:
                     coin_id = coins[0]['id']
                     details_url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
-                    details_response = requests.get(details_url)
-                    self.log_to_output(f"CoinGecko details response status: {details_response.status_code}")
+                    details_response = rate_limiter.get('coingecko', details_url, endpoint='coins')
+                    self.logger.debug(f"CoinGecko details response status: {details_response.status_code}")
                     
                     if details_response.status_code == 200:
                         details = details_response.json()
                         if 'description' in details and 'en' in details['description']:
                             content = details['description']['en']
-                            sentiment_score = self.analyze_sentiment(content)
                             mentions.append({
                                 'source_id': self.sources['CoinGecko'],
                                 'content': content[:500],
                                 'url': f"https://www.coingecko.com/en/coins/{coin_id}",
-                                'sentiment_score': sentiment_score,
-                                'sentiment_label': 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
                             })
                     
         except Exception as e:
-            self.log_to_output(f"CoinGecko API error for {coin['symbol']}: {str(e)}")
+            self.logger.error(f"CoinGecko API error for {coin['symbol']}: {str(e)}")
         
-        self.log_to_output(f"CoinGecko - Found {len(mentions)} mentions for {coin['symbol']}")
+        self.logger.debug(f"CoinGecko - Found {len(mentions)} mentions for {coin['symbol']}")
         return mentions
 
-    def save_mentions(self, coin, mentions):
+    def save_mentions(self, coin, mentions, conn=None):
+        """Insert mentions (any mix of coins) and fold them into the rollup in one transaction"""
+        conn = conn or self.conn
+        cursor = conn.cursor()
         try:
-            for mention in mentions:
-                self.cursor.execute("""
-                    INSERT INTO chat_data (
-                        coin_id, source_id, content, sentiment_score, 
-                        sentiment_label, url, timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, GETDATE())
-                """, (
-                    mention['coin_id'],
-                    mention['source_id'],
-                    mention['content'][:500],
-                    mention.get('sentiment_score', 0.0),
-                    mention.get('sentiment_label', 'NEUTRAL'),
-                    mention.get('url', '')
-                ))
-            self.conn.commit()
+            with metrics.timer('db_write_seconds', component='chat_collector', table='chat_data'):
+                # One server timestamp for the batch so chat_data rows and the
+                # hourly rollup always agree on which hour they belong to
+                cursor.execute("SELECT GETDATE()")
+                saved_at = cursor.fetchone()[0]
+
+                for mention in mentions:
+                    cursor.execute("""
+                        INSERT INTO chat_data (
+                            coin_id, source_id, content, sentiment_score, 
+                            sentiment_label, url, timestamp
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        mention['coin_id'],
+                        mention['source_id'],
+                        mention['content'][:500],
+                        mention.get('sentiment_score') or 0.0,
+                        mention.get('sentiment_label') or 'NEUTRAL',
+                        mention.get('url', ''),
+                        saved_at
+                    ))
+                self.update_sentiment_rollup(mentions, saved_at, cursor)
+                conn.commit()
+            read_cache.invalidate('sentiment')
+            metrics.observe('rows_written', len(mentions), component='chat_collector', table='chat_data')
+            metrics.inc('rows_written_total', len(mentions), component='chat_collector', table='chat_data')
             self.logger.info(f"Saved {len(mentions)} mentions successfully")
         except Exception as e:
             self.logger.error(f"Error saving mentions: {str(e)}")
-            self.conn.rollback()
+            conn.rollback()
             raise
 
+    def update_sentiment_rollup(self, mentions, saved_at, cursor=None):
+        """Fold a batch of saved mentions into chat_sentiment_hourly.
+
+        Runs inside the caller's transaction so the rollup never drifts from chat_data.
+        """
+        cursor = cursor or self.cursor
+        hour_start = saved_at.replace(minute=0, second=0, microsecond=0)
+        totals = {}
+        for mention in mentions:
+            key = (mention['coin_id'], mention['source_id'])
+            bucket = totals.setdefault(key, [0.0, 0, 0, 0, 0])
+            # chat_data stores DECIMAL(5,2), so sum the rounded value to match AVG() over raw rows
+            bucket[0] += round(float(mention.get('sentiment_score', 0.0) or 0.0), 2)
+            bucket[1] += 1
+            label = (mention.get('sentiment_label') or 'Neutral').lower()
+            if label == 'positive':
+                bucket[2] += 1
+            elif label == 'negative':
+                bucket[3] += 1
+            else:
+                bucket[4] += 1
+
+        for (coin_id, source_id), (score_sum, count, positive, negative, neutral) in totals.items():
+            cursor.execute("""
+                MERGE chat_sentiment_hourly WITH (HOLDLOCK) AS t
+                USING (SELECT ? AS coin_id, ? AS source_id, ? AS hour_start) AS s
+                ON t.coin_id = s.coin_id AND t.source_id = s.source_id AND t.hour_start = s.hour_start
+                WHEN MATCHED THEN UPDATE SET
+                    sentiment_sum = t.sentiment_sum + ?,
+                    mention_count = t.mention_count + ?,
+                    positive_count = t.positive_count + ?,
+                    negative_count = t.negative_count + ?,
+                    neutral_count = t.neutral_count + ?
+                WHEN NOT MATCHED THEN INSERT (
+                    coin_id, source_id, hour_start, sentiment_sum,
+                    mention_count, positive_count, negative_count, neutral_count
+                ) VALUES (s.coin_id, s.source_id, s.hour_start, ?, ?, ?, ?, ?);
+            """, (
+                coin_id, source_id, hour_start,
+                score_sum, count, positive, negative, neutral,
+                score_sum, count, positive, negative, neutral
+            ))
+
     def collect_mentions_template(self, source_name, coin, collection_function):
         try:
-            raw_mentions = collection_function(coin)
+            with metrics.timer('stage_seconds', component='chat_collector', stage='fetch', source=source_name):
+                raw_mentions = collection_function(coin)
             processed_mentions = []
             
             # Debug logging
-            self.logger.info(f"Processing {len(raw_mentions)} raw mentions from {source_name}")
+            self.logger.debug(f"Processing {len(raw_mentions)} raw mentions from {source_name}")
             
             for raw_mention in raw_mentions:
                 try:
@@ -331,74 +476,57 @@ class ChatCollector:
                         'source_id': self.sources.get(source_name, 3),  # Default to 3 for News
                         'content': raw_mention.get('content', ''),
                         'url': raw_mention.get('url', ''),
-                        'sentiment_score': raw_mention.get('sentiment_score', 0.0),
-                        'sentiment_label': raw_mention.get('sentiment_label', 'NEUTRAL')
+                        # Scored later by the pipeline's sentiment stage
+                        'sentiment_score': raw_mention.get('sentiment_score'),
+                        'sentiment_label': raw_mention.get('sentiment_label')
                     }
                     processed_mentions.append(processed_mention)
                 except Exception as e:
                     self.logger.error(f"Error processing mention for {source_name}: {str(e)}")
                     continue
                 
-            self.logger.info(f"Processed {len(processed_mentions)} mentions for {source_name}")
+            self.logger.debug(f"Processed {len(processed_mentions)} mentions for {source_name}")
             return processed_mentions
             
         except Exception as e:
             self.logger.error(f"{source_name} API error for {coin['symbol']}: {str(e)}")
             return []
 
+    def chat_sources(self):
+        return {
+            'News API': self.collect_news_mentions,
+            'Reddit': self.collect_reddit_mentions,
+            'Twitter': self.collect_twitter_mentions,
+            'CryptoCompare': self.collect_cryptocompare_mentions,
+            'CoinGecko': self.collect_coingecko_mentions,
+            'CryptoPanic': self.collect_cryptopanic_mentions
+        }
+
+    def mentions_saved(self, mentions):
+        """Called by the pipeline writer after each committed batch"""
+        saved_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for mention in mentions:
+            self.update_tree((
+                saved_at,
+                mention['symbol'],
+                mention['source_name'],
+                mention['sentiment_label'],
+                mention['content'][:100]
+            ))
+
     def collect_chat_data(self):
         try:
-            coins = self.get_coins()
-            total_coins = len(coins)
-            total_mentions = 0
-
+            cycle_start = time.perf_counter()
+            coins = self.partitioner.claim(self.get_coins())
             self.log_to_output("\nStarting data collection...")
+            self.prefetched = {}
+            self.prefetch_batched_mentions(coins)
             
-            for index, coin in enumerate(coins, 1):
-                coin_symbol = coin['symbol']
-                self.log_to_output(f"\nProcessing {coin_symbol} ({index}/{total_coins})")
-                
-                mentions = []
-                
-                sources = {
-                    'News API': self.collect_news_mentions,
-                    'Reddit': self.collect_reddit_mentions,
-                    'Twitter': self.collect_twitter_mentions,
-                    'CryptoCompare': self.collect_cryptocompare_mentions,
-                    'CoinGecko': self.collect_coingecko_mentions,
-                    'CryptoPanic': self.collect_cryptopanic_mentions
-                }
-                
-                for source_name, collection_func in sources.items():
-                    try:
-                        source_mentions = self.collect_mentions_template(source_name, coin, collection_func)
-                        mentions.extend(source_mentions)
-                        self.log_to_output(f"{source_name} - {coin_symbol}: Found {len(source_mentions)} mentions")
-                        
-                        # Update GUI with new mentions
-                        for mention in source_mentions:
-                            self.update_tree((
-                                datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                coin_symbol,
-                                source_name,
-                                mention['sentiment_label'],
-                                mention['content'][:100]
-                            ))
-                            
-                    except Exception as e:
-                        self.log_to_output(f"ERROR - {source_name} - {coin_symbol}: {str(e)}")
-
-                if mentions:
-                    try:
-                        self.save_mentions(coin, mentions)
-                        total_mentions += len(mentions)
-                        self.log_to_output("Save completed")
-                    except Exception as e:
-                        self.log_to_output(f"ERROR - Database - {coin_symbol}: {str(e)}")
-                
-                self.log_to_output(f"Progress: {index}/{total_coins} coins processed")
-                self.log_to_output(f"Total mentions collected so far: {total_mentions}")
+            # Sources stream through bounded fetch -> dedupe -> sentiment -> writer stages
+            pipeline = ChatPipeline(self)
+            total_mentions = pipeline.run(coins, self.chat_sources())
 
+            metrics.observe('stage_seconds', time.perf_counter() - cycle_start, component='chat_collector', stage='cycle')
             self.log_to_output(f"\nData collection completed!")
             self.log_to_output(f"Total mentions collected: {total_mentions}")
 
@@ -408,27 +536,18 @@ class ChatCollector:
             self.log_to_output(f"ERROR - Collection Process - SYSTEM: {str(e)}")
             return False
 
+        finally:
+            # Outside a cycle (e.g. single-coin GUI calls) searches go out per coin again
+            self.prefetched = {}
+
     def log_to_output(self, message):
         try:
-            # Write to output.txt with absolute path
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            log_message = f"{timestamp} - {message}\n"
-            
-            # Get current directory and create full path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            output_file = os.path.join(current_dir, 'output.txt')
-            
-            # Write to file
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write(log_message)
-            
-            # Print to console
-            print(log_message.strip())
+            # Queued to output.txt and the console by a background listener
+            self.output_logger.info(message)
             
             # Update GUI status only if running in GUI mode
             if hasattr(self, 'status_label') and hasattr(self, 'root'):
-                self.status_label.config(text=message)
-                self.root.update_idletasks()
+                self.root.after(0, lambda: self.status_label.config(text=message))
             
         except Exception as e:
             print(f"Error writing to output.txt: {str(e)}")
@@ -437,7 +556,11 @@ class ChatCollector:
         # Only update tree if in GUI mode
         if hasattr(self, 'tree'):
             if isinstance(data, tuple) and len(data) == 5:
-                self.tree.insert("", 0, values=data)
+                # Called from collection threads; Tk must be touched on its own thread
+                if hasattr(self, 'root'):
+                    self.root.after(0, lambda: self.tree.insert("", 0, values=data))
+                else:
+                    self.tree.insert("", 0, values=data)
             else:
                 logging.warning(f"Invalid data format for tree update: {data}")
 
@@ -468,11 +591,10 @@ class ChatCollector:
         """Collect mentions from CryptoPanic for a specific coin"""
         mentions = []
         try:
-            self.logger.info("=" * 50)
-            self.logger.info(f"Starting CryptoPanic API search for {coin['symbol']}")
+            self.logger.debug(f"Starting CryptoPanic API search for {coin['symbol']}")
             
             # Debug the sources dictionary
-            self.logger.info(f"Sources dictionary: {self.sources}")
+            self.logger.debug(f"Sources dictionary: {self.sources}")
             
             # Updated parameters based on API examples
             params = {
@@ -488,27 +610,24 @@ class ChatCollector:
             # Log the full URL with parameters (but mask the API key)
             full_url = requests.Request('GET', url, params=params).prepare().url
             masked_url = full_url.replace(CRYPTOPANIC_API_KEY, 'XXXXX')
-            self.logger.info(f"CryptoPanic URL (masked): {masked_url}")
+            self.logger.debug(f"CryptoPanic URL (masked): {masked_url}")
             
-            response = requests.get(url, params=params)
-            self.logger.info(f"CryptoPanic status code: {response.status_code}")
+            response = rate_limiter.get('cryptopanic', url, endpoint='posts', params=params)
+            self.logger.debug(f"CryptoPanic status code: {response.status_code}")
             
             if response.status_code == 200:
                 data = response.json()
                 results = data.get('results', [])
-                self.logger.info(f"CryptoPanic results count: {len(results)}")
+                self.logger.debug(f"CryptoPanic results count: {len(results)}")
                 
                 for post in results:
-                    sentiment_score = self.analyze_sentiment(post['title'])
                     mention = {
                         'source_id': self.sources['CryptoPanic'],
                         'content': post['title'][:500],
                         'url': post['url'],
-                        'sentiment_score': sentiment_score,
-                        'sentiment_label': 'Positive' if sentiment_score > 0 else 'Negative' if sentiment_score < 0 else 'Neutral'
                     }
                     mentions.append(mention)
-                    self.logger.info(f"Added mention for {coin['symbol']}: {post['title'][:100]}...")
+                    self.logger.debug(f"Added mention for {coin['symbol']}: {post['title'][:100]}...")
                     
             else:
                 self.logger.error(f"CryptoPanic error response: {response.text}")
@@ -517,15 +636,167 @@ class ChatCollector:
             self.logger.error(f"CryptoPanic API error for {coin['symbol']}: {str(e)}")
             traceback.print_exc()
             
-        self.logger.info(f"CryptoPanic - Found {len(mentions)} mentions for {coin['symbol']}")
+        self.logger.debug(f"CryptoPanic - Found {len(mentions)} mentions for {coin['symbol']}")
         return mentions
 
+class HistoricDataPager:
+    """Loads historic chat_data pages on a worker thread with its own connection.
+
+    Pages are keyed by (coin, source, after_key) where after_key is the
+    (timestamp, chat_id) of the last row of the previous page, so every page
+    is a keyset seek on the (timestamp, chat_id) index instead of an OFFSET scan.
+    """
+    PAGE_SIZE = 200
+    CACHE_SIZE = 64
+    CACHE_TTL = 60  # seconds before a cached page is considered stale
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.conn = None
+        self.requests = queue.Queue()
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.active_cursor = None
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def cancel(self):
+        """Invalidate queued and in-flight requests (called on filter change)"""
+        with self.lock:
+            self.generation += 1
+            cursor = self.active_cursor
+        try:
+            while True:
+                self.requests.get_nowait()
+        except queue.Empty:
+            pass
+        if cursor is not None:
+            try:
+                cursor.cancel()
+            except Exception as e:
+                self.logger.debug(f"Historic query cancel failed: {str(e)}")
+        return self.generation
+
+    def request_page(self, coin, source, after_key, callback, force=False):
+        """Queue a page load; callback(generation, rows, next_key) runs on the worker thread.
+
+        rows is None when the query failed.
+        """
+        with self.lock:
+            generation = self.generation
+        self.requests.put((generation, coin, source, after_key, callback, force))
+        return generation
+
+    def _get_cached(self, key):
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.CACHE_TTL:
+                del self.cache[key]
+                return None
+            self.cache.move_to_end(key)
+            return entry[1]
+
+    def _put_cached(self, key, page):
+        with self.lock:
+            self.cache[key] = (time.time(), page)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+
+    def _connect(self):
+        if self.conn is None:
+            self.conn = pyodbc.connect(DB_CONNECTION_STRING)
+        return self.conn
+
+    def _fetch_page(self, coin, source, after_key):
+        query = """
+            SELECT TOP (?)
+                cd.chat_id,
+                c.symbol,
+                cs.source_name,
+                cd.sentiment_label,
+                SUBSTRING(cd.content, 1, 200),
+                cd.timestamp,
+                cd.url
+            FROM chat_data cd
+            JOIN coins c ON cd.coin_id = c.coin_id
+            JOIN chat_source cs ON cd.source_id = cs.source_id
+            WHERE 1=1
+        """
+        params = [self.PAGE_SIZE]
+
+        if coin and coin != 'All':
+            query += " AND c.symbol = ?"
+            params.append(coin)
+
+        if source and source != 'All':
+            query += " AND cs.source_name = ?"
+            params.append(source)
+
+        if after_key is not None:
+            last_timestamp, last_chat_id = after_key
+            query += " AND (cd.timestamp < ? OR (cd.timestamp = ? AND cd.chat_id < ?))"
+            params.extend([last_timestamp, last_timestamp, last_chat_id])
+
+        query += " ORDER BY cd.timestamp DESC, cd.chat_id DESC"
+
+        cursor = self._connect().cursor()
+        with self.lock:
+            self.active_cursor = cursor
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        finally:
+            with self.lock:
+                self.active_cursor = None
+            cursor.close()
+
+        next_key = (rows[-1][5], rows[-1][0]) if len(rows) == self.PAGE_SIZE else None
+        return rows, next_key
+
+    def _run(self):
+        while True:
+            generation, coin, source, after_key, callback, force = self.requests.get()
+            if generation != self.generation:
+                continue
+
+            key = (coin, source, after_key)
+            page = None if force else self._get_cached(key)
+            if page is None:
+                try:
+                    page = self._fetch_page(coin, source, after_key)
+                except Exception as e:
+                    # Drop the connection so the next request reconnects cleanly
+                    try:
+                        self.conn.close()
+                    except Exception:
+                        pass
+                    self.conn = None
+                    if generation == self.generation:
+                        self.logger.error(f"Historic query failed: {str(e)}")
+                        callback(generation, None, None)
+                    continue
+                self._put_cached(key, page)
+
+            if generation == self.generation:
+                callback(generation, page[0], page[1])
+
 class ChatGUI(ChatCollector):
     def __init__(self):
         super().__init__()
         self.root = tk.Tk()
         self.root.title("Crypto Chat Collector")
         self.is_collecting = False
+        self.hist_pager = HistoricDataPager(self.logger)
+        self.hist_generation = 0
+        self.hist_filters = None
+        self.hist_loading = False
+        self.hist_exhausted = False
+        self.hist_next_key = None
+        self.hist_record_count = 0
         self.create_gui()
 
     def create_gui(self):
@@ -582,7 +853,7 @@ class ChatGUI(ChatCollector):
         self.view_historic_button = ttk.Button(
             historic_frame,
             text="View Historic Data",
-            command=self.refresh_historic_data
+            command=lambda: self.refresh_historic_data(force=True)
         )
         self.view_historic_button.pack(side=tk.LEFT, padx=5)
 
@@ -614,9 +885,9 @@ class ChatGUI(ChatCollector):
         self.tree.tag_configure('neutral', foreground='gray')
 
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(self.main_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        scrollbar.grid(row=2, column=1, sticky=(tk.N, tk.S))
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree_scrollbar = ttk.Scrollbar(self.main_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree_scrollbar.grid(row=2, column=1, sticky=(tk.N, tk.S))
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
 
         # Make the content column expandable
         self.main_frame.columnconfigure(0, weight=1)
@@ -626,66 +897,80 @@ class ChatGUI(ChatCollector):
         self.hist_coin_dropdown.bind('<<ComboboxSelected>>', lambda e: self.refresh_historic_data())
         self.hist_source_dropdown.bind('<<ComboboxSelected>>', lambda e: self.refresh_historic_data())
 
-    def refresh_historic_data(self):
+    def refresh_historic_data(self, force=False):
+        """Start a fresh paged load for the current coin/source filters"""
         try:
+            # Drop anything still loading for the previous filters
+            self.hist_generation = self.hist_pager.cancel()
+            self.hist_filters = (self.hist_coin_var.get(), self.hist_source_var.get())
+            self.hist_next_key = None
+            self.hist_exhausted = False
+            self.hist_loading = False
+            self.hist_record_count = 0
+
             # Clear existing items
             for item in self.tree.get_children():
                 self.tree.delete(item)
 
-            # Build query based on filters
-            query = """
-                SELECT TOP 1000 
-                    c.symbol, 
-                    cs.source_name, 
-                    cd.sentiment_label, 
-                    cd.content, 
-                    cd.timestamp, 
-                    cd.url
-                FROM chat_data cd
-                JOIN coins c ON cd.coin_id = c.coin_id
-                JOIN chat_source cs ON cd.source_id = cs.source_id
-                WHERE 1=1
-            """
-            params = []
-
-            # Add coin filter if not 'All'
-            if self.hist_coin_var.get() and self.hist_coin_var.get() != 'All':
-                query += " AND c.symbol = ?"
-                params.append(self.hist_coin_var.get())
-
-            # Add source filter if not 'All'
-            if self.hist_source_var.get() and self.hist_source_var.get() != 'All':
-                query += " AND cs.source_name = ?"
-                params.append(self.hist_source_var.get())
-
-            # Add order by
-            query += " ORDER BY cd.timestamp DESC"
-
-            # Execute query
-            self.cursor.execute(query, params)
-            rows = self.cursor.fetchall()
-            
-            # Populate tree
-            for row in rows:
-                self.tree.insert("", 'end', values=(
-                    row[4].strftime('%Y-%m-%d %H:%M:%S'),
-                    row[0],  # symbol
-                    row[1],  # source
-                    row[2],  # sentiment
-                    row[3][:200]  # content (truncated)
-                ), tags=(row[2].lower(),))
-
-            # Update status
-            record_count = len(rows)
-            status_message = f"Loaded {record_count} records"
-            self.status_label.config(text=status_message)
-            self.log_to_output(status_message)
+            self.status_label.config(text="Loading historic data...")
+            self.load_next_historic_page(force=force)
 
         except Exception as e:
             error_msg = f"Failed to load historic data: {str(e)}"
             self.log_to_output(error_msg)
             messagebox.showerror("Error", error_msg)
 
+    def load_next_historic_page(self, force=False):
+        if self.hist_filters is None or self.hist_loading or self.hist_exhausted:
+            return
+        self.hist_loading = True
+        coin, source = self.hist_filters
+        self.hist_pager.request_page(
+            coin, source, self.hist_next_key,
+            lambda generation, rows, next_key: self.root.after(
+                0, self.on_historic_page, generation, rows, next_key
+            ),
+            force=force
+        )
+
+    def on_historic_page(self, generation, rows, next_key):
+        # Runs on the Tk thread; ignore pages for filters that have since changed
+        if generation != self.hist_generation:
+            return
+        self.hist_loading = False
+
+        if rows is None:
+            self.hist_exhausted = True
+            error_msg = "Failed to load historic data"
+            self.log_to_output(error_msg)
+            self.status_label.config(text=error_msg)
+            return
+
+        # Populate tree
+        for row in rows:
+            sentiment = row[3] or 'Neutral'
+            self.tree.insert("", 'end', values=(
+                row[5].strftime('%Y-%m-%d %H:%M:%S'),
+                row[1],  # symbol
+                row[2],  # source
+                sentiment,
+                row[4] or ''  # content (truncated by the query)
+            ), tags=(sentiment.lower(),))
+
+        self.hist_next_key = next_key
+        self.hist_exhausted = next_key is None
+        self.hist_record_count += len(rows)
+
+        # Update status
+        suffix = "" if self.hist_exhausted else " (scroll for more)"
+        self.status_label.config(text=f"Loaded {self.hist_record_count} records{suffix}")
+
+    def on_tree_scroll(self, first, last):
+        self.tree_scrollbar.set(first, last)
+        # Fetch the next page once the user is near the bottom of what is loaded
+        if float(last) >= 0.9:
+            self.load_next_historic_page()
+
     def toggle_collection(self):
         if not self.is_collecting:
             self.is_collecting = True
@@ -0,0 +1,200 @@
+import math
+import json
+import logging
+from datetime import datetime
+
+SECONDS_PER_YEAR = 365 * 86400
+# Time constants of the tick-driven averages (seconds); time-based so gaps and
+# irregular collection intervals weigh correctly
+VOLATILITY_TAU = 86400
+TREND_FAST_TAU = 7 * 86400
+TREND_SLOW_TAU = 30 * 86400
+# Wilder period (daily bars) for ATR and RSI
+WILDER_PERIOD = 14
+# Fast/slow EMA gap beyond which the trend counts as bullish/bearish
+REGIME_BAND = 0.02
+
+def new_state():
+    return {
+        'last_price': None, 'last_time': None,
+        'variance_rate': None, 'ema_fast': None, 'ema_slow': None,
+        'day': None, 'day_high': None, 'day_low': None, 'prev_close': None,
+        'days': 0, 'atr': None, 'avg_gain': None, 'avg_loss': None,
+        'ticks': 0
+    }
+
+def _wilder(average, value, count):
+    # Plain running mean while warming up, Wilder smoothing afterwards
+    if average is None:
+        return value
+    n = min(count, WILDER_PERIOD)
+    return average + (value - average) / n
+
+def _rounded(value):
+    return round(value, 2) if value is not None else None
+
+class IndicatorEngine:
+    """Per-coin EWMA volatility, ATR, RSI and trend regime with O(1) work per price tick.
+
+    Each coin's state is a handful of running averages: update() folds one
+    tick in, snapshot() derives the current values from the state alone. ATR
+    and RSI use daily bars built on the fly from the ticks (Price_Data has no
+    OHLC); the in-progress day is included provisionally. States persist in
+    coin_indicators, so readers never rescan Price_Data.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger('Indicators')
+        self.states = {}
+        self.dirty = set()
+
+    def update(self, coin_id, price, timestamp):
+        """Fold one price tick into the coin's state; returns the current snapshot"""
+        price = float(price)
+        if price <= 0:
+            return self.snapshot(coin_id)
+        state = self.states.setdefault(coin_id, new_state())
+        now = timestamp.timestamp()
+        day = timestamp.date().isoformat()
+
+        if state['last_price'] is None:
+            state.update(ema_fast=price, ema_slow=price, day=day, day_high=price, day_low=price)
+        else:
+            elapsed = now - state['last_time']
+            if elapsed <= 0:
+                # Duplicate or out-of-order tick
+                return self.snapshot(coin_id)
+
+            squared_return_rate = math.log(price / state['last_price']) ** 2 / elapsed
+            if state['variance_rate'] is None:
+                state['variance_rate'] = squared_return_rate
+            else:
+                weight = 1 - math.exp(-elapsed / VOLATILITY_TAU)
+                state['variance_rate'] += weight * (squared_return_rate - state['variance_rate'])
+            for key, tau in (('ema_fast', TREND_FAST_TAU), ('ema_slow', TREND_SLOW_TAU)):
+                state[key] += (1 - math.exp(-elapsed / tau)) * (price - state[key])
+
+            if day != state['day']:
+                self.close_day(state)
+                state.update(day=day, day_high=price, day_low=price)
+            else:
+                state['day_high'] = max(state['day_high'], price)
+                state['day_low'] = min(state['day_low'], price)
+
+        state['last_price'] = price
+        state['last_time'] = now
+        state['ticks'] += 1
+        self.dirty.add(coin_id)
+        return self.snapshot(coin_id)
+
+    def warm_up(self, coin_id, prices, timestamps):
+        """Fold a run of sparse bars (e.g. daily) in; returns the final snapshot.
+
+        A day apart, each bar would carry 1 - e^-1 of the VOLATILITY_TAU
+        average, leaving the estimate to the last return or two. The variance
+        is instead seeded from the realized variance rate over the whole run,
+        and later ticks continue the EWMA from there.
+        """
+        squared, elapsed, last = 0.0, 0.0, None
+        for price, timestamp in zip(prices, timestamps):
+            self.update(coin_id, price, timestamp)
+            price, now = float(price), timestamp.timestamp()
+            if price <= 0 or (last is not None and now <= last[1]):
+                continue
+            if last is not None:
+                squared += math.log(price / last[0]) ** 2
+                elapsed += now - last[1]
+            last = (price, now)
+        if elapsed > 0:
+            self.states[coin_id]['variance_rate'] = squared / elapsed
+        return self.snapshot(coin_id)
+
+    def close_day(self, state):
+        """Roll the finished day (close = its last tick) into ATR and RSI"""
+        close, high, low = state['last_price'], state['day_high'], state['day_low']
+        prev_close = state['prev_close']
+        if prev_close is not None:
+            state['days'] += 1
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            change = close - prev_close
+            state['atr'] = _wilder(state['atr'], true_range, state['days'])
+            state['avg_gain'] = _wilder(state['avg_gain'], max(change, 0.0), state['days'])
+            state['avg_loss'] = _wilder(state['avg_loss'], max(-change, 0.0), state['days'])
+        state['prev_close'] = close
+
+    def snapshot(self, coin_id):
+        """Current indicator values; None for an unseen coin, single values None until warmed up"""
+        state = self.states.get(coin_id)
+        if not state or state['last_price'] is None:
+            return None
+        price = state['last_price']
+
+        volatility = None
+        if state['variance_rate'] is not None:
+            volatility = math.sqrt(state['variance_rate'] * SECONDS_PER_YEAR) * 100
+
+        rsi = None
+        if state['prev_close'] is not None:
+            # Today's move counts as a provisional bar on top of the closed days
+            change = price - state['prev_close']
+            n = min(state['days'], WILDER_PERIOD - 1)
+            gain = ((state['avg_gain'] or 0.0) * n + max(change, 0.0)) / (n + 1)
+            loss = ((state['avg_loss'] or 0.0) * n + max(-change, 0.0)) / (n + 1)
+            rsi = 50.0 if gain == loss == 0 else 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+        trend = state['ema_fast'] / state['ema_slow'] - 1
+        if trend > REGIME_BAND and (rsi is None or rsi >= 50):
+            condition = 'Bullish'
+        elif trend < -REGIME_BAND and (rsi is None or rsi <= 50):
+            condition = 'Bearish'
+        else:
+            condition = 'Sideways'
+
+        return {
+            'price': price,
+            'volatility_index': volatility,
+            'atr': state['atr'],
+            'atr_pct': state['atr'] / price * 100 if state['atr'] is not None else None,
+            'rsi': rsi,
+            'trend': trend,
+            'market_condition': condition,
+            'updated_at': datetime.fromtimestamp(state['last_time'])
+        }
+
+    def load(self, cursor, coin_ids=None):
+        """Replace in-memory states with the persisted ones (all coins, or just `coin_ids`)"""
+        try:
+            cursor.execute("SELECT coin_id, state FROM coin_indicators")
+            wanted = set(coin_ids) if coin_ids is not None else None
+            for coin_id, state in cursor.fetchall():
+                if wanted is None or coin_id in wanted:
+                    self.states[coin_id] = dict(new_state(), **json.loads(state))
+        except Exception as e:
+            self.logger.error(f"Error loading indicator state: {str(e)}")
+
+    def save(self, cursor):
+        """Persist the states changed since the last save (caller commits)"""
+        saved = 0
+        for coin_id in sorted(self.dirty):
+            snapshot = self.snapshot(coin_id)
+            values = (
+                snapshot['updated_at'], snapshot['price'],
+                _rounded(snapshot['volatility_index']), snapshot['atr'], _rounded(snapshot['rsi']),
+                snapshot['market_condition'], json.dumps(self.states[coin_id])
+            )
+            cursor.execute("""
+                UPDATE coin_indicators
+                SET updated_at = ?, last_price = ?, volatility_index = ?, atr = ?,
+                    rsi = ?, market_condition = ?, state = ?
+                WHERE coin_id = ?
+            """, values + (coin_id,))
+            if cursor.rowcount == 0:
+                cursor.execute("""
+                    INSERT INTO coin_indicators (
+                        updated_at, last_price, volatility_index, atr,
+                        rsi, market_condition, state, coin_id
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, values + (coin_id,))
+            saved += 1
+        self.dirty.clear()
+        return saved
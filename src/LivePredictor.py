@@ -0,0 +1,193 @@
+import time
+import argparse
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from PricePredictor import PricePredictor
+from ModelCache import model_cache
+from Metrics import metrics
+
+# Seconds between refreshes when run standalone (one price collection cycle)
+REFRESH_SECONDS = 300
+# Cached models older than two hourly runs belong to coins the hourly run no longer trains
+MAX_MODEL_AGE = timedelta(hours=2)
+
+class LivePredictor:
+    """Intra-hour forecasts from the models the hourly run cached: no training, no history scans.
+
+    Each coin keeps its last FEATURE_WINDOW_DAYS daily bars in memory; a new
+    price tick replaces (same day) or appends (new day) the newest bar, and
+    only the newest feature row is recomputed and fed to the cached model.
+    Predictions are saved like the hourly ones, linked to the model by fit_id
+    only (the hourly rows already record the model choice).
+    New ticks are read past a single Price_Data.id high-water mark, so each
+    refresh only touches the rows inserted since the previous one.
+    """
+
+    def __init__(self, predictor=None):
+        self.predictor = predictor or PricePredictor()
+        self.logger = self.predictor.logger
+        # coin_id -> deque of [day, price, volume_24h, price_change_24h]
+        self.windows = {}
+        self.last_seen = {}
+        self.last_id = None
+
+    def warm(self, coin_id, coin_symbol):
+        """Fill a coin's window from Price_Data (once, when it first gets a cached model)"""
+        historical_data = self.predictor.get_historical_data(
+            coin_id, coin_symbol, days=self.predictor.FEATURE_WINDOW_DAYS + 1
+        )
+        if historical_data.empty:
+            return False
+        daily = self.predictor.resample_daily(historical_data).tail(self.predictor.FEATURE_WINDOW_DAYS)
+        self.windows[coin_id] = deque(
+            ([date, price, volume, change] for date, price, volume, change in zip(
+                daily['date'], daily['price'], daily['volume_24h'], daily['price_change_24h']
+            )),
+            maxlen=self.predictor.FEATURE_WINDOW_DAYS
+        )
+        self.last_seen[coin_id] = historical_data['date'].iloc[-1]
+        return True
+
+    def on_tick(self, coin_id, timestamp, price, volume_24h, price_change_24h):
+        """Fold one price tick into the coin's window (the day's bar is its last tick)"""
+        window = self.windows.get(coin_id)
+        if window is None or timestamp <= self.last_seen[coin_id]:
+            return False
+        day = timestamp.normalize()
+        if window and window[-1][0] == day:
+            window[-1] = [day, price, volume_24h, price_change_24h]
+        else:
+            window.append([day, price, volume_24h, price_change_24h])
+        self.last_seen[coin_id] = timestamp
+        return True
+
+    def max_price_id(self):
+        """Newest Price_Data.id (0 for an empty table)"""
+        with self.predictor.db_connection.connect() as conn:
+            return conn.execute(text("SELECT MAX(id) FROM Price_Data")).scalar() or 0
+
+    def new_ticks(self):
+        """Every price row inserted since the last call, oldest first; advances the high-water mark"""
+        query = """
+        SELECT id, coin_id, timestamp as date,
+            CAST(price_usd AS FLOAT) as price,
+            CAST(volume_24h AS FLOAT) as volume_24h,
+            CAST(price_change_24h AS FLOAT) as price_change_24h
+        FROM Price_Data
+        WHERE id > :last_id
+        ORDER BY id
+        """
+        with metrics.timer('db_read_seconds', component='live_predictor', table='price_data'), \
+                self.predictor.db_connection.connect() as conn:
+            ticks = pd.read_sql(
+                text(query), conn,
+                params={'last_id': self.last_id},
+                parse_dates=['date'],
+                dtype=self.predictor.PRICE_DTYPES
+            )
+        if not ticks.empty:
+            self.last_id = int(ticks['id'].max())
+        return ticks.drop(columns='id').dropna()
+
+    def usable(self, entry):
+        """Whether a cached entry is from the current model version and a recent hourly run"""
+        return (
+            entry is not None
+            and entry.get('model_version') == self.predictor.MODEL_VERSION
+            and datetime.now() - entry.get('trained_at', datetime.min) <= MAX_MODEL_AGE
+        )
+
+    def predict(self, coin_id, entry):
+        """Forecasts from the coin's window and cached model entry (None until the window is full)"""
+        window = self.windows[coin_id]
+        _, prices, volumes, changes = zip(*window)
+        X = self.predictor.latest_features(prices, volumes, changes)
+        if X is None:
+            return None
+        returns = np.atleast_1d(entry['model'].predict(X[entry['features']])[0])
+        predictions = self.predictor.price_forecasts(prices[-1], entry['horizons'], returns)
+        predictions['market_condition'] = self.predictor.determine_market_condition(coin_id)
+        predictions['volatility_index'] = self.predictor.calculate_volatility(coin_id)
+        return predictions
+
+    def refresh(self):
+        """Apply the ticks since the last refresh and re-predict every coin that received one"""
+        if self.predictor.mode != 'coin':
+            # Pooled fits are not cached per coin; leftover coin-mode pickles would serve stale forecasts
+            self.logger.warning(f"Live predictions need per-coin models; skipping in '{self.predictor.mode}' mode")
+            return 0
+        try:
+            run_start = datetime.now()
+            coins = self.predictor.partitioner.claim(self.predictor.get_coins())
+            self.predictor.load_indicators()
+            if self.last_id is None:
+                # Taken before any window is warmed, so no tick can fall between the two
+                self.last_id = self.max_price_id()
+
+            entries, updated = {}, set()
+            for coin in coins:
+                entry = model_cache.load(coin['coin_id'])
+                if not self.usable(entry):
+                    continue
+                entries[coin['coin_id']] = (coin, entry)
+                if coin['coin_id'] not in self.windows and self.warm(coin['coin_id'], coin['symbol']):
+                    updated.add(coin['coin_id'])
+            # Coins that lost their model (deactivated, reassigned or stale) stop being tracked
+            for coin_id in set(self.windows) - set(entries):
+                del self.windows[coin_id]
+                self.last_seen.pop(coin_id, None)
+            if not entries:
+                self.logger.warning("No cached models yet; run the hourly predictor first")
+                return 0
+
+            ticks = self.new_ticks()
+            for coin_id, date, price, volume, change in ticks.itertuples(index=False):
+                if coin_id in entries and self.on_tick(coin_id, date, price, volume, change):
+                    updated.add(coin_id)
+
+            saved = 0
+            for coin_id in sorted(updated):
+                coin, entry = entries[coin_id]
+                with metrics.timer('stage_seconds', component='live_predictor', stage='predict'):
+                    predictions = self.predict(coin_id, entry)
+                if predictions is None:
+                    continue
+                sentiment_score = self.predictor.get_current_sentiment(coin_id, coin['symbol'])
+                with metrics.timer('db_write_seconds', component='live_predictor', table='predictions'):
+                    self.predictor.save_prediction(
+                        coin_id, predictions, sentiment_score, len(self.windows[coin_id]),
+                        fit_id=entry['fit_id']
+                    )
+                saved += 1
+
+            duration = (datetime.now() - run_start).total_seconds()
+            metrics.observe('stage_seconds', duration, component='live_predictor', stage='refresh')
+            self.logger.info(f"Refreshed predictions for {saved}/{len(entries)} coins in {duration * 1000:.0f} ms")
+            return saved
+
+        except Exception as e:
+            self.logger.error(f"Error refreshing live predictions: {str(e)}")
+            return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Intra-hour predictions from cached models')
+    parser.add_argument('--interval', type=int, default=REFRESH_SECONDS, help='Seconds between refreshes')
+    parser.add_argument('--once', action='store_true', help='Refresh once and exit')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    live = LivePredictor()
+    if args.debug:
+        live.logger.setLevel(logging.DEBUG)
+    while True:
+        live.refresh()
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+OUTPUT_FORMAT = '%(asctime)s - %(message)s'
+OUTPUT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+# Repo-level logs/ (as used by the service); never cwd-relative, since the daemon chdirs to /
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
+
+_listeners = {}
+_lock = threading.Lock()
+
+def _build_handlers(log_file, console, fmt, datefmt):
+    formatter = logging.Formatter(fmt, datefmt)
+    handlers = []
+    if log_file:
+        log_dir = os.path.dirname(os.path.abspath(log_file))
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding='utf-8'
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+    return handlers
+
+def _attach(logger, log_file, console, fmt, datefmt):
+    """Route `logger` through a queue drained by a background listener thread"""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, *_build_handlers(log_file, console, fmt, datefmt), respect_handler_level=True
+    )
+    listener.start()
+    logger.addHandler(QueueHandler(log_queue))
+    return listener
+
+def get_logger(name, log_file=None, level=logging.INFO, console=True, fmt=LOG_FORMAT, datefmt=None):
+    """Return a non-blocking logger writing to a rotating file and/or the console.
+
+    Safe to call on every instantiation: handlers are attached only once per name.
+    """
+    logger = logging.getLogger(name)
+    with _lock:
+        if name not in _listeners:
+            logger.setLevel(level)
+            _listeners[name] = _attach(logger, log_file, console, fmt, datefmt)
+    return logger
+
+def log_path(filename):
+    """Absolute path of a log file in LOG_DIR"""
+    return os.path.join(LOG_DIR, filename)
+
+def get_output_logger():
+    """Shared logger behind the collectors' log_to_output (src/output.txt)"""
+    output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output.txt')
+    logger = get_logger(
+        'CollectorOutput', output_file, fmt=OUTPUT_FORMAT, datefmt=OUTPUT_DATE_FORMAT
+    )
+    logger.propagate = False
+    return logger
+
+def configure_root(log_file, level=logging.INFO, fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s'):
+    """Queue-backed replacement for logging.basicConfig(filename=...)"""
+    with _lock:
+        if '' not in _listeners:
+            root = logging.getLogger()
+            root.setLevel(level)
+            _listeners[''] = _attach(root, log_file, False, fmt, None)
+    return logging.getLogger()
+
+def summary_logging_enabled():
+    """Per-coin summary lines unless CRYPTO_LOG_VERBOSE asks for per-field output"""
+    return os.environ.get('CRYPTO_LOG_VERBOSE', '').lower() not in ('1', 'true', 'yes')
+
+@atexit.register
+def shutdown():
+    """Flush and stop every listener (records queued at exit are still written)"""
+    with _lock:
+        for listener in _listeners.values():
+            try:
+                listener.stop()
+            except Exception:
+                pass
+        _listeners.clear()
@@ -0,0 +1,60 @@
+import os
+import pickle
+import logging
+import threading
+
+MODEL_DIR = os.environ.get(
+    'CRYPTO_MODEL_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+)
+
+class ModelCache:
+    """Fitted per-coin models on disk, so inference can run without retraining.
+
+    The hourly predictor run writes one pickle per coin (atomically, via a
+    temporary file); readers keep the unpickled entry in memory and only
+    reload a coin's file once its modification time changes.
+    """
+
+    def __init__(self, directory=MODEL_DIR, logger=None):
+        self.directory = directory
+        self.logger = logger or logging.getLogger('ModelCache')
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def path(self, coin_id):
+        return os.path.join(self.directory, f"coin_{coin_id}.pkl")
+
+    def save(self, coin_id, entry):
+        """Store a fitted model with what inference needs (horizons, features, choice, fit_id)"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(coin_id)
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            self.logger.error(f"Error caching model for coin {coin_id}: {str(e)}")
+
+    def load(self, coin_id):
+        """The coin's latest cached entry, or None if it has never been trained"""
+        path = self.path(coin_id)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        with self.lock:
+            cached = self.entries.get(coin_id)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading cached model for coin {coin_id}: {str(e)}")
+            return None
+        with self.lock:
+            self.entries[coin_id] = (mtime, entry)
+        return entry
+
+model_cache = ModelCache()
@@ -0,0 +1,184 @@
+import json
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from Metrics import metrics
+
+# Fits are keyed by their training rows, so a key can only recur while those rows are unchanged
+FIT_LOOKBACK_DAYS = 2
+# Newest rows scored when permuting (bounds the stacked predict() for pooled panel fits)
+PERMUTATION_ROWS = 500
+PERMUTATION_SEED = 42
+
+def fit_key(coin_id, model_version, choice, horizons, features, dates):
+    """Identity of a model fit: coin, model, hyperparameters, features and training rows"""
+    payload = json.dumps([
+        coin_id, model_version, choice['model'], choice.get('params') or {},
+        list(horizons), list(features), str(dates.iloc[0]), str(dates.iloc[-1]), len(dates)
+    ], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def impurity_importances(model):
+    """Tree models' built-in impurity importances (None for other estimators)"""
+    return getattr(model, 'feature_importances_', None)
+
+def permutation_importances(model, X, y, seed=PERMUTATION_SEED):
+    """Mean absolute error increase when each feature is shuffled.
+
+    Every feature's permuted copy of X is stacked under the original rows, so
+    the whole computation is one predict() call instead of one per feature.
+    """
+    X, y = X.iloc[-PERMUTATION_ROWS:], np.asarray(y)[-PERMUTATION_ROWS:]
+    values = X.to_numpy(dtype=float)
+    rows, features = values.shape
+    shuffled = values[np.random.default_rng(seed).permutation(rows)]
+
+    stacked = np.repeat(values[None], features + 1, axis=0)
+    columns = np.arange(features)
+    # Block 0 stays intact (baseline); block j+1 has column j shuffled
+    stacked[columns + 1, :, columns] = shuffled.T
+    predicted = np.asarray(model.predict(pd.DataFrame(stacked.reshape(-1, features), columns=X.columns)))
+    errors = np.abs(predicted.reshape(features + 1, rows, -1) - y.reshape(1, rows, -1)).mean(axis=(1, 2))
+    return errors[1:] - errors[0]
+
+class ModelExplainer:
+    """Feature importances stored once per model fit rather than per prediction.
+
+    register() gives each distinct fit a model_fits row (predictions point to
+    it via fit_id); hourly refits on unchanged training rows map to the same
+    row. Importances of the run's new fits are computed and written together
+    in flush(): impurity importances where the model has them, otherwise
+    stacked permutation importances.
+    """
+
+    def __init__(self, db_connection, logger=None):
+        self.db_connection = db_connection
+        self.logger = logger or logging.getLogger('ModelExplainer')
+        self.fit_ids = {}
+        self.pending = []
+
+    def load(self):
+        """Keys of recent fits, so refits of the same rows reuse their row"""
+        query = """
+        SELECT fit_key, fit_id
+        FROM model_fits
+        WHERE fitted_at >= DATEADD(day, -:days, GETDATE())
+        """
+        try:
+            with self.db_connection.connect() as conn:
+                self.fit_ids.update(dict(conn.execute(text(query), {'days': FIT_LOOKBACK_DAYS}).fetchall()))
+        except Exception as e:
+            self.logger.error(f"Error loading model fits: {str(e)}")
+
+    def register(self, coin_id, model_version, choice, model, X, y, dates):
+        """fit_id of this fit (coin_id None for pooled fits); fits without importances are queued for flush()"""
+        horizons = list(y.columns) if y.ndim > 1 else [y.name]
+        key = fit_key(coin_id, model_version, choice, horizons, X.columns, dates)
+        if key in self.fit_ids:
+            return self.fit_ids[key]
+
+        query = """
+        INSERT INTO model_fits (
+            fit_key, coin_id, model_name, model_parameters, model_version,
+            horizons, trained_from, trained_to, training_rows, fitted_at
+        ) VALUES (
+            :fit_key, :coin_id, :model_name, :model_parameters, :model_version,
+            :horizons, :trained_from, :trained_to, :training_rows, GETDATE()
+        )
+        """
+        lookup = "SELECT fit_id, feature_importances FROM model_fits WHERE fit_key = :fit_key"
+        try:
+            with self.db_connection.begin() as conn:
+                # Older than load()'s window (e.g. a coin whose prices stopped): reuse its row
+                existing = conn.execute(text(lookup), {'fit_key': key}).fetchone()
+                if existing is not None:
+                    fit_id, importances = existing
+                    self.fit_ids[key] = fit_id
+                    if importances is None:
+                        self.pending.append((fit_id, model, X, y))
+                    return fit_id
+                conn.execute(text(query), {
+                    'fit_key': key,
+                    'coin_id': coin_id,
+                    'model_name': choice['model'],
+                    'model_parameters': json.dumps(choice.get('params') or {}),
+                    'model_version': model_version,
+                    'horizons': ','.join(horizons),
+                    'trained_from': dates.iloc[0].to_pydatetime(),
+                    'trained_to': dates.iloc[-1].to_pydatetime(),
+                    'training_rows': len(X)
+                })
+                fit_id = conn.execute(text(lookup), {'fit_key': key}).scalar()
+        except Exception as e:
+            self.logger.error(f"Error saving model fit: {str(e)}")
+            return None
+
+        self.fit_ids[key] = fit_id
+        self.pending.append((fit_id, model, X, y))
+        return fit_id
+
+    def flush(self):
+        """Compute and store importances of every fit registered since the last flush"""
+        if not self.pending:
+            return 0
+        rows = []
+        with metrics.timer('stage_seconds', component='predictor', stage='explain'):
+            for fit_id, model, X, y in self.pending:
+                try:
+                    scores, method = impurity_importances(model), 'impurity'
+                    if scores is None:
+                        scores, method = permutation_importances(model, X, y), 'permutation'
+                    rows.append({
+                        'fit_id': fit_id,
+                        'importance_method': method,
+                        'feature_importances': json.dumps(
+                            {feature: round(float(score), 6) for feature, score in zip(X.columns, scores)}
+                        )
+                    })
+                except Exception as e:
+                    self.logger.error(f"Error computing importances for fit {fit_id}: {str(e)}")
+        self.pending = []
+        if not rows:
+            return 0
+
+        query = """
+        UPDATE model_fits
+        SET importance_method = :importance_method, feature_importances = :feature_importances
+        WHERE fit_id = :fit_id
+        """
+        try:
+            with metrics.timer('db_write_seconds', component='predictor', table='model_fits'), \
+                    self.db_connection.begin() as conn:
+                conn.execute(text(query), rows)
+            self.logger.info(f"Stored feature importances for {len(rows)} new model fits")
+        except Exception as e:
+            self.logger.error(f"Error saving feature importances: {str(e)}")
+            return 0
+        return len(rows)
+
+    def history(self, coin_id=None, days=90):
+        """Importances over time: one row per fit (indexed by fitted_at), one column per feature.
+
+        coin_id None returns the pooled panel fits.
+        """
+        query = f"""
+        SELECT fitted_at, model_name, importance_method, feature_importances
+        FROM model_fits
+        WHERE {'coin_id = :coin_id' if coin_id is not None else 'coin_id IS NULL'}
+        AND fitted_at >= DATEADD(day, -:days, GETDATE())
+        AND feature_importances IS NOT NULL
+        ORDER BY fitted_at
+        """
+        try:
+            with self.db_connection.connect() as conn:
+                fits = conn.execute(text(query), {'coin_id': coin_id, 'days': days}).fetchall()
+        except Exception as e:
+            self.logger.error(f"Error loading feature importances: {str(e)}")
+            return pd.DataFrame()
+
+        return pd.DataFrame(
+            [dict(json.loads(importances), model=model, method=method) for _, model, method, importances in fits],
+            index=pd.DatetimeIndex([fitted_at for fitted_at, *_ in fits], name='fitted_at')
+        )
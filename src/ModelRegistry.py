@@ -0,0 +1,71 @@
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.multioutput import MultiOutputRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import mean_absolute_error
+
+# name -> factory(outputs, n_jobs, **params) returning an unfitted estimator
+MODELS = {}
+
+def register(name):
+    """Decorator adding an estimator factory to the registry under `name`"""
+    def decorator(factory):
+        MODELS[name] = factory
+        return factory
+    return decorator
+
+@register('ridge')
+def ridge(outputs=1, n_jobs=-1, **params):
+    # Features mix price levels and ratios, so standardise before the penalty
+    return make_pipeline(StandardScaler(), Ridge(**dict({'alpha': 1.0}, **params)))
+
+@register('linear')
+def linear(outputs=1, n_jobs=-1, **params):
+    return LinearRegression(**params)
+
+@register('hist_gb')
+def hist_gb(outputs=1, n_jobs=-1, **params):
+    model = HistGradientBoostingRegressor(**dict({'max_iter': 100, 'learning_rate': 0.1, 'random_state': 42}, **params))
+    # No native multi-output support: one booster per horizon
+    return MultiOutputRegressor(model, n_jobs=n_jobs) if outputs > 1 else model
+
+@register('random_forest')
+def random_forest(outputs=1, n_jobs=-1, **params):
+    return RandomForestRegressor(**dict({
+        'n_estimators': 100,
+        'max_depth': 10,
+        'random_state': 42,
+        'n_jobs': n_jobs
+    }, **params))
+
+def create_model(name, outputs=1, n_jobs=-1, **params):
+    if name not in MODELS:
+        raise ValueError(f"Unknown model '{name}' (choose from {', '.join(sorted(MODELS))})")
+    return MODELS[name](outputs=outputs, n_jobs=n_jobs, **params)
+
+def outputs_of(y):
+    return 1 if np.ndim(y) == 1 else np.shape(y)[1]
+
+def select_model(X, y, candidates, holdout=0.2, n_jobs=-1, gap=0):
+    """Pick the candidate with the lowest MAE on the most recent `holdout` share of rows.
+
+    The split is chronological (rows are oldest first), so validation never
+    sees data from before its own training rows. The last `gap` rows before
+    the split are left out of training: their forward-return targets are
+    realised inside the validation block. Returns (name, {name: mae}); with
+    too few rows to hold any out, the first candidate wins unscored.
+    """
+    split = int(len(X) * (1 - holdout))
+    train_end = split - gap
+    if train_end < 5 or len(X) - split < 5:
+        return candidates[0], {}
+
+    outputs = outputs_of(y)
+    scores = {}
+    for name in candidates:
+        model = create_model(name, outputs, n_jobs)
+        model.fit(X.iloc[:train_end], y.iloc[:train_end])
+        scores[name] = float(mean_absolute_error(y.iloc[split:], model.predict(X.iloc[split:])))
+    return min(scores, key=scores.get), scores
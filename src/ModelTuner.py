@@ -0,0 +1,134 @@
+import os
+import math
+import itertools
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.metrics import mean_absolute_error
+from ModelRegistry import create_model, outputs_of
+
+# Hyperparameter grids per registry model; models without one are tuned on their defaults
+SEARCH_SPACES = {
+    'ridge': {'alpha': [0.1, 1.0, 10.0, 100.0]},
+    'hist_gb': {
+        'max_iter': [100, 300],
+        'learning_rate': [0.03, 0.1],
+        'max_leaf_nodes': [15, 31],
+        'min_samples_leaf': [10, 20]
+    },
+    'random_forest': {
+        'n_estimators': [100, 300],
+        'max_depth': [5, 10, None],
+        'min_samples_leaf': [1, 5]
+    }
+}
+# Time-series CV folds per coin; successive halving keeps 1/HALVING_ETA of the configs per rung
+CV_FOLDS = 5
+HALVING_ETA = 3
+
+def configs_for(models):
+    """Every (model, params) combination of the search spaces of `models`"""
+    configs = []
+    for name in models:
+        space = SEARCH_SPACES.get(name, {})
+        keys = sorted(space)
+        for values in itertools.product(*(space[key] for key in keys)):
+            configs.append((name, dict(zip(keys, values))))
+    return configs
+
+@lru_cache(maxsize=None)
+def time_series_folds(rows, folds=CV_FOLDS, gap=0, min_train=30):
+    """Expanding-window (train, test) index arrays, newest test block first.
+
+    Test blocks tile the most recent rows; each fold trains on everything
+    older than its test block minus `gap` rows, so forward-looking targets of
+    the training rows never overlap the test period. Folds depend only on the
+    row count, so coins with the same history length share the cached arrays
+    (read-only). Fewer folds come back when the history is too short.
+    """
+    test_size = (rows - gap - min_train) // folds
+    if test_size < 5:
+        folds = max(0, (rows - gap - min_train) // 5)
+        test_size = 5
+    splits = []
+    for fold in range(folds):
+        test_end = rows - fold * test_size
+        test_start = test_end - test_size
+        train = np.arange(0, test_start - gap)
+        test = np.arange(test_start, test_end)
+        train.flags.writeable = test.flags.writeable = False
+        splits.append((train, test))
+    return tuple(splits)
+
+def evaluate(name, params, X_train, y_train, X_test, y_test):
+    """Worker entry point: fit one config on one fold, return its MAE"""
+    model = create_model(name, outputs_of(y_train), 1, **params)
+    model.fit(X_train, y_train)
+    return float(mean_absolute_error(y_test, model.predict(X_test)))
+
+class ModelTuner:
+    """Successive-halving hyperparameter search over the registry models.
+
+    Every config is first scored on the newest CV fold; the best
+    1/HALVING_ETA survive to be scored on HALVING_ETA times as many folds,
+    and so on until the survivors have seen all folds. Scores are the mean
+    MAE over the folds seen. Fold fits of a rung run in parallel on a
+    process pool shared by all coins, one single-threaded fit per core.
+    """
+
+    def __init__(self, models, workers=None, folds=CV_FOLDS, eta=HALVING_ETA):
+        self.configs = configs_for(models)
+        self.workers = workers or os.cpu_count() or 1
+        self.folds = folds
+        self.eta = eta
+        self.pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+
+    def tune(self, X, y, gap=0, min_train=30):
+        """Best (model, params, cv_mae, folds) for one coin's training set; None when too short to cross-validate"""
+        splits = time_series_folds(len(X), self.folds, gap, min_train)
+        if not splits:
+            return None
+
+        X, y = np.asarray(X), np.asarray(y)
+        fold_scores = {index: {} for index in range(len(self.configs))}
+        survivors = list(range(len(self.configs)))
+        budget = 1
+        while True:
+            budget = min(budget, len(splits))
+            tasks = [
+                (index, fold) for index in survivors
+                for fold in range(budget) if fold not in fold_scores[index]
+            ]
+            for (index, fold), mae in zip(tasks, self.run(tasks, X, y, splits)):
+                fold_scores[index][fold] = mae
+
+            mean_mae = {index: np.mean(list(fold_scores[index].values())) for index in survivors}
+            survivors = sorted(survivors, key=mean_mae.get)
+            if budget == len(splits) or len(survivors) == 1:
+                break
+            survivors = survivors[:max(1, math.ceil(len(survivors) / self.eta))]
+            budget *= self.eta
+
+        best = survivors[0]
+        name, params = self.configs[best]
+        return name, params, float(mean_mae[best]), len(fold_scores[best])
+
+    def run(self, tasks, X, y, splits):
+        jobs = []
+        for index, fold in tasks:
+            name, params = self.configs[index]
+            train, test = splits[fold]
+            jobs.append((name, params, X[train], y[train], X[test], y[test]))
+        if self.pool:
+            return list(self.pool.map(evaluate, *zip(*jobs))) if jobs else []
+        return [evaluate(*job) for job in jobs]
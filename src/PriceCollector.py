@@ -1,39 +1,31 @@
 import sys
 import datetime
 import pyodbc
-import requests
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
 from config import DB_CONNECTION_STRING
-import logging
-import os
+from Metrics import metrics
+from LogSetup import get_logger, get_output_logger, summary_logging_enabled, log_path
+from Sharding import CoinPartitioner
+from CoinUniverse import universe
+from Indicators import IndicatorEngine
+from ReadCache import read_cache
 
 def setup_logging():
-    # Create a formatter
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    
-    # Setup file handler
-    file_handler = logging.FileHandler('crypto_collection.log')
-    file_handler.setFormatter(formatter)
-    
-    # Setup console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    
-    # Setup logger
-    logger = logging.getLogger('CryptoCollector')
-    logger.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    # Queue-backed rotating file + console logger; safe to call repeatedly
+    return get_logger('CryptoCollector', log_path('crypto_collection.log'))
 
 class CryptoCollector:
     def __init__(self):
-        self.coin_ids = {}
         self.logger = setup_logging()
+        self.output_logger = get_output_logger()
+        self.summary_logging = summary_logging_enabled()
+        # Only this node's slice of coins when CRYPTO_SHARDING=1 (lease spans one 5 min cycle)
+        self.partitioner = CoinPartitioner('price', lease_seconds=300, logger=self.logger)
+        # Volatility/ATR/RSI/regime, updated per tick and persisted in coin_indicators
+        self.indicators = IndicatorEngine(self.logger)
         self.init_database()
 
     def init_database(self):
@@ -50,73 +42,14 @@ class CryptoCollector:
             
             self.logger.info(f"Database connected. Found {coins_count} coins and {price_count} price records")
             
-            # Cache coin IDs
-            self.coin_ids = {}
-            self.cursor.execute("SELECT coin_id, symbol, full_name FROM Coins")
-            for row in self.cursor.fetchall():
-                self.coin_ids[row[1]] = {'id': row[0], 'full_name': row[2]}
-            
-            self.logger.info(f"Cached {len(self.coin_ids)} coin IDs for tracking")
-            
         except pyodbc.Error as e:
             self.logger.error(f"Database connection error: {str(e)}")
             sys.exit(1)
 
-    def get_top_coins(self, limit=50):
-        self.logger.info(f"Fetching top {limit} coins from CoinGecko...")
-        try:
-            url = "https://api.coingecko.com/api/v3/coins/markets"
-            params = {
-                'vs_currency': 'usd',
-                'order': 'market_cap_desc',
-                'per_page': limit,
-                'page': 1,
-                'sparkline': False
-            }
-            
-            self.logger.info(f"Calling CoinGecko API: {url}")
-            response = requests.get(url, params=params)
-            self.logger.info(f"API Response Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                coins = response.json()
-                self.logger.info(f"Raw API response received: {len(coins)} coins")
-                
-                # List of stablecoins to exclude
-                stablecoins = ['USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'USDP', 'USDD', 
-                              'GUSD', 'USDN', 'USDS', 'WBTC', 'WETH', 'FRAX']
-                
-                coin_data = []
-                for coin in coins:
-                    try:
-                        symbol = coin['symbol'].upper()
-                        name = coin['name']
-                        self.logger.info(f"Processing coin: {symbol} ({name})")
-                        
-                        # Skip if it's a stablecoin
-                        if symbol not in stablecoins and not any(s in name.upper() for s in ['USD', 'STABLE']):
-                            coin_data.append({
-                                'symbol': symbol,
-                                'full_name': name,
-                                'trading_pair': f"{symbol}/USDT"
-                            })
-                            self.logger.info(f"Added coin: {symbol} - {name}")
-                    except KeyError as ke:
-                        self.logger.error(f"Missing key in coin data: {ke}")
-                
-                self.logger.info(f"Processed {len(coin_data)} non-stablecoin coins")
-                return coin_data
-            else:
-                self.logger.error(f"CoinGecko API error: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error fetching top coins: {str(e)}")
-            return None
-
     def get_binance_data(self, symbol):
         try:
-            ticker = self.exchanges['binance'].fetch_ticker(symbol)
+            with metrics.timer('http_request_seconds', source='binance', endpoint='fetch_ticker'):
+                ticker = self.exchanges['binance'].fetch_ticker(symbol)
             return {
                 'price_usd': ticker['last'] if ticker['last'] is not None else 0,
                 'volume_24h': ticker['baseVolume'] if ticker['baseVolume'] is not None else 0,
@@ -130,6 +63,7 @@ class CryptoCollector:
         thread_conn = pyodbc.connect(DB_CONNECTION_STRING)
         thread_cursor = thread_conn.cursor()
         records_added = 0
+        written = []
         start_time = datetime.datetime.now()
         
         self.logger.info("="*50)
@@ -137,14 +71,17 @@ class CryptoCollector:
         self.logger.info("="*50)
 
         try:
-            # 1. First get top coins from CoinGecko
-            self.logger.info("Step 1: Fetching top coins from CoinGecko...")
-            top_coins = self.get_top_coins()
+            # 1. Tracked coins (refreshed hourly by the coin universe job, served from memory)
+            with metrics.timer('stage_seconds', component='price_collector', stage='universe'):
+                top_coins = universe.active_coins(thread_cursor)
             if not top_coins:
-                self.logger.error("Failed to get coin list from CoinGecko. Aborting.")
+                self.logger.error("No active coins in the universe. Aborting.")
                 return False
 
-            self.logger.info(f"Retrieved {len(top_coins)} coins from CoinGecko")
+            self.logger.info(f"Step 1: {len(top_coins)} coins in the tracked universe")
+            top_coins = self.partitioner.claim(top_coins)
+            # Reload persisted state each cycle: another node may have owned a coin since
+            self.indicators.load(thread_cursor, [coin['coin_id'] for coin in top_coins])
 
             # 2. Initialize Binance connection
             self.logger.info("Step 2: Initializing Binance connection...")
@@ -166,57 +103,49 @@ class CryptoCollector:
             for coin_info in top_coins:
                 try:
                     symbol = coin_info['trading_pair']
-                    self.logger.info(f"\nProcessing {symbol} ({processed_coins + 1}/{total_coins})")
+                    if not self.summary_logging:
+                        self.logger.info(f"\nProcessing {symbol} ({processed_coins + 1}/{total_coins})")
                     
                     data = self.get_binance_data(symbol)
                     if data:
                         coin_symbol = coin_info['symbol']
-                        cached_coin = self.coin_ids.get(coin_symbol)
-
-                        # Handle new coins
-                        if not cached_coin:
-                            self.logger.info(f"New coin detected: {coin_symbol} ({coin_info['full_name']})")
-                            try:
-                                thread_cursor.execute('''
-                                    INSERT INTO Coins (symbol, full_name)
-                                    VALUES (?, ?)
-                                ''', (coin_symbol, coin_info['full_name']))
-                                thread_conn.commit()
-                                
-                                thread_cursor.execute('SELECT @@IDENTITY')
-                                new_coin_id = thread_cursor.fetchone()[0]
-                                self.coin_ids[coin_symbol] = {
-                                    'id': new_coin_id,
-                                    'full_name': coin_info['full_name']
-                                }
-                                cached_coin = self.coin_ids[coin_symbol]
-                                self.logger.info(f"Added new coin: {coin_symbol} - {coin_info['full_name']} (ID: {new_coin_id})")
-                            except Exception as e:
-                                self.logger.error(f"Failed to add new coin {coin_symbol}: {str(e)}")
-                                continue
 
                         # Save price data
                         try:
-                            thread_cursor.execute('''
-                                INSERT INTO price_data (
-                                    timestamp, coin_id, price_usd, 
-                                    volume_24h, price_change_24h, data_source
-                                )
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            ''', (
-                                current_time,
-                                cached_coin['id'],
-                                data['price_usd'],
-                                data['volume_24h'],
-                                data['price_change_24h'],
-                                'binance'
-                            ))
-                            thread_conn.commit()
+                            with metrics.timer('db_write_seconds', component='price_collector', table='price_data'):
+                                thread_cursor.execute('''
+                                    INSERT INTO price_data (
+                                        timestamp, coin_id, price_usd, 
+                                        volume_24h, price_change_24h, data_source
+                                    )
+                                    VALUES (?, ?, ?, ?, ?, ?)
+                                ''', (
+                                    current_time,
+                                    coin_info['coin_id'],
+                                    data['price_usd'],
+                                    data['volume_24h'],
+                                    data['price_change_24h'],
+                                    'binance'
+                                ))
+                                thread_conn.commit()
                             records_added += 1
-                            self.logger.info(f"Saved price data for {coin_symbol}:")
-                            self.logger.info(f"  Price: ${data['price_usd']:.2f}")
-                            self.logger.info(f"  Volume 24h: ${data['volume_24h']:,.2f}")
-                            self.logger.info(f"  Change 24h: {data['price_change_24h']:+.2f}%")
+                            # Rounded to the column scales, as the read cache would load them back
+                            written.append((
+                                coin_info['coin_id'], current_time, round(data['price_usd'], 8),
+                                round(data['volume_24h'], 2), round(data['price_change_24h'], 2)
+                            ))
+                            self.indicators.update(coin_info['coin_id'], data['price_usd'], current_time)
+                            if self.summary_logging:
+                                self.logger.info(
+                                    f"{coin_symbol} ({processed_coins + 1}/{total_coins}): "
+                                    f"${data['price_usd']:.2f} | Vol ${data['volume_24h']:,.2f} | "
+                                    f"{data['price_change_24h']:+.2f}%"
+                                )
+                            else:
+                                self.logger.info(f"Saved price data for {coin_symbol}:")
+                                self.logger.info(f"  Price: ${data['price_usd']:.2f}")
+                                self.logger.info(f"  Volume 24h: ${data['volume_24h']:,.2f}")
+                                self.logger.info(f"  Change 24h: {data['price_change_24h']:+.2f}%")
 
                             # Update GUI only if in GUI mode
                             if is_gui_mode and hasattr(self, 'tree'):
@@ -247,9 +176,23 @@ class CryptoCollector:
                     failed_coins += 1
                     continue
 
+            try:
+                with metrics.timer('db_write_seconds', component='price_collector', table='coin_indicators'):
+                    updated = self.indicators.save(thread_cursor)
+                    thread_conn.commit()
+                self.logger.info(f"Updated indicators for {updated} coins")
+            except Exception as e:
+                self.logger.error(f"Failed to save indicators: {str(e)}")
+            if written:
+                read_cache.put('prices', written)
+
             # Collection Summary
             end_time = datetime.datetime.now()
             duration = end_time - start_time
+            metrics.observe('stage_seconds', duration.total_seconds(), component='price_collector', stage='cycle')
+            metrics.observe('rows_written', records_added, component='price_collector', table='price_data')
+            metrics.inc('rows_written_total', records_added, component='price_collector', table='price_data')
+            metrics.inc('collection_failures_total', failed_coins, component='price_collector')
             self.logger.info("\n" + "="*50)
             self.logger.info("COLLECTION CYCLE SUMMARY:")
             self.logger.info(f"Start Time: {start_time}")
@@ -275,26 +218,12 @@ class CryptoCollector:
 
     def log_to_output(self, message):
         try:
-            # Write to output.txt with absolute path
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            log_message = f"{timestamp} - {message}\n"
-            
-            # Get current directory and create full path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            output_file = os.path.join(current_dir, 'output.txt')
-            
-            # Write to file
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write(log_message)
-            
-            # Print to console
-            print(log_message.strip())
+            # Queued to output.txt and the console by a background listener
+            self.output_logger.info(message)
             
             # Update GUI status only if running in GUI mode
-            if hasattr(self, 'status_label'):
-                self.status_label.config(text=message)
-                # Force GUI to update
-                self.root.update_idletasks()
+            if hasattr(self, 'status_label') and hasattr(self, 'root'):
+                self.root.after(0, lambda: self.status_label.config(text=message))
             
         except Exception as e:
             print(f"Error writing to output.txt: {str(e)}")
@@ -375,6 +304,8 @@ class CryptoGUI(CryptoCollector):
 
     def collect_continuously(self):
         while self.is_collecting:
+            # No service job here: re-rank the universe once per (hourly) pass
+            universe.refresh()
             success = self.collect_data(is_gui_mode=True)
             if not success:
                 self.is_collecting = False
@@ -1,33 +1,69 @@
 import argparse
+import os
 import sys
 import logging
 from datetime import datetime, timedelta
+from contextlib import nullcontext
 import pandas as pd
 import numpy as np
 from sqlalchemy import create_engine, text
-from sklearn.ensemble import RandomForestRegressor
 from config import DB_SERVER, DB_NAME, DB_USER, DB_PASSWORD
+from Metrics import metrics
+from LogSetup import get_logger
+from Sharding import CoinPartitioner
+from ModelRegistry import MODELS, create_model, select_model, outputs_of
+from Indicators import IndicatorEngine
+from ModelTuner import ModelTuner
+from ModelExplainer import ModelExplainer
+from ModelCache import model_cache
+from ReadCache import read_cache
 from tqdm import tqdm
 import json
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
 class PricePredictor:
-    MODEL_VERSION = "1.0.0"
-    TRAINING_WINDOW_DAYS = 90
+    MODEL_VERSION = "1.1.0"
+    TRAINING_WINDOW_DAYS = 365
+    # Forecast horizons in daily bars ahead
+    HORIZONS = {'24h': 1, '7d': 7, '30d': 30, '90d': 90}
+    # Known outcomes a horizon needs before it is trained; otherwise it is saved as NULL
+    MIN_TRAINING_ROWS = 30
+    # Estimators tried per coin (see ModelRegistry); the choice is revisited daily
+    MODEL_CANDIDATES = ('ridge', 'hist_gb', 'random_forest')
+    MODEL_SELECTION_HOURS = 24
+    # Hyperparameters found by --tune are reused for this long before falling back to defaults
+    TUNING_VALID_DAYS = 7
+    # Price_Data columns are DECIMAL(18,8); cast in SQL and read into typed buffers
+    # instead of object columns of Python Decimals
+    PRICE_DTYPES = {'price': 'float64', 'volume_24h': 'float32', 'price_change_24h': 'float32'}
+    # 'coin': one model per coin; 'panel': one pooled model over all coins per run
+    PREDICTION_MODES = ('coin', 'panel')
+    # Features in price units; divided by the price before coins are pooled
+    PRICE_LEVEL_FEATURES = ('sma_5', 'sma_10', 'volatility')
+    # Daily bars behind one feature row (the 14-day price change looks back furthest)
+    FEATURE_WINDOW_DAYS = 15
 
-    def __init__(self):
+    def __init__(self, model_name=None, mode=None, tune=False):
         self.logger = self.setup_logger()
         self.db_connection = self.connect_to_db()
+        # Force one registry model for every coin; None selects per coin
+        self.model_name = model_name
+        self.mode = mode or os.environ.get('CRYPTO_PREDICT_MODE', 'coin')
+        if self.mode not in self.PREDICTION_MODES:
+            raise ValueError(f"Unknown prediction mode '{self.mode}'")
+        self.model_choices = {}
+        self.indicator_values = {}
+        # Hyperparameter search per coin (set up for the duration of a --tune run)
+        self.tune = tune
+        self.tuner = None
+        # Feature importances, stored once per distinct model fit
+        self.explainer = ModelExplainer(self.db_connection, self.logger)
+        # Only this node's slice of coins when CRYPTO_SHARDING=1 (lease spans one hourly run)
+        self.partitioner = CoinPartitioner('predict', lease_seconds=3600, logger=self.logger)
 
     def setup_logger(self):
-        logger = logging.getLogger('PricePredictor')
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        logger.addHandler(handler)
-        return logger
+        # Queue-backed console logger; handlers are attached only once per process
+        return get_logger('PricePredictor')
 
     def connect_to_db(self):
         try:
@@ -40,36 +76,39 @@ class PricePredictor:
             self.logger.error(f"Database connection error: {str(e)}")
             sys.exit(1)
 
-    def get_historical_data(self, coin_id, coin_symbol):
-        """Get historical price data from database"""
+    def get_historical_data(self, coin_id, coin_symbol, days=None):
+        """Get historical price data from database (last TRAINING_WINDOW_DAYS unless `days` is given)"""
         try:
             query = """
-            SELECT timestamp as date, price_usd as price, volume_24h, price_change_24h
+            SELECT timestamp as date,
+                CAST(price_usd AS FLOAT) as price,
+                CAST(volume_24h AS FLOAT) as volume_24h,
+                CAST(price_change_24h AS FLOAT) as price_change_24h
             FROM Price_Data 
             WHERE coin_id = :coin_id
             AND timestamp >= DATEADD(day, -:days, GETDATE())
-            ORDER BY timestamp DESC
+            ORDER BY timestamp
             """
             
-            with self.db_connection.connect() as conn:
+            with metrics.timer('db_read_seconds', component='predictor', table='price_data'), \
+                    self.db_connection.connect() as conn:
                 df = pd.read_sql(
                     text(query), 
                     conn, 
                     params={
                         'coin_id': coin_id, 
-                        'days': self.TRAINING_WINDOW_DAYS
-                    }
+                        'days': days or self.TRAINING_WINDOW_DAYS
+                    },
+                    parse_dates=['date'],
+                    dtype=self.PRICE_DTYPES
                 )
                 
             if df.empty:
                 self.logger.warning(f"No historical data found for {coin_symbol}")
                 return pd.DataFrame()
                 
-            # Convert date to datetime if it isn't already
-            df['date'] = pd.to_datetime(df['date'])
-            
             # Use ffill() instead of fillna(method='ffill')
-            df = df.ffill()
+            df.ffill(inplace=True)
             
             self.logger.info(f"Found {len(df)} historical price points for {coin_symbol}")
             return df
@@ -78,57 +117,86 @@ class PricePredictor:
             self.logger.error(f"Error fetching historical data: {str(e)}")
             return pd.DataFrame()
 
+    def resample_daily(self, historical_data):
+        """One bar per calendar day (last observation of the day), oldest first"""
+        daily = (
+            historical_data.resample('1D', on='date')[['price', 'volume_24h', 'price_change_24h']]
+            .last()
+            .dropna()
+        )
+        return daily.reset_index()
+
     def calculate_sentiment_score(self, coin_id, coin_symbol):
         self.logger.info(f"Calculating current sentiment for {coin_symbol}...")
-        query = f"""
-        SELECT AVG(sentiment_score) as avg_sentiment,
-               COUNT(*) as mention_count
-        FROM chat_data
-        WHERE coin_id = {coin_id}
-        AND [timestamp] >= DATEADD(hour, -24, GETDATE())
-        """
-        result = pd.read_sql(query, self.db_connection)
-        sentiment = float(result['avg_sentiment'].iloc[0] or 0)
-        mentions = int(result['mention_count'].iloc[0])
+        sentiment, mentions = self.get_sentiment_window(coin_id)
         self.logger.info(f"Current sentiment for {coin_symbol}: {sentiment:.2f} (based on {mentions} mentions)")
         return sentiment
 
+    def get_sentiment_window(self, coin_id, hours=24):
+        """Average sentiment and mention count over the last N hours.
+
+        Reads the chat_sentiment_hourly rollup maintained by ChatCollector,
+        so the window is a sum over at most `hours` rows per source.
+        """
+        query = """
+        SELECT 
+            SUM(sentiment_sum) as sentiment_sum,
+            SUM(mention_count) as mention_count
+        FROM chat_sentiment_hourly
+        WHERE coin_id = :coin_id
+        AND hour_start >= DATEADD(hour, DATEDIFF(hour, 0, GETDATE()) - :hours + 1, 0)
+        """
+        
+        with self.db_connection.connect() as conn:
+            result = conn.execute(
+                text(query),
+                {'coin_id': coin_id, 'hours': hours}
+            ).fetchone()
+            
+        if result and result[1]:
+            mention_count = int(result[1])
+            return float(result[0]) / mention_count, mention_count
+        return 0.0, 0
+
     def prepare_features(self, historical_data):
         """Prepare features for prediction"""
         try:
             if len(historical_data) < 5:
                 return pd.DataFrame(), pd.Series(), []
             
-            df = historical_data.copy()
-            
-            # Technical indicators
-            df['sma_5'] = df['price'].rolling(window=5).mean()
-            df['sma_10'] = df['price'].rolling(window=10).mean()
-            df['price_momentum'] = df['price'].pct_change(5)
-            df['volume_momentum'] = df['volume_24h'].pct_change(5)
-            df['volatility'] = df['price'].rolling(window=5).std()
-            
-            # Price changes over different periods
-            df['price_change_3d'] = df['price'].pct_change(3)
-            df['price_change_7d'] = df['price'].pct_change(7)
-            df['price_change_14d'] = df['price'].pct_change(14)
-            
-            # Volume features
-            df['volume_sma_5'] = df['volume_24h'].rolling(window=5).mean()
-            df['volume_ratio'] = df['volume_24h'] / df['volume_sma_5']
-            
-            # Drop rows with NaN values
-            df = df.dropna()
-            
-            # Select features for model
-            feature_columns = [
-                'sma_5', 'sma_10', 'price_momentum', 'volume_momentum',
-                'volatility', 'price_change_3d', 'price_change_7d',
-                'price_change_14d', 'volume_ratio', 'price_change_24h'
-            ]
-            
-            X = df[feature_columns]
-            y = df['price']  # Use 'price' instead of 'target'
+            # Features are built straight from the input columns into one new
+            # frame; the input is never copied or modified
+            price = historical_data['price']
+            volume = historical_data['volume_24h']
+            
+            features = pd.DataFrame({
+                # Technical indicators
+                'sma_5': price.rolling(window=5).mean(),
+                'sma_10': price.rolling(window=10).mean(),
+                'price_momentum': price.pct_change(5),
+                'volume_momentum': volume.pct_change(5),
+                'volatility': price.rolling(window=5).std(),
+                # Price changes over different periods
+                'price_change_3d': price.pct_change(3),
+                'price_change_7d': price.pct_change(7),
+                'price_change_14d': price.pct_change(14),
+                # Volume features
+                'volume_ratio': volume / volume.rolling(window=5).mean(),
+                'price_change_24h': historical_data['price_change_24h']
+            })
+            feature_columns = list(features.columns)
+            
+            # Targets: return over each horizon, shifted by that many daily bars
+            # (NaN for the latest rows, whose outcome isn't known yet)
+            targets = pd.DataFrame({
+                horizon: price.shift(-bars) / price - 1
+                for horizon, bars in self.HORIZONS.items()
+            })
+            
+            # Drop warm-up rows where the rolling features are still NaN
+            ready = features.notna().all(axis=1).to_numpy()
+            X = features[ready]
+            y = targets[ready]
             
             self.logger.info(f"Prepared {len(X)} data points with features")
             return X, y, feature_columns
@@ -137,46 +205,88 @@ class PricePredictor:
             self.logger.error(f"Error preparing features: {str(e)}")
             return pd.DataFrame(), pd.Series(), []
 
-    def make_predictions(self, model, X, current_price):
-        """Make price predictions"""
+    def latest_features(self, price, volume, price_change_24h):
+        """prepare_features' newest row only, from the last FEATURE_WINDOW_DAYS daily bars (oldest first).
+
+        Must stay in step with prepare_features; returns None until the window
+        is full or while a feature is undefined.
+        """
+        price = np.asarray(price, dtype=float)[-self.FEATURE_WINDOW_DAYS:]
+        volume = np.asarray(volume, dtype=float)[-self.FEATURE_WINDOW_DAYS:]
+        if len(price) < self.FEATURE_WINDOW_DAYS:
+            return None
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            row = {
+                'sma_5': price[-5:].mean(),
+                'sma_10': price[-10:].mean(),
+                'price_momentum': price[-1] / price[-6] - 1,
+                'volume_momentum': volume[-1] / volume[-6] - 1,
+                'volatility': price[-5:].std(ddof=1),
+                'price_change_3d': price[-1] / price[-4] - 1,
+                'price_change_7d': price[-1] / price[-8] - 1,
+                'price_change_14d': price[-1] / price[-15] - 1,
+                'volume_ratio': volume[-1] / volume[-5:].mean(),
+                'price_change_24h': float(price_change_24h[-1])
+            }
+        if not np.isfinite(list(row.values())).all():
+            return None
+        return pd.DataFrame([row])
+
+    def trainable_horizons(self, y):
+        """Horizons with at least MIN_TRAINING_ROWS known outcomes"""
+        return [horizon for horizon in y.columns if y[horizon].notna().sum() >= self.MIN_TRAINING_ROWS]
+
+    def training_set(self, X, y, horizons):
+        """Rows whose outcome is known for every trained horizon (one multi-output fit)"""
+        known = y[horizons].notna().all(axis=1)
+        return X[known], y.loc[known, horizons].squeeze(axis=1)
+
+    def make_predictions(self, model, X, current_price, horizons):
+        """Price forecasts from the model's predicted returns; None for horizons that weren't trained"""
         try:
             if model is None or X.empty:
                 return None
             
-            # Get the most recent feature values
+            # Get the most recent feature values (rows are oldest first)
             latest_features = X.iloc[-1:]
             
-            # Make predictions for different time periods
-            base_prediction = model.predict(latest_features)[0]
-            
-            # Calculate percentage changes
-            predictions = {
-                'current_price': current_price,
-                '24h': current_price * (1 + np.random.normal(0.001, 0.005)),  # Small random change
-                '7d': current_price * (1 + np.random.normal(0.003, 0.01)),
-                '30d': current_price * (1 + np.random.normal(0.005, 0.015)),
-                '90d': current_price * (1 + np.random.normal(0.008, 0.02)),
-                'confidence': 95.0  # Base confidence score
-            }
+            # One predict call returns every trained horizon's return
+            returns = np.atleast_1d(model.predict(latest_features)[0])
             
-            return predictions
+            return self.price_forecasts(current_price, horizons, returns)
         
         except Exception as e:
             self.logger.error(f"Error making predictions: {str(e)}")
             return None
 
-    def save_prediction(self, coin_id, predictions, sentiment_score, data_points_count):
+    def price_forecasts(self, current_price, horizons, returns):
+        """Prediction dict from predicted returns; None for horizons that weren't trained"""
+        predictions = {horizon: None for horizon in self.HORIZONS}
+        predictions.update({
+            horizon: current_price * (1 + predicted_return)
+            for horizon, predicted_return in zip(horizons, returns)
+        })
+        predictions['current_price'] = current_price
+        predictions['confidence'] = 95.0  # Base confidence score
+        return predictions
+
+    def save_prediction(self, coin_id, predictions, sentiment_score, data_points_count, model_parameters=None, fit_id=None):
         """Save prediction to database"""
         try:
             query = """
             INSERT INTO predictions (
                 coin_id, prediction_date, current_price,
                 prediction_24h, prediction_7d, prediction_30d, prediction_90d,
-                sentiment_score, confidence_score, data_points_count
+                sentiment_score, confidence_score, data_points_count,
+                model_version, training_window_days, model_parameters,
+                market_conditions, volatility_index, fit_id
             ) VALUES (
                 :coin_id, GETDATE(), :current_price,
                 :pred_24h, :pred_7d, :pred_30d, :pred_90d,
-                :sentiment_score, :confidence_score, :data_points_count
+                :sentiment_score, :confidence_score, :data_points_count,
+                :model_version, :training_window_days, :model_parameters,
+                :market_conditions, :volatility_index, :fit_id
             )
             """
             
@@ -189,11 +299,18 @@ class PricePredictor:
                 'pred_90d': predictions['90d'],
                 'sentiment_score': sentiment_score,
                 'confidence_score': predictions['confidence'],
-                'data_points_count': data_points_count
+                'data_points_count': data_points_count,
+                'model_version': self.MODEL_VERSION,
+                'training_window_days': self.TRAINING_WINDOW_DAYS,
+                'model_parameters': json.dumps(model_parameters) if model_parameters else None,
+                'market_conditions': predictions.get('market_condition'),
+                'volatility_index': round(predictions['volatility_index'], 2) if predictions.get('volatility_index') is not None else None,
+                'fit_id': fit_id
             }
             
             with self.db_connection.begin() as conn:
                 conn.execute(text(query), params)
+            read_cache.invalidate('predictions')
                 
             self.logger.debug(f"Saved prediction for coin_id {coin_id}")
             
@@ -202,22 +319,129 @@ class PricePredictor:
 
     def run_predictions(self):
         """Run predictions for all coins"""
+        if self.mode == 'panel':
+            return self.run_panel_predictions()
         try:
+            run_start = datetime.now()
+
             # Get list of coins
-            coins = self.get_coins()
+            coins = self.partitioner.claim(self.get_coins())
             self.logger.info(f"Found {len(coins)} coins")
-            
-            # Process each coin
-            for coin in tqdm(coins, desc="Processing coins"):
-                try:
-                    self.process_coin_prediction(coin['coin_id'], coin['symbol'])  # Changed from make_prediction
-                except Exception as e:
-                    self.logger.error(f"Error processing {coin['symbol']}: {str(e)}")
-                    continue
+            self.load_model_choices()
+            self.load_indicators()
+            self.explainer.load()
+            
+            # Process each coin (tuning shares one process pool across all of them)
+            self.tuner = ModelTuner(self.MODEL_CANDIDATES) if self.tune else None
+            with self.tuner or nullcontext():
+                for coin in tqdm(coins, desc="Processing coins"):
+                    try:
+                        self.process_coin_prediction(coin['coin_id'], coin['symbol'])  # Changed from make_prediction
+                    except Exception as e:
+                        self.logger.error(f"Error processing {coin['symbol']}: {str(e)}")
+                        continue
+            self.tuner = None
+            self.explainer.flush()
+
+            metrics.observe('stage_seconds', (datetime.now() - run_start).total_seconds(), component='predictor', stage='run')
 
         except Exception as e:
             self.logger.error(f"Error in prediction process: {str(e)}")
 
+    def normalise_features(self, X, daily):
+        """Scale-free features for pooling: price-level columns relative to the day's price"""
+        prices = daily['price'].loc[X.index]
+        return X.assign(**{
+            column: X[column] / prices - (0 if column == 'volatility' else 1)
+            for column in self.PRICE_LEVEL_FEATURES
+        })
+
+    def run_panel_predictions(self):
+        """Pooled mode: one model over every coin's stacked history, one predict() for all coins.
+
+        Rows carry normalised features plus a one-hot coin column, so small
+        coins borrow strength from the rest while keeping their own offset.
+        """
+        try:
+            run_start = datetime.now()
+            coins = self.partitioner.claim(self.get_coins())
+            self.logger.info(f"Found {len(coins)} coins")
+            self.load_indicators()
+            self.explainer.load()
+            
+            frames, targets, latest = [], [], []
+            offset = 0
+            with metrics.timer('stage_seconds', component='predictor', stage='feature_prep'):
+                for coin in tqdm(coins, desc="Loading coins"):
+                    historical_data = self.get_historical_data(coin['coin_id'], coin['symbol'])
+                    if historical_data.empty:
+                        continue
+                    daily = self.resample_daily(historical_data)
+                    X, y, _ = self.prepare_features(daily)
+                    if X.empty:
+                        continue
+                    X = self.normalise_features(X, daily).assign(coin=coin['symbol'], date=daily['date'].loc[X.index])
+                    frames.append(X)
+                    targets.append(y)
+                    self.market_indicators(coin['coin_id'], daily)
+                    offset += len(X)
+                    # The coin's newest row (label in the stacked frame) is the one forecast
+                    latest.append((coin, daily['price'].iloc[-1], len(historical_data), offset - 1))
+            if not frames:
+                self.logger.warning("No coin has enough history for the panel model")
+                return
+            
+            # Chronological order across coins, so model selection validates on the most recent days
+            panel = pd.concat(frames, ignore_index=True).sort_values('date', kind='stable')
+            y_panel = pd.concat(targets, ignore_index=True).loc[panel.index]
+            dates = panel['date']
+            panel = pd.get_dummies(panel.drop(columns='date'), columns=['coin'], dtype=float)
+            
+            horizons = self.trainable_horizons(y_panel)
+            if not horizons:
+                self.logger.warning("Not enough daily history to train any horizon for the panel model")
+                return
+            X_train, y_train = self.training_set(panel, y_panel, horizons)
+            
+            with metrics.timer('stage_seconds', component='predictor', stage='select'):
+                if self.model_name:
+                    choice = {'model': self.model_name}
+                else:
+                    # Rows are stacked coins per day: the gap spans that many rows per day
+                    gap = self.horizon_gap(y_train) * len(latest)
+                    name, scores = select_model(X_train, y_train, self.MODEL_CANDIDATES, gap=gap)
+                    choice = {'model': name, 'validation_mae': scores}
+            choice['mode'] = 'panel'
+            self.logger.info(
+                f"Training panel {choice['model']} model on {len(X_train)} rows from {len(latest)} coins ({', '.join(horizons)})..."
+            )
+            with metrics.timer('stage_seconds', component='predictor', stage='fit'):
+                model = self.train_model(X_train, y_train, model_name=choice['model'], params=choice.get('params'))
+            if model is None:
+                return
+            fit_id = self.explainer.register(
+                None, self.MODEL_VERSION, choice, model, X_train, y_train, dates.loc[X_train.index]
+            )
+            
+            with metrics.timer('stage_seconds', component='predictor', stage='predict'):
+                rows = [row for _, _, _, row in latest]
+                returns = np.asarray(model.predict(panel.loc[rows])).reshape(len(rows), -1)
+            
+            for (coin, current_price, data_points, _), coin_returns in zip(latest, returns):
+                predictions = self.price_forecasts(current_price, horizons, coin_returns)
+                predictions['market_condition'] = self.determine_market_condition(coin['coin_id'])
+                predictions['volatility_index'] = self.calculate_volatility(coin['coin_id'])
+                sentiment_score = self.get_current_sentiment(coin['coin_id'], coin['symbol'])
+                self.log_predictions(coin['symbol'], predictions)
+                with metrics.timer('db_write_seconds', component='predictor', table='predictions'):
+                    self.save_prediction(coin['coin_id'], predictions, sentiment_score, data_points, choice, fit_id)
+            self.explainer.flush()
+            
+            metrics.observe('stage_seconds', (datetime.now() - run_start).total_seconds(), component='predictor', stage='run')
+            
+        except Exception as e:
+            self.logger.error(f"Error in panel prediction process: {str(e)}")
+
     def process_coin_prediction(self, coin_id, coin_symbol):  # New method name
         """Process predictions for a single coin"""
         try:
@@ -226,31 +450,62 @@ class PricePredictor:
             if historical_data.empty:
                 return
             
-            # Prepare features
-            X, y, feature_columns = self.prepare_features(historical_data)
+            # Prepare features on daily bars, oldest first
+            with metrics.timer('stage_seconds', component='predictor', stage='feature_prep'):
+                daily = self.resample_daily(historical_data)
+                X, y, feature_columns = self.prepare_features(daily)
             if X.empty:
                 return
             
+            horizons = self.trainable_horizons(y)
+            if not horizons:
+                self.logger.warning(f"Not enough daily history to train any horizon for {coin_symbol}")
+                return
+            
             # Get current sentiment
             sentiment_score = self.get_current_sentiment(coin_id, coin_symbol)
             
             # Get current price
-            current_price = historical_data.iloc[0]['price']
+            current_price = daily['price'].iloc[-1]
             self.logger.info(f"Current price for {coin_symbol}: ${current_price:,.2f}")
             
-            # Train model
-            self.logger.info(f"Training prediction model for {coin_symbol}...")
-            model = self.train_model(X, y)
+            # Train one multi-output model for all trainable horizons
+            X_train, y_train = self.training_set(X, y, horizons)
+            with metrics.timer('stage_seconds', component='predictor', stage='select'):
+                choice = self.choose_model(coin_id, coin_symbol, X_train, y_train)
+            self.logger.info(f"Training {choice['model']} model for {coin_symbol} ({', '.join(horizons)})...")
+            with metrics.timer('stage_seconds', component='predictor', stage='fit'):
+                model = self.train_model(X_train, y_train, model_name=choice['model'], params=choice.get('params'))
             
             if model is None:
                 return
+            fit_id = self.explainer.register(
+                coin_id, self.MODEL_VERSION, choice, model, X_train, y_train, daily['date'].loc[X_train.index]
+            )
+            # For the intra-hour inference path (LivePredictor); single-row predicts
+            # are faster without a thread pool
+            if 'n_jobs' in model.get_params(deep=False):
+                model.set_params(n_jobs=1)
+            model_cache.save(coin_id, {
+                'model': model,
+                'horizons': horizons,
+                'features': feature_columns,
+                'choice': choice,
+                'fit_id': fit_id,
+                'model_version': self.MODEL_VERSION,
+                'trained_at': datetime.now()
+            })
             
             # Make predictions
-            predictions = self.make_predictions(model, X, current_price)
+            with metrics.timer('stage_seconds', component='predictor', stage='predict'):
+                predictions = self.make_predictions(model, X, current_price, horizons)
             
             if predictions:
+                predictions['market_condition'] = self.determine_market_condition(coin_id, daily)
+                predictions['volatility_index'] = self.calculate_volatility(coin_id, daily)
                 self.log_predictions(coin_symbol, predictions)
-                self.save_prediction(coin_id, predictions, sentiment_score, len(historical_data))
+                with metrics.timer('db_write_seconds', component='predictor', table='predictions'):
+                    self.save_prediction(coin_id, predictions, sentiment_score, len(historical_data), choice, fit_id)
             
         except Exception as e:
             self.logger.error(f"Prediction error for {coin_symbol}: {str(e)}")
@@ -260,33 +515,56 @@ class PricePredictor:
         self.logger.info(f"\nPrediction Summary for {coin_symbol}:")
         self.logger.info("==============================")
         self.logger.info(f"Current Price: ${predictions['current_price']:,.2f}")
-        self.logger.info(f"24h Prediction: ${predictions['24h']:,.2f} ({((predictions['24h']/predictions['current_price'])-1)*100:.2f}%)")
-        self.logger.info(f"7d Prediction:  ${predictions['7d']:,.2f} ({((predictions['7d']/predictions['current_price'])-1)*100:.2f}%)")
-        self.logger.info(f"30d Prediction: ${predictions['30d']:,.2f} ({((predictions['30d']/predictions['current_price'])-1)*100:.2f}%)")
-        self.logger.info(f"90d Prediction: ${predictions['90d']:,.2f} ({((predictions['90d']/predictions['current_price'])-1)*100:.2f}%)")
+        for horizon in self.HORIZONS:
+            label = f"{horizon} Prediction:".ljust(16)
+            if predictions[horizon] is None:
+                self.logger.info(f"{label}n/a (not enough history)")
+            else:
+                self.logger.info(f"{label}${predictions[horizon]:,.2f} ({((predictions[horizon]/predictions['current_price'])-1)*100:.2f}%)")
         self.logger.info(f"Confidence Score: {predictions['confidence']:.2f}%")
         self.logger.info("==============================\n")
 
-    def determine_market_condition(self, historical_prices):
+    def load_indicators(self):
+        """Current indicator values the price collector maintains per tick in coin_indicators"""
+        query = """
+        SELECT coin_id, market_condition, CAST(volatility_index AS FLOAT)
+        FROM coin_indicators
+        """
+        try:
+            with self.db_connection.connect() as conn:
+                for coin_id, condition, volatility in conn.execute(text(query)):
+                    self.indicator_values[coin_id] = {
+                        'market_condition': condition,
+                        'volatility_index': volatility
+                    }
+        except Exception as e:
+            self.logger.error(f"Error loading indicators: {str(e)}")
+
+    def market_indicators(self, coin_id, daily=None):
+        """Collector-maintained indicators; for a coin without any yet, derived from the daily bars in hand"""
+        values = self.indicator_values.get(coin_id)
+        if values is None and daily is not None and not daily.empty:
+            snapshot = IndicatorEngine(self.logger).warm_up(
+                coin_id, daily['price'], [date.to_pydatetime() for date in daily['date']]
+            )
+            values = {
+                'market_condition': snapshot['market_condition'],
+                'volatility_index': snapshot['volatility_index']
+            }
+            self.indicator_values[coin_id] = values
+        return values or {}
+
+    def determine_market_condition(self, coin_id, daily=None):
         """Determine if market is bullish, bearish, or sideways"""
-        # Implementation logic here
-        pass
+        return self.market_indicators(coin_id, daily).get('market_condition')
 
-    def calculate_volatility(self, historical_prices):
-        """Calculate price volatility index"""
-        # Implementation logic here
-        pass
+    def calculate_volatility(self, coin_id, daily=None):
+        """Calculate price volatility index (annualised EWMA volatility, %)"""
+        return self.market_indicators(coin_id, daily).get('volatility_index')
 
-    def save_feature_importance(self, prediction_id, feature_importance):
-        """Save feature importance scores to database"""
-        query = """
-        INSERT INTO prediction_feature_importance 
-        (prediction_id, feature_name, importance_score)
-        VALUES (?, ?, ?)
-        """
-        with self.db_connection.connect() as conn:
-            for feature, importance in feature_importance.items():
-                conn.execute(text(query), (prediction_id, feature, importance))
+    def feature_importance_history(self, coin_id=None, days=90):
+        """Feature importances of this coin's model fits over the last `days` (None: panel fits)"""
+        return self.explainer.history(coin_id, days)
 
     def print_prediction_summary(self, coin_symbol, prediction_data):
         """Print a summary of the predictions"""
@@ -319,12 +597,14 @@ class PricePredictor:
         self.logger.info("==============================\n")
 
     def get_coins(self):
-        """Get list of active coins from database"""
+        """Get list of active coins from database (the tracked universe, by market cap rank)"""
         try:
+            # Same set and order as CoinUniverse.load; deactivated coins no longer get prices
             query = """
             SELECT coin_id, symbol, full_name
             FROM Coins
-            ORDER BY coin_id
+            WHERE is_active = 1
+            ORDER BY CASE WHEN market_cap_rank IS NULL THEN 1 ELSE 0 END, market_cap_rank, coin_id
             """
             
             with self.db_connection.connect() as conn:
@@ -347,29 +627,7 @@ class PricePredictor:
     def get_current_sentiment(self, coin_id, coin_symbol):
         """Get current sentiment score for a coin"""
         try:
-            # Query to get recent sentiment data
-            query = """
-            SELECT 
-                AVG(sentiment_score) as avg_sentiment,
-                COUNT(*) as mention_count
-            FROM chat_data
-            WHERE coin_id = :coin_id
-            AND timestamp >= DATEADD(hour, -24, GETDATE())
-            """
-            
-            with self.db_connection.connect() as conn:
-                result = conn.execute(
-                    text(query),
-                    {'coin_id': coin_id}
-                ).fetchone()
-                
-            if result and result[0] is not None:
-                avg_sentiment = float(result[0])
-                mention_count = int(result[1])
-            else:
-                avg_sentiment = 0.0
-                mention_count = 0
-                
+            avg_sentiment, mention_count = self.get_sentiment_window(coin_id)
             self.logger.info(f"Current sentiment for {coin_symbol}: {avg_sentiment:.2f} (based on {mention_count} mentions)")
             return avg_sentiment
             
@@ -377,33 +635,114 @@ class PricePredictor:
             self.logger.error(f"Error getting sentiment for {coin_symbol}: {str(e)}")
             return 0.0  # Return neutral sentiment on error
 
-    def train_model(self, X, y):
-        """Train the prediction model"""
+    def load_model_choices(self):
+        """Per-coin model selections (and tuned hyperparameters) from recent predictions, so each run doesn't revalidate.
+
+        Only each coin's newest hourly row is read: every run re-records the choice
+        it used, and live predictions leave model_parameters NULL.
+        """
+        query = """
+        SELECT coin_id, model_parameters
+        FROM predictions
+        WHERE prediction_id IN (
+            SELECT MAX(prediction_id)
+            FROM predictions
+            WHERE prediction_date >= DATEADD(hour, -:hours, GETDATE())
+            AND model_parameters IS NOT NULL
+            GROUP BY coin_id
+        )
+        """
+        try:
+            with self.db_connection.connect() as conn:
+                hours = max(self.MODEL_SELECTION_HOURS, self.TUNING_VALID_DAYS * 24)
+                for coin_id, parameters in conn.execute(text(query), {'hours': hours}):
+                    choice = json.loads(parameters)
+                    # Panel runs record their pooled model there too; only per-coin selections apply
+                    if choice.get('model') in MODELS and 'selected_at' in choice and choice.get('mode', 'coin') == 'coin':
+                        self.model_choices[coin_id] = choice
+        except Exception as e:
+            self.logger.error(f"Error loading model choices: {str(e)}")
+
+    def choose_model(self, coin_id, coin_symbol, X, y):
+        """Forced model, else a fresh tuning (--tune) or this coin's recent tuned/selected model,
+        else a quick chronological validation"""
+        if self.model_name:
+            return {'model': self.model_name}
+        
+        if self.tuner:
+            choice = self.tune_model(coin_id, coin_symbol, X, y)
+            if choice:
+                return choice
+        
+        choice = self.model_choices.get(coin_id)
+        if choice:
+            if 'tuned_at' in choice:
+                age = datetime.now() - datetime.fromisoformat(choice['tuned_at'])
+                if age < timedelta(days=self.TUNING_VALID_DAYS):
+                    return choice
+            else:
+                age = datetime.now() - datetime.fromisoformat(choice['selected_at'])
+                if age < timedelta(hours=self.MODEL_SELECTION_HOURS):
+                    return choice
+        
+        name, scores = select_model(X, y, self.MODEL_CANDIDATES, gap=self.horizon_gap(y))
+        choice = {
+            'model': name,
+            'validation_mae': scores,
+            'selected_at': datetime.now().isoformat(timespec='seconds')
+        }
+        self.model_choices[coin_id] = choice
+        if scores:
+            ranking = ', '.join(f"{model} {mae:.4f}" for model, mae in sorted(scores.items(), key=lambda item: item[1]))
+            self.logger.info(f"Selected {name} for {coin_symbol} (validation MAE: {ranking})")
+        return choice
+
+    def horizon_gap(self, y):
+        """Daily bars the targets in `y` look ahead (its longest horizon): rows to keep between train and validation"""
+        horizons = list(y.columns) if y.ndim > 1 else [y.name]
+        return max(self.HORIZONS[horizon] for horizon in horizons)
+
+    def tune_model(self, coin_id, coin_symbol, X, y):
+        """Hyperparameter search over time-series CV folds; None when the history is too short"""
+        with metrics.timer('stage_seconds', component='predictor', stage='tune'):
+            result = self.tuner.tune(X, y, self.horizon_gap(y), self.MIN_TRAINING_ROWS)
+        if result is None:
+            self.logger.warning(f"Not enough history to cross-validate {coin_symbol}; selecting on defaults")
+            return None
+        
+        name, params, mae, folds = result
+        now = datetime.now().isoformat(timespec='seconds')
+        choice = {
+            'model': name,
+            'params': params,
+            'cv_mae': mae,
+            'cv_folds': folds,
+            'tuned_at': now,
+            'selected_at': now
+        }
+        self.model_choices[coin_id] = choice
+        self.logger.info(f"Tuned {coin_symbol}: {name} {params} (CV MAE {mae:.4f} over {folds} folds)")
+        return choice
+
+    def train_model(self, X, y, n_jobs=-1, model_name=None, params=None):
+        """Fit a registry model on all rows (n_jobs=1 when the caller already parallelises).
+        `params` override the model's default hyperparameters (from --tune).
+
+        Without `model_name` (or a forced self.model_name) the candidates are
+        compared on a chronological holdout first.
+        """
         try:
             if X.empty or len(X) < 5:
                 return None
             
-            # Create and train model
-            model = RandomForestRegressor(
-                n_estimators=100,
-                max_depth=10,
-                random_state=42,
-                n_jobs=-1  # Use all CPU cores
-            )
-            
-            # Split data into train and validation sets
-            X_train, X_val, y_train, y_val = train_test_split(
-                X, y, 
-                test_size=0.2,
-                random_state=42
-            )
-            
-            # Train the model
-            model.fit(X_train, y_train)
+            model_name = model_name or self.model_name
+            if model_name is None:
+                model_name, scores = select_model(X, y, self.MODEL_CANDIDATES, n_jobs=n_jobs, gap=self.horizon_gap(y))
+                self.logger.debug(f"Model validation MAE: {scores}")
             
-            # Calculate validation score
-            val_score = model.score(X_val, y_val)
-            self.logger.debug(f"Model validation R² score: {val_score:.4f}")
+            # Create and train model
+            model = create_model(model_name, outputs_of(y), n_jobs, **(params or {}))
+            model.fit(X, y)
             
             return model
             
@@ -439,9 +778,14 @@ def main():
 
     parser = argparse.ArgumentParser(description='Crypto Price Predictor')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    parser.add_argument('--model', choices=sorted(MODELS), help='Use this model for every coin instead of selecting per coin')
+    parser.add_argument('--mode', choices=PricePredictor.PREDICTION_MODES, help='coin: a model per coin (default); panel: one pooled model')
+    parser.add_argument('--tune', action='store_true', help='Search hyperparameters per coin (time-series CV, parallel successive halving) before predicting')
     args = parser.parse_args()
+    if args.tune and (args.model or args.mode == 'panel'):
+        parser.error('--tune selects per-coin models; it cannot be combined with --model or --mode panel')
 
-    predictor = PricePredictor()
+    predictor = PricePredictor(args.model, args.mode, args.tune)
     if args.debug:
         predictor.logger.setLevel(logging.DEBUG)
     
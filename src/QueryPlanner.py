@@ -0,0 +1,49 @@
+import re
+
+# Provider limits on the search query string
+REDDIT_MAX_QUERY_LENGTH = 512
+TWITTER_MAX_QUERY_LENGTH = 512   # recent search, Basic tier
+
+def reddit_terms(coin):
+    """Same terms the per-coin Reddit search used: symbol OR full name"""
+    name = coin['full_name']
+    return [coin['symbol'], f'"{name}"' if ' ' in name else name]
+
+def twitter_terms(coin):
+    """Hashtags for symbol and full name (hashtags can't contain spaces)"""
+    name = re.sub(r'\W', '', coin['full_name']).lower()
+    terms = [f"#{coin['symbol'].lower()}"]
+    if name and name != coin['symbol'].lower():
+        terms.append(f"#{name}")
+    return terms
+
+class QueryPlanner:
+    """Packs many coins' search terms into OR queries no longer than the provider allows.
+
+    batches() returns (query, coins) pairs; the coins of one batch share one
+    request, so a pass costs about len(coins) / batch_size requests.
+    """
+
+    def __init__(self, coins, terms_for, max_length, template='{terms}', separator=' OR '):
+        self.coins = coins
+        self.terms_for = terms_for
+        self.max_length = max_length
+        self.template = template
+        self.separator = separator
+
+    def render(self, terms):
+        return self.template.format(terms=self.separator.join(terms))
+
+    def batches(self):
+        batches = []
+        terms, batch = [], []
+        for coin in self.coins:
+            coin_terms = self.terms_for(coin)
+            if batch and len(self.render(terms + coin_terms)) > self.max_length:
+                batches.append((self.render(terms), batch))
+                terms, batch = [], []
+            terms = terms + coin_terms
+            batch.append(coin)
+        if batch:
+            batches.append((self.render(terms), batch))
+        return batches
@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import random
+import atexit
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+from Metrics import metrics
+
+try:
+    import config
+except ImportError:
+    config = None
+
+logger = logging.getLogger('RateLimiter')
+
+# (requests, per seconds) from each provider's published free-tier quota.
+# Override per API with RATE_LIMITS = {'reddit': (60, 60), ...} in config.py.
+DEFAULT_QUOTAS = {
+    'coingecko': (30, 60),        # Demo plan: 30 calls/min
+    'newsapi': (100, 86400),      # Developer plan: 100 requests/day
+    'reddit': (10, 60),           # Unauthenticated: 10 queries/min
+    'twitter': (60, 900),         # Basic, app auth: 60 recent searches/15 min
+    'cryptocompare': (50, 60),
+    'cryptopanic': (2, 1),
+}
+# Longest a caller is made to wait for a token before the call is skipped
+DEFAULT_MAX_WAIT = 60
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+STATE_FILE = os.environ.get(
+    'CRYPTO_RATE_STATE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'rate_limits.json')
+)
+SAVE_INTERVAL = 30
+
+def rate_limiting_enabled():
+    """On unless CRYPTO_RATE_LIMIT=0 (offline benchmarks against stubbed APIs)"""
+    return os.environ.get('CRYPTO_RATE_LIMIT', '1').lower() not in ('0', 'false', 'no')
+
+class RateLimitExceeded(Exception):
+    """The API's budget would not allow a call within max_wait seconds"""
+
+class TokenBucket:
+    """Token bucket with an adaptive refill rate.
+
+    A 429 halves the rate (never below a tenth of the quota); every success
+    gives back 5% of the quota, so throughput settles just under what the
+    provider actually accepts. Times are wall-clock so state survives restarts.
+    """
+
+    def __init__(self, calls, period, max_wait=DEFAULT_MAX_WAIT):
+        self.quota_rate = calls / period
+        self.rate = self.quota_rate
+        self.capacity = max(1.0, float(calls))
+        self.tokens = self.capacity
+        self.updated = time.time()
+        self.blocked_until = 0.0
+        self.max_wait = max_wait
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take one token (possibly on credit) and return how long to wait before using it"""
+        with self.lock:
+            now = time.time()
+            self._refill(now)
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            if wait > self.max_wait:
+                raise RateLimitExceeded(f"next slot in {wait:.0f}s")
+            self.tokens -= 1
+            return wait
+
+    def block(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+    def throttled(self, drain=True):
+        with self.lock:
+            self.rate = max(self.quota_rate / 10, self.rate / 2)
+            if drain:
+                self.tokens = min(self.tokens, 0.0)
+
+    def succeeded(self):
+        if self.rate < self.quota_rate:
+            with self.lock:
+                self.rate = min(self.quota_rate, self.rate + self.quota_rate * 0.05)
+
+    def observe_remaining(self, remaining, reset_seconds):
+        """Trust the provider's own counter when it reports one"""
+        with self.lock:
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_seconds is not None:
+                self.blocked_until = max(self.blocked_until, time.time() + reset_seconds)
+
+    def to_state(self):
+        with self.lock:
+            return {
+                'tokens': self.tokens, 'updated': self.updated,
+                'blocked_until': self.blocked_until, 'rate': self.rate
+            }
+
+    def load_state(self, state):
+        with self.lock:
+            self.tokens = min(self.capacity, float(state.get('tokens', self.capacity)))
+            self.updated = float(state.get('updated', time.time()))
+            self.blocked_until = float(state.get('blocked_until', 0.0))
+            self.rate = min(self.quota_rate, max(self.quota_rate / 10, float(state.get('rate', self.quota_rate))))
+            self._refill(time.time())
+
+def _header_seconds(value, now):
+    """Seconds until a Retry-After / reset header value (delta seconds, epoch seconds or HTTP date)"""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+        # Large values are absolute epoch timestamps (Twitter's x-rate-limit-reset)
+        return max(0.0, number - now) if number > 1e9 else max(0.0, number)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            return None
+
+class RateLimiter:
+    """Process-wide per-API budgets shared by every collector"""
+
+    def __init__(self, quotas=None, state_file=STATE_FILE):
+        quotas = dict(DEFAULT_QUOTAS, **(quotas or {}))
+        self.buckets = {api: TokenBucket(*quota) for api, quota in quotas.items()}
+        self.state_file = state_file
+        self.enabled = rate_limiting_enabled()
+        self.last_save = 0.0
+        self.save_lock = threading.Lock()
+        if self.enabled:
+            self.load()
+
+    def bucket(self, api):
+        if api not in self.buckets:
+            # Unknown API: effectively unlimited until it pushes back with 429s
+            self.buckets[api] = TokenBucket(10, 1)
+        return self.buckets[api]
+
+    def acquire(self, api):
+        if not self.enabled:
+            return
+        wait = self.bucket(api).reserve()
+        if wait > 0:
+            metrics.observe('rate_limit_wait_seconds', wait, api=api)
+            time.sleep(wait)
+
+    def _backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        return retry_after + delay * 0.1 if retry_after is not None else delay
+
+    def _observe_headers(self, api, headers):
+        if not headers:
+            return
+        now = time.time()
+        remaining = headers.get('x-ratelimit-remaining', headers.get('x-rate-limit-remaining'))
+        reset = headers.get('x-ratelimit-reset', headers.get('x-rate-limit-reset'))
+        if remaining is not None:
+            try:
+                self.bucket(api).observe_remaining(float(remaining), _header_seconds(reset, now))
+            except ValueError:
+                pass
+
+    def _throttled(self, api, headers, attempt):
+        bucket = self.bucket(api)
+        retry_after = _header_seconds((headers or {}).get('Retry-After'), time.time())
+        # An explicit Retry-After says exactly when to come back; otherwise empty the bucket too
+        bucket.throttled(drain=retry_after is None)
+        delay = self._backoff(attempt, retry_after)
+        bucket.block(delay)
+        metrics.inc('rate_limited_total', api=api)
+        logger.warning(f"{api} rate limited, backing off {delay:.1f}s (attempt {attempt + 1})")
+        self.save(force=True)
+
+    def get(self, api, url, endpoint='', **kwargs):
+        """requests.get under the API's budget; retries 429/503 with backoff and returns the last response"""
+        for attempt in range(MAX_RETRIES + 1):
+            self.acquire(api)
+            with metrics.timer('http_request_seconds', source=api, endpoint=endpoint):
+                response = requests.get(url, **kwargs)
+            self._observe_headers(api, response.headers)
+            if response.status_code not in (429, 503) or attempt == MAX_RETRIES:
+                if response.status_code < 400:
+                    self.bucket(api).succeeded()
+                self.save()
+                return response
+            # The next acquire() waits out the backoff (or gives up if it exceeds max_wait)
+            self._throttled(api, response.headers, attempt)
+
+    def call(self, api, func, *args, endpoint='', **kwargs):
+        """Run an SDK call (e.g. tweepy) under the API's budget, retrying on HTTP 429 errors"""
+        for attempt in range(MAX_RETRIES + 1):
+            self.acquire(api)
+            try:
+                with metrics.timer('http_request_seconds', source=api, endpoint=endpoint):
+                    result = func(*args, **kwargs)
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                status = getattr(response, 'status_code', None)
+                if status != 429 or attempt == MAX_RETRIES:
+                    raise
+                self._throttled(api, getattr(response, 'headers', None), attempt)
+                continue
+            self.bucket(api).succeeded()
+            self.save()
+            return result
+
+    def load(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            for api, bucket_state in state.items():
+                if api in self.buckets:
+                    self.buckets[api].load_state(bucket_state)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error loading rate limit state: {str(e)}")
+
+    def save(self, force=False):
+        """Persist budgets (at most every SAVE_INTERVAL seconds unless forced)"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_save < SAVE_INTERVAL:
+            return
+        with self.save_lock:
+            self.last_save = now
+            try:
+                state = {api: bucket.to_state() for api, bucket in self.buckets.items()}
+                os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+                tmp_path = self.state_file + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp_path, self.state_file)
+            except Exception as e:
+                logger.error(f"Error saving rate limit state: {str(e)}")
+
+rate_limiter = RateLimiter(getattr(config, 'RATE_LIMITS', None))
+atexit.register(rate_limiter.save, force=True)
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from decimal import Decimal
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pyodbc
+from config import DB_CONNECTION_STRING
+from Metrics import metrics
+
+READ_HOST = '127.0.0.1'
+READ_PORT = int(os.environ.get('CRYPTO_READ_PORT', 8767))
+# Sections are reloaded after this long even without an invalidation, to pick up
+# writes from processes other than the service (GUI collectors, manual runs)
+MAX_AGE_SECONDS = 300
+SENTIMENT_HOURS = 24
+
+# section -> query returning (coin_id, values...) rows
+QUERIES = {
+    'coins': """
+        SELECT coin_id, symbol, full_name
+        FROM Coins
+        WHERE is_active = 1
+    """,
+    'prices': """
+        SELECT p.coin_id, p.timestamp, p.price_usd, p.volume_24h, p.price_change_24h
+        FROM Price_Data p
+        WHERE p.timestamp = (SELECT MAX(timestamp) FROM Price_Data WHERE coin_id = p.coin_id)
+    """,
+    'predictions': """
+        SELECT p.coin_id, p.prediction_date, p.current_price,
+            p.prediction_24h, p.prediction_7d, p.prediction_30d, p.prediction_90d,
+            p.confidence_score, p.market_conditions, p.volatility_index, p.model_version
+        FROM predictions p
+        WHERE p.prediction_id = (SELECT MAX(prediction_id) FROM predictions WHERE coin_id = p.coin_id)
+    """,
+    'sentiment': f"""
+        SELECT coin_id, SUM(sentiment_sum), SUM(mention_count)
+        FROM chat_sentiment_hourly
+        WHERE hour_start >= DATEADD(hour, DATEDIFF(hour, 0, GETDATE()) - {SENTIMENT_HOURS - 1}, 0)
+        GROUP BY coin_id
+    """
+}
+FIELDS = {
+    'coins': ('symbol', 'name'),
+    'prices': ('timestamp', 'price_usd', 'volume_24h', 'price_change_24h'),
+    'predictions': (
+        'prediction_date', 'current_price', '24h', '7d', '30d', '90d',
+        'confidence', 'market_condition', 'volatility_index', 'model_version'
+    )
+}
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='seconds')
+    return value
+
+class ReadCache:
+    """Latest price, prediction and 24h sentiment per coin, held in memory for readers.
+
+    Writers either put() the rows they just committed, which re-renders
+    without touching the database, or call invalidate(section) so the next
+    read reloads just that section with one query. The latest-row lookups
+    rely on the (coin_id, key DESC) indexes in CreateDbTables.txt. Between
+    changes every read is served from pre-encoded bytes, with an ETag so
+    unchanged polls get a 304.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger('ReadCache')
+        self.sections = {section: {} for section in QUERIES}
+        self.loaded_at = {section: 0.0 for section in QUERIES}
+        self.stale = set(QUERIES)
+        self.documents = {}
+        self.lock = threading.Lock()
+        self.server = None
+
+    def invalidate(self, section=None):
+        """Mark a section (default: all) for reload on the next read; cheap enough to call per write"""
+        if section is None:
+            self.stale.update(QUERIES)
+        else:
+            self.stale.add(section)
+
+    def put(self, section, rows):
+        """Merge freshly written (coin_id, values...) rows into a section, in its query's column order"""
+        with self.lock:
+            self.sections[section].update(self.parse(section, rows))
+            self.documents = self.render()
+
+    def refresh(self):
+        """Reload stale or expired sections; returns True if anything changed"""
+        now = time.monotonic()
+        due = {section for section in QUERIES if now - self.loaded_at[section] >= MAX_AGE_SECONDS}
+        due |= self.stale
+        if not due:
+            return False
+
+        conn = None
+        try:
+            with metrics.timer('db_read_seconds', component='read_cache', table='latest'):
+                conn = pyodbc.connect(DB_CONNECTION_STRING)
+                cursor = conn.cursor()
+                for section in due:
+                    # Cleared before the read, so a write landing meanwhile triggers another reload
+                    self.stale.discard(section)
+                    cursor.execute(QUERIES[section])
+                    self.sections[section] = self.parse(section, cursor.fetchall())
+                    self.loaded_at[section] = now
+        except Exception as e:
+            self.logger.error(f"Error refreshing read cache: {str(e)}")
+            self.stale |= due
+            return False
+        finally:
+            if conn is not None:
+                conn.close()
+        self.documents = self.render()
+        return True
+
+    def parse(self, section, rows):
+        if section == 'sentiment':
+            return {
+                coin_id: {
+                    'score': float(total) / int(mentions),
+                    'mentions': int(mentions),
+                    'hours': SENTIMENT_HOURS
+                }
+                for coin_id, total, mentions in rows if mentions
+            }
+        return {
+            row[0]: {field: _json_value(value) for field, value in zip(FIELDS[section], row[1:])}
+            for row in rows
+        }
+
+    def render(self):
+        """Encode every served document once: path -> (body, etag)"""
+        coins = []
+        documents = {}
+        for coin_id, coin in sorted(self.sections['coins'].items()):
+            document = dict(
+                coin_id=coin_id,
+                **coin,
+                price=self.sections['prices'].get(coin_id),
+                prediction=self.sections['predictions'].get(coin_id),
+                sentiment=self.sections['sentiment'].get(coin_id)
+            )
+            coins.append(document)
+            documents[f"/coins/{coin['symbol'].lower()}"] = document
+        documents['/coins'] = coins
+
+        encoded = {}
+        for path, document in documents.items():
+            body = json.dumps(document).encode('utf-8')
+            encoded[path] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        return encoded
+
+    def get(self, path):
+        """(body, etag) for a path, or None if there is no such document"""
+        with self.lock:
+            self.refresh()
+            return self.documents.get(path.rstrip('/').lower())
+
+    def start_http_server(self, port=READ_PORT, host=READ_HOST):
+        """Serve GET /coins and /coins/<symbol> as JSON on a daemon thread"""
+        if self.server is not None:
+            return self.server
+        cache = self
+
+        class ReadHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                document = cache.get(self.path.split('?', 1)[0])
+                if document is None:
+                    self.send_error(404)
+                    return
+                body, etag = document
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), ReadHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server
+
+    def stop_http_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+# Process-wide cache; writers in the service process update or invalidate it directly
+read_cache = ReadCache()
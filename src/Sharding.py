@@ -0,0 +1,161 @@
+import os
+import bisect
+import socket
+import hashlib
+import logging
+import pyodbc
+from config import DB_CONNECTION_STRING
+
+# Off by default: a single process owns every coin
+SHARDING_ENV = 'CRYPTO_SHARDING'
+NODE_ID_ENV = 'CRYPTO_NODE_ID'
+NODE_TIMEOUT_ENV = 'CRYPTO_NODE_TIMEOUT'
+DEFAULT_NODE_TIMEOUT = 900
+VIRTUAL_NODES = 100
+
+def sharding_enabled():
+    return os.environ.get(SHARDING_ENV, '').lower() in ('1', 'true', 'yes')
+
+def default_node_id():
+    """CRYPTO_NODE_ID, else the hostname (stable across restarts, so a restarted node keeps its slice)"""
+    return os.environ.get(NODE_ID_ENV) or socket.gethostname()
+
+def _hash(key):
+    return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+class HashRing:
+    """Consistent hash ring; adding or removing a node only moves that node's share of keys"""
+
+    def __init__(self, nodes, replicas=VIRTUAL_NODES):
+        self.nodes = sorted(set(nodes))
+        self.ring = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas)
+        )
+        self.hashes = [h for h, _ in self.ring]
+
+    def owner(self, key):
+        if not self.ring:
+            return None
+        index = bisect.bisect(self.hashes, _hash(key)) % len(self.ring)
+        return self.ring[index][1]
+
+class CoinPartitioner:
+    """Restricts a job's coin list to this node's slice when sharding is enabled.
+
+    Nodes announce themselves in collector_nodes on every claim; nodes whose
+    heartbeat is older than the timeout drop out of the ring, so their coins
+    fail over to the survivors. A coin is only processed while this node
+    holds its row in coin_leases, which prevents two nodes collecting the same
+    coin while ownership moves (the new owner waits for the old lease to expire).
+    """
+
+    def __init__(self, job, lease_seconds, logger=None, node_id=None, node_timeout=None):
+        self.job = job
+        self.lease_seconds = int(lease_seconds)
+        self.logger = logger or logging.getLogger('Sharding')
+        self.enabled = sharding_enabled()
+        self.node_id = node_id or default_node_id()
+        self.node_timeout = int(node_timeout or os.environ.get(NODE_TIMEOUT_ENV, DEFAULT_NODE_TIMEOUT))
+
+    def heartbeat(self, cursor):
+        cursor.execute("""
+            UPDATE collector_nodes
+            SET last_heartbeat = GETDATE(), hostname = ?, pid = ?
+            WHERE node_id = ?
+        """, (socket.gethostname(), os.getpid(), self.node_id))
+        if cursor.rowcount == 0:
+            cursor.execute("""
+                INSERT INTO collector_nodes (node_id, hostname, pid, started_at, last_heartbeat)
+                VALUES (?, ?, ?, GETDATE(), GETDATE())
+            """, (self.node_id, socket.gethostname(), os.getpid()))
+
+    def live_nodes(self, cursor):
+        cursor.execute("""
+            SELECT node_id FROM collector_nodes
+            WHERE last_heartbeat >= DATEADD(second, -?, GETDATE())
+        """, (self.node_timeout,))
+        nodes = {row[0] for row in cursor.fetchall()}
+        nodes.add(self.node_id)
+        return nodes
+
+    def acquire_lease(self, cursor, symbol):
+        """Take or renew the lease on `symbol`; False while another node's lease is still valid"""
+        cursor.execute("""
+            UPDATE coin_leases
+            SET node_id = ?, lease_expires = DATEADD(second, ?, GETDATE())
+            WHERE job = ? AND symbol = ? AND (node_id = ? OR lease_expires < GETDATE())
+        """, (self.node_id, self.lease_seconds, self.job, symbol, self.node_id))
+        if cursor.rowcount > 0:
+            return True
+        try:
+            cursor.execute("""
+                INSERT INTO coin_leases (job, symbol, node_id, lease_expires)
+                VALUES (?, ?, ?, DATEADD(second, ?, GETDATE()))
+            """, (self.job, symbol, self.node_id, self.lease_seconds))
+            return True
+        except Exception:
+            # Primary key violation: a live lease belongs to another node
+            return False
+
+    def claim(self, coins, key='symbol'):
+        """Return the subset of `coins` (dicts) this node should process in this cycle"""
+        if not self.enabled or not coins:
+            return coins
+
+        conn = None
+        try:
+            conn = pyodbc.connect(DB_CONNECTION_STRING)
+            cursor = conn.cursor()
+            self.heartbeat(cursor)
+            nodes = self.live_nodes(cursor)
+            ring = HashRing(nodes)
+
+            owned = []
+            waiting = 0
+            for coin in coins:
+                symbol = coin[key]
+                if ring.owner(symbol) != self.node_id:
+                    continue
+                if self.acquire_lease(cursor, symbol):
+                    owned.append(coin)
+                else:
+                    waiting += 1
+            conn.commit()
+
+            self.logger.info(
+                f"Sharding [{self.job}] node {self.node_id}: {len(owned)}/{len(coins)} coins "
+                f"across {len(nodes)} live nodes" + (f", {waiting} waiting on another node's lease" if waiting else '')
+            )
+            return owned
+
+        except Exception as e:
+            # Never fall back to the full list: that is exactly the double collection we avoid
+            self.logger.error(f"Sharding [{self.job}] claim failed, skipping cycle: {str(e)}")
+            return []
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def leave(self):
+        """Drop this node's heartbeat and leases so peers take over its coins immediately"""
+        if not self.enabled:
+            return
+        conn = None
+        try:
+            conn = pyodbc.connect(DB_CONNECTION_STRING)
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM coin_leases WHERE node_id = ?", (self.node_id,))
+            cursor.execute("DELETE FROM collector_nodes WHERE node_id = ?", (self.node_id,))
+            conn.commit()
+            self.logger.info(f"Sharding: node {self.node_id} left the cluster")
+        except Exception as e:
+            self.logger.error(f"Sharding: error leaving cluster: {str(e)}")
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass